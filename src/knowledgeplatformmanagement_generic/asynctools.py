@@ -1,9 +1,10 @@
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator, Iterator, Sequence
 from queue import Queue
 
 import anyio
-from anyio import from_thread, run, to_thread
+from anyio import EndOfStream, from_thread, run, to_thread
 from anyio.lowlevel import checkpoint
+from anyio.streams.memory import MemoryObjectReceiveStream
 
 
 def async_generator_to_regular[T](asyncgenerator: AsyncIterator[T]) -> Iterator[T]:
@@ -41,3 +42,20 @@ def async_generator_to_regular[T](asyncgenerator: AsyncIterator[T]) -> Iterator[
     # pylint: disable-next=while-used
     while (item := queue.get()) is not sentinel:
         yield item
+
+
+def receive_from_thread[T](receivestream: MemoryObjectReceiveStream[Sequence[T]]) -> Iterator[T]:
+    """
+    Lazily iterates over the items in the chunks received from `receivestream`, from a worker thread started by AnyIO.
+    Closes `receivestream` when done, so that a sender in turn fails fast if the iteration is abandoned.
+    """
+    try:
+        # pylint: disable-next=while-used
+        while True:
+            try:
+                chunk = from_thread.run(receivestream.receive)
+            except EndOfStream:
+                return
+            yield from chunk
+    finally:
+        from_thread.run_sync(receivestream.close)
@@ -0,0 +1,125 @@
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+from itertools import batched
+from typing import Final, NamedTuple
+
+from anyio import create_memory_object_stream, create_task_group, from_thread, to_thread
+from anyio.streams.memory import MemoryObjectSendStream
+from loguru import logger
+
+from knowledgeplatformmanagement_generic.asynctools import receive_from_thread
+from knowledgeplatformmanagement_generic.data.services.qdrant.dataaccessor_qdrant import DataaccessorQdrant
+from knowledgeplatformmanagement_generic.data.services.typedb.dataaccessor_typedb import DataaccessorTypedb
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing
+from knowledgeplatformmanagement_generic.settings import Configuration
+
+
+class Persistitem(NamedTuple):
+    """A thing to persist, with what's known about how it was persisted before."""
+
+    typeqlthing: TypeqlThing
+    is_committed: bool = False
+    """Whether the thing was committed to TypeDB by an earlier persist, which failed later on. It's then persisted to
+    Qdrant only, which overwrites points with the same ID."""
+    is_replacing: bool = False
+    """Whether the thing replaces one with the same key, which may have been committed to TypeDB before."""
+
+
+class Persistengine:
+    """Persists TypeQL things to Qdrant and TypeDB in a single pass over them.
+
+    A render stage iterates the things once, renders each to a sentence for Qdrant, and fans the sentences and the
+    things out to a Qdrant and a TypeDB writer, which run concurrently. Each stage runs on a worker thread, and passes
+    chunks of `persist_size_chunk` items on through a queue holding at most `persist_size_queue` chunks, so that the
+    fastest stage can't run away from the slowest.
+    """
+
+    def __init__(
+        self,
+        *,
+        configuration: Configuration,
+        dataaccessor_qdrant: DataaccessorQdrant,
+        dataaccessor_typedb: DataaccessorTypedb,
+    ) -> None:
+        self.configuration: Final[Configuration] = configuration
+        self.dataaccessor_qdrant: Final[DataaccessorQdrant] = dataaccessor_qdrant
+        self.dataaccessor_typedb: Final[DataaccessorTypedb] = dataaccessor_typedb
+
+    async def persist(
+        self,
+        *,
+        on_committed: Callable[[Iterable[int]], None] | None = None,
+        persistitems: Sequence[Persistitem],
+    ) -> None:
+        """Persists `persistitems`, which are iterated on a worker thread, so mustn't change meanwhile. `on_committed`
+        is called from a worker thread with the positions in `persistitems` of the things in each commit to TypeDB."""
+        # The positions in `persistitems` of the things passed to the TypeDB writer, by their position in what's passed.
+        positions_typedb = [
+            position for position, persistitem in enumerate(persistitems) if not persistitem.is_committed
+        ]
+        sendstream_sentences, receivestream_sentences = create_memory_object_stream[list[str]](
+            max_buffer_size=self.configuration.persist_size_queue,
+        )
+        sendstream_typeqlthings, receivestream_typeqlthings = create_memory_object_stream[list[TypeqlThing]](
+            max_buffer_size=self.configuration.persist_size_queue,
+        )
+        async with (
+            self.dataaccessor_qdrant as connection_qdrant,
+            self.dataaccessor_typedb as connection_typedb,
+            connection_qdrant.bulkload(),
+            create_task_group() as taskgroup,
+        ):
+            # TODO: Lock storage for writes after insertions, in production.
+            taskgroup.start_soon(
+                partial(connection_qdrant.insert_sentences, sentences=receive_from_thread(receivestream_sentences)),
+            )
+            taskgroup.start_soon(
+                partial(
+                    connection_typedb.insert_typeqlthings,
+                    on_committed=(
+                        None
+                        if on_committed is None
+                        else lambda positions: on_committed(positions_typedb[position] for position in positions)
+                    ),
+                    positions_replacing=frozenset(
+                        position
+                        for position, position_persistitem in enumerate(positions_typedb)
+                        if persistitems[position_persistitem].is_replacing
+                    ),
+                    typeqlthings=receive_from_thread(receivestream_typeqlthings),
+                ),
+            )
+            n_typeqlthings = await to_thread.run_sync(
+                partial(
+                    self._render,
+                    persistitems=persistitems,
+                    sendstream_sentences=sendstream_sentences,
+                    sendstream_typeqlthings=sendstream_typeqlthings,
+                ),
+            )
+        logger.info("Persisted {n} TypeQL things.", n=n_typeqlthings)
+
+    def _render(
+        self,
+        *,
+        persistitems: Iterable[Persistitem],
+        sendstream_sentences: MemoryObjectSendStream[list[str]],
+        sendstream_typeqlthings: MemoryObjectSendStream[list[TypeqlThing]],
+    ) -> int:
+        n_typeqlthings = 0
+        try:
+            for chunk in batched(persistitems, self.configuration.persist_size_chunk):
+                # The TypeQL queries are rendered by the TypeDB writer itself, as it merges things into batches.
+                from_thread.run(
+                    sendstream_typeqlthings.send,
+                    [persistitem.typeqlthing for persistitem in chunk if not persistitem.is_committed],
+                )
+                from_thread.run(
+                    sendstream_sentences.send,
+                    [sentence for persistitem in chunk if (sentence := str(persistitem.typeqlthing))],
+                )
+                n_typeqlthings += len(chunk)
+        finally:
+            from_thread.run_sync(sendstream_sentences.close)
+            from_thread.run_sync(sendstream_typeqlthings.close)
+        return n_typeqlthings
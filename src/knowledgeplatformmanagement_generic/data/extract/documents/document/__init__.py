@@ -1,21 +1,30 @@
-from collections.abc import Collection, Mapping
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from functools import cached_property, partial
+from itertools import chain
 from pathlib import Path
-from typing import ClassVar
-from unicodedata import category, normalize
+from typing import Any, ClassVar, NamedTuple
 
 # TODO: See https://github.com/DS4SD/docling/issues/614
 from docling_core.types.doc import DoclingDocument, SectionHeaderItem, TableItem, TextItem  # type: ignore[attr-defined]
 
 # TODO: See https://github.com/pemistahl/lingua/issues/243
 # pylint: disable-next=no-name-in-module
-from lingua import Language, LanguageDetectorBuilder
+from lingua import Language, LanguageDetector, LanguageDetectorBuilder
 from loguru import logger
 from pandas import DataFrame
 from pydantic.dataclasses import dataclass
 from spacy import load
 from spacy.language import Language as LanguageSpacy
+from spacy.tokens import Doc
 from span_marker import SpanMarkerModel
 
+from knowledgeplatformmanagement_generic.data.extract.documents.document import normalizer
+from knowledgeplatformmanagement_generic.data.extract.documents.document.cache_ner import Cachener, get_cachener
+from knowledgeplatformmanagement_generic.data.extract.documents.registry_model import (
+    REGISTRYMODEL,
+    Framework,
+    Keymodel,
+)
 from knowledgeplatformmanagement_generic.settings import Configuration
 
 type Entitytype = str
@@ -55,17 +64,32 @@ class DocumentNermodelError(RuntimeError):
 # This is a dataclass-like type.
 # pylint: disable-next=too-few-public-methods
 class Flatsection:
-    """Section text and tables in increasing reading order, flattened from a tree into a sequence."""
+    """Section text and tables in increasing reading order, flattened from a tree into a sequence. The tables are
+    converted to data frames on first access."""
 
-    def __init__(self, *, text: str = "", tables: list[DataFrame] | None = None) -> None:
-        self.tables: list[DataFrame] = [] if tables is None else tables
+    def __init__(self, *, text: str = "", tableitems: list[TableItem] | None = None) -> None:
+        self.tableitems: list[TableItem] = [] if tableitems is None else tableitems
         self.text = text
 
     def __repr__(self) -> str:
-        return (
-            f"{self.__class__.__name__}(text={self.text.__repr__()}, "
-            f"tables=[{', '.join(table.columns.__repr__() for table in self.tables)}])"
-        )
+        return f"{self.__class__.__name__}(text={self.text.__repr__()}, n_tableitems={len(self.tableitems)})"
+
+    @cached_property
+    def tables(self) -> list[DataFrame]:
+        return [tableitem.export_to_dataframe() for tableitem in self.tableitems]
+
+    def release(self) -> None:
+        """Releases the data frames of the tables, if converted."""
+        self.__dict__.pop("tables", None)
+
+
+class Taskner(NamedTuple):
+    """NER to perform on a `text` of `document`, storing its entities in `sectiontitle_to_entities[sectiontitle]`."""
+
+    document: "Document"
+    sectiontitle: str
+    sectiontitle_to_entities: dict[str, Entities]
+    text: str
 
 
 # The instance attributes are constants, and essential. The lack of public methods isn't a problem, since this a data
@@ -83,20 +107,7 @@ class Document:
         See: https://unicode.org/reports/tr15/
         See: https://github.com/DS4SD/docling/issues/682
         """
-        return ("\n" if keep_newlines else " ").join(
-            character
-            for character in " ".join(
-                character
-                for character in "".join(
-                    character if category(character) != "Zl" else "\n"
-                    for character in normalize("NFKC", text.replace("\t", " "))
-                    if character in (" ", "\n")
-                    or category(character) not in {"B", "Cc", "Cf", "Cn", "Co", "Cs", "Zp", "Zs"}
-                ).split(sep=" ")
-                if character
-            ).split(sep="\n")
-            if character
-        )
+        return normalizer.normalize_string(text, keep_newlines=keep_newlines)
 
     @staticmethod
     def _load_ner_model(
@@ -127,8 +138,94 @@ class Document:
                 language=language,
             ) from exception
 
+    @staticmethod
+    def _sizeof_nermodel(nermodel: LanguageSpacy | SpanMarkerModel) -> int:
+        """Returns the size in bytes of the parameters of a SpanMarker model, or of the vectors and the parameters of
+        the pipes of a spaCy pipeline."""
+        if isinstance(nermodel, SpanMarkerModel):
+            return sum(parameter.numel() * parameter.element_size() for parameter in nermodel.parameters())
+        size = nermodel.vocab.vectors.data.nbytes
+        ids_node: set[int] = set()
+        for _, pipe in nermodel.pipeline:
+            if (model := getattr(pipe, "model", None)) is None:
+                continue
+            # Listening pipes share nodes with the pipe they listen to.
+            for node in model.walk():
+                if id(node) not in ids_node:
+                    ids_node.add(id(node))
+                    size += sum(node.get_param(name).nbytes for name in node.param_names if node.has_param(name))
+        return size
+
+    @staticmethod
+    def _get_modelname_spacy(*, configuration: Configuration, language: Language) -> Path:
+        return {
+            Language.DUTCH: configuration.paths._path_dir_model_spacy_nl,
+            Language.ENGLISH: configuration.paths._path_dir_model_spacy_en,
+        }[language]
+
+    @staticmethod
+    def _get_keymodel_ner(*, configuration: Configuration, language: Language) -> Keymodel:
+        return Keymodel(
+            framework=Framework.SPACY,
+            language=language.iso_code_639_1.name.lower(),
+            name=str(Document._get_modelname_spacy(configuration=configuration, language=language)),
+        )
+
+    @staticmethod
+    def _get_ner_model(*, configuration: Configuration, language: Language) -> LanguageSpacy | SpanMarkerModel:
+        """Returns the NER model for `language` from the registry of the process, loading it on first use."""
+        return REGISTRYMODEL.get(
+            Document._get_keymodel_ner(configuration=configuration, language=language),
+            load=partial(
+                Document._load_ner_model,
+                modelname_spacy=Document._get_modelname_spacy(configuration=configuration, language=language),
+                language=language,
+            ),
+            sizeof=Document._sizeof_nermodel,
+        )
+
+    @staticmethod
+    def get_cachener(*, configuration: Configuration) -> Cachener:
+        """Returns the NER cache of the process, which also keeps entities on disk if `ner_cache_on_disk`."""
+        return get_cachener(
+            n_entries_max=configuration.ner_cache_n_entries_max,
+            n_entries_max_disk=configuration.ner_cache_n_entries_max_disk,
+            path_dir=configuration.paths._path_dir_ner if configuration.ner_cache_on_disk else None,
+        )
+
+    @staticmethod
+    def _get_languagedetector(languages: Collection[Language]) -> LanguageDetector:
+        """Returns the language detector for `languages` from the registry of the process, loading it on first use."""
+        return REGISTRYMODEL.get(
+            Keymodel(
+                framework=Framework.LINGUA,
+                language=None,
+                name=",".join(sorted(language.iso_code_639_1.name.lower() for language in languages)),
+            ),
+            load=lambda: LanguageDetectorBuilder.from_languages(*languages).with_preloaded_language_models().build(),
+        )
+
+    @classmethod
+    def warm(cls, *, configuration: Configuration) -> None:
+        """Loads the models used by documents into the registry of the process, so that the first document doesn't
+        wait for them."""
+        for language in cls.LANGUAGES:
+            cls._get_ner_model(configuration=configuration, language=language)
+        cls._get_languagedetector(cls.LANGUAGES)
+        logger.info(
+            "Warmed the NLP model registry, which holds about {size:.0f} MiB of models.",
+            size=REGISTRYMODEL.get_size_total() / 2**20,
+        )
+
+    LANGUAGES: ClassVar[tuple[Language, ...]] = (Language.ENGLISH, Language.DUTCH)
     LEN_SUMMARY_MIN: ClassVar[int] = 20
+    LENGTH_SAMPLE_LANGUAGE: ClassVar[int] = 4_096
+    """The number of characters from the start of the full text to detect the language of the document by."""
     LENGTH_SECTION_MIN: ClassVar[int] = 2
+    NAMES_PIPE_NER_UNNEEDED: ClassVar[frozenset[str]] = frozenset(
+        {"attribute_ruler", "lemmatizer", "morphologizer", "parser", "senter", "tagger"},
+    )
+    """The components of spaCy pipelines that NER doesn't depend on, and that are disabled for it."""
     SECTIONTITLES_SUMMARY: ClassVar[frozenset[str]] = frozenset(
         {
             "management samenvatting",
@@ -188,48 +285,78 @@ class Document:
         )
 
     def __init__(self, *, configuration: Configuration, doclingdocument: DoclingDocument) -> None:
+        """Analyzes `doclingdocument` in stages, each on first access of the attributes that depend on it: the full
+        text, its language, its tokens, and its sections and summary."""
         self.configuration = configuration
         self.doclingdocument = doclingdocument
         self.sectiontitle_to_entities_text: dict[str, Entities] = {}
         self.sectiontitle_to_entities_title: dict[str, Entities] = {}
-        self.sectiontitle_to_flatsection: dict[str, Flatsection] = {}
-        self._language_to_nermodel: dict[Language, LanguageSpacy | SpanMarkerModel] = {
-            Language.ENGLISH: self._load_ner_model(
-                modelname_spacy=self.configuration.paths._path_dir_model_spacy_en,
-                language=Language.ENGLISH,
-            ),
-            Language.DUTCH: self._load_ner_model(
-                modelname_spacy=self.configuration.paths._path_dir_model_spacy_nl,
-                language=Language.DUTCH,
-            ),
-        }
-        self._languagedetector = (
-            LanguageDetectorBuilder.from_languages(
-                *self._language_to_nermodel.keys(),
-            )
-            .with_preloaded_language_models()
-            .build()
-        )
-        self._is_summarized = False
-        self.summary = ""
-        self.text_full = Document.normalize_string(
+        self._summary_fallback = ""
+
+    @cached_property
+    def text_full(self) -> str:
+        return Document.normalize_string(
             text=self.doclingdocument.export_to_markdown(strict_text=True),
             keep_newlines=True,
         ).replace(
             "<!-- missing-text -->",
             "",
         )
+
+    @cached_property
+    def language(self) -> Language:
         try:
-            self.language = self._detect_language(text=self.text_full)
+            return self._detect_language(text=self.text_full[: self.LENGTH_SAMPLE_LANGUAGE])
         except (DocumentLanguageNotdetectedError, DocumentLanguageUnsupportedError):
-            self.language = Language.ENGLISH
             logger.warning(
-                "Failed to detect language, using default {language} for document {document}.",
-                language=self.language.name,
-                document=str(self),
+                "Failed to detect language, using default {language} for document {name}.",
+                language=Language.ENGLISH.name,
+                name=self.doclingdocument.name,
+            )
+            return Language.ENGLISH
+
+    @cached_property
+    def text_tokenized(self) -> Doc:
+        return self.tokenize(self.text_full)
+
+    @cached_property
+    def sectiontitle_to_flatsection(self) -> dict[str, Flatsection]:
+        return self._extract_texts_and_tables()
+
+    @cached_property
+    def summary(self) -> str:
+        """The text of the summary sections, or if there are none, a fall-back summary from the first section."""
+        if sectiontitles_summary_found := [
+            sectiontitle
+            for sectiontitle_summary in self.SECTIONTITLES_SUMMARY
+            for sectiontitle in self.sectiontitle_to_flatsection
+            if sectiontitle_summary in sectiontitle
+        ]:
+            summary = "\n".join(
+                self.sectiontitle_to_flatsection[sectiontitle].text for sectiontitle in sectiontitles_summary_found
             )
-        self.text_tokenized = self._language_to_nermodel[self.language](self.text_full)
-        self._extract_texts_and_tables()
+            logger.debug("Found a {} words long summary section.", len(summary.split(" ")))
+            return summary
+        return self._summary_fallback
+
+    @property
+    def _nermodel(self) -> LanguageSpacy | SpanMarkerModel:
+        return self._get_ner_model(configuration=self.configuration, language=self.language)
+
+    def release(self) -> None:
+        """Releases the tokens and the table data frames of the document, which take the most memory, once extraction
+        finishes. They are recomputed if accessed again."""
+        self.__dict__.pop("text_tokenized", None)
+        if "sectiontitle_to_flatsection" in self.__dict__:
+            for flatsection in self.sectiontitle_to_flatsection.values():
+                flatsection.release()
+
+    def tokenize(self, text: str) -> Doc:
+        """Tokenizes `text` by the spaCy pipeline of the language of the document, without running its components, since
+        only the tokens and their lexical attributes are used."""
+        nermodel = self._nermodel
+        assert isinstance(nermodel, LanguageSpacy)
+        return nermodel.make_doc(text)
 
     def __str__(self) -> str:
         if self.doclingdocument.origin is not None:
@@ -239,49 +366,146 @@ class Document:
             )
         return f"Document '{self.doclingdocument.name}', written in {self.language.name})."
 
+    @staticmethod
+    def _chunk(text: str, *, length_max: int) -> list[str]:
+        """Splits `text` into chunks of at most `length_max` characters, at line breaks where possible."""
+        chunks = [""]
+        for line in text.splitlines(keepends=True):
+            for index in range(0, len(line), length_max):
+                part = line[index : index + length_max]
+                if len(chunks[-1]) + len(part) > length_max:
+                    chunks.append(part)
+                else:
+                    chunks[-1] += part
+        return chunks
+
+    @staticmethod
+    def _to_entities_spanmarker(predictions: Iterable[Any]) -> Entities:
+        """Collects the entities from the predictions of a SpanMarker model for a single text, based on their 'span' and
+        'label'."""
+        entities: Entities = {}
+        # The nested blocks are required because of rather dynamic typing.
+        # pylint: disable-next=too-many-nested-blocks
+        for prediction in predictions:
+            if isinstance(
+                prediction,
+                Mapping,
+            ):
+                if (label := prediction.get("label")) and (span := prediction.get("span")):
+                    entities[Entity(entitytype=label, value=span)] = None
+                else:
+                    for predictioninner in prediction:
+                        if (label := predictioninner.get("label")) and (span := predictioninner.get("span")):
+                            entities[Entity(entitytype=label, value=span)] = None
+        return entities
+
     def _perform_ner(
         self,
         *,
-        text: str,
-    ) -> Entities:
+        texts: Sequence[str],
+    ) -> list[Entities]:
         """
-        Perform Named Entity Recognition (NER) on the text using a spaCy or SpanMarker model.
+        Perform Named Entity Recognition (NER) on the texts using a spaCy or SpanMarker model, `ner_size_batch` texts at
+        a time.
 
         Args:
-            language: The language of the text.
-            text: The text to process.
+            texts: The texts to process, in the language of the document.
         """
-        nermodel = self._language_to_nermodel[self.language]
-        entities: dict[Entity, None] = {}
-        if self.language in self._language_to_nermodel and isinstance(
-            nermodel,
-            LanguageSpacy,
-        ):
-            logger.debug("Using spaCy for NER.")
-            # Use spaCy pipeline for supported languages (e.g., English).
-            predictions = nermodel(text)
-            for span_spacy in predictions.ents:
-                if span_spacy.label_ and span_spacy.text:
-                    entities[Entity(entitytype=span_spacy.label_, value=span_spacy.text)] = None
-        # The nested blocks are required because of rather dynamic typing.
-        # pylint: disable-next=too-many-nested-blocks
-        elif isinstance(nermodel, SpanMarkerModel):
-            logger.debug("Using span_marker for NER.")
-            # Use SpanMarker model for unsupported languages.
-            predictions = nermodel.predict(text)
-            # Iterate over predictions and collect entities based on 'span' and 'label'.
-            for prediction in predictions:
-                if isinstance(
-                    prediction,
-                    Mapping,
-                ):
-                    if (label := prediction.get("label")) and (span := prediction.get("span")):
-                        entities[Entity(entitytype=label, value=span)] = None
-                    else:
-                        for predictioninner in prediction:
-                            if (label := predictioninner.get("label")) and (span := predictioninner.get("span")):
-                                entities[Entity(entitytype=label, value=span)] = None
-        return entities
+        if not texts:
+            return []
+        nermodel = self._nermodel
+        if isinstance(nermodel, LanguageSpacy):
+            logger.debug("Using spaCy for NER on {n_texts} texts.", n_texts=len(texts))
+            # Texts beyond the maximum length of the pipeline are chunked, and the entities of their chunks combined.
+            indices_text: list[int] = []
+            chunks: list[str] = []
+            for index_text, text in enumerate(texts):
+                for chunk in self._chunk(text, length_max=nermodel.max_length):
+                    indices_text.append(index_text)
+                    chunks.append(chunk)
+            entitiess: list[Entities] = [{} for _ in texts]
+            for index_text, doc in zip(
+                indices_text,
+                nermodel.pipe(
+                    chunks,
+                    batch_size=self.configuration.ner_size_batch,
+                    disable=[name for name in nermodel.pipe_names if name in self.NAMES_PIPE_NER_UNNEEDED],
+                    n_process=self.configuration.ner_n_processes,
+                ),
+                strict=True,
+            ):
+                for span_spacy in doc.ents:
+                    if span_spacy.label_ and span_spacy.text:
+                        entitiess[index_text][Entity(entitytype=span_spacy.label_, value=span_spacy.text)] = None
+            return entitiess
+        logger.debug("Using span_marker for NER on {n_texts} texts.", n_texts=len(texts))
+        return [
+            self._to_entities_spanmarker(predictions)
+            for predictions in nermodel.predict(list(texts), batch_size=self.configuration.ner_size_batch)
+        ]
+
+    @staticmethod
+    def _get_name_model_cache(nermodel: LanguageSpacy | SpanMarkerModel) -> str:
+        """Identifies `nermodel` in the NER cache by its own name and version rather than by where it's loaded from, so
+        that a model upgraded in place doesn't get the entities found by its predecessor."""
+        if isinstance(nermodel, LanguageSpacy):
+            return f"{Framework.SPACY}/{nermodel.meta['lang']}_{nermodel.meta['name']}-{nermodel.meta['version']}"
+        return f"{Framework.SPANMARKER}/{nermodel.config.name_or_path}@{getattr(nermodel.config, '_commit_hash', '')}"
+
+    def _perform_ner_cached(self, *, texts: Sequence[str]) -> list[Entities]:
+        """Like `_perform_ner()`, but looks up the entities of `texts` in the NER cache of the process first."""
+        entitiesscached = self.get_cachener(configuration=self.configuration).perform(
+            texts,
+            language=self.language.iso_code_639_1.name.lower(),
+            name_model=self._get_name_model_cache(self._nermodel),
+            perform=lambda texts_miss: [
+                tuple((entity.entitytype, entity.value) for entity in entities)
+                for entities in self._perform_ner(texts=texts_miss)
+            ],
+        )
+        return [
+            {Entity(entitytype=entitytype, value=value): None for entitytype, value in entitiescached}
+            for entitiescached in entitiesscached
+        ]
+
+    @staticmethod
+    def _perform_ner_tasks(tasksner: Iterable[Taskner]) -> None:
+        """Performs the NER of `tasksner` in batches per language, across documents, and on each distinct uncached text
+        once."""
+        language_to_tasksner: dict[Language, list[Taskner]] = {}
+        for taskner in tasksner:
+            language_to_tasksner.setdefault(taskner.document.language, []).append(taskner)
+        for tasksner_language in language_to_tasksner.values():
+            document = tasksner_language[0].document
+            texts = list(dict.fromkeys(taskner.text for taskner in tasksner_language))
+            text_to_entities = dict(zip(texts, document._perform_ner_cached(texts=texts), strict=True))
+            for taskner in tasksner_language:
+                taskner.sectiontitle_to_entities[taskner.sectiontitle] = dict(text_to_entities[taskner.text])
+            document.get_cachener(configuration=document.configuration).log_metrics()
+
+    def _get_tasksner_texts(self, sectiontitle_selected_to_flatsection: Mapping[str, Flatsection]) -> list[Taskner]:
+        return [
+            Taskner(
+                document=self,
+                sectiontitle=sectiontitle,
+                sectiontitle_to_entities=self.sectiontitle_to_entities_text,
+                text=flatsection.text,
+            )
+            for sectiontitle, flatsection in sectiontitle_selected_to_flatsection.items()
+            if sectiontitle not in self.sectiontitle_to_entities_text
+        ]
+
+    def _get_tasksner_titles(self) -> list[Taskner]:
+        return [
+            Taskner(
+                document=self,
+                sectiontitle=sectiontitle,
+                sectiontitle_to_entities=self.sectiontitle_to_entities_title,
+                text=sectiontitle,
+            )
+            for sectiontitle in self.sectiontitle_to_flatsection
+            if sectiontitle not in self.sectiontitle_to_entities_title
+        ]
 
     def perform_ner_texts(
         self,
@@ -290,29 +514,42 @@ class Document:
         """
         Perform NER on the text of the selected sections.
         """
-        for sectiontitle, flatsection in sectiontitle_selected_to_flatsection.items():
-            if sectiontitle not in self.sectiontitle_to_entities_text:
-                self.sectiontitle_to_entities_text[sectiontitle] = self._perform_ner(
-                    text=flatsection.text,
-                )
+        self._perform_ner_tasks(self._get_tasksner_texts(sectiontitle_selected_to_flatsection))
 
     def perform_ner_titles(self) -> None:
         """
         Perform NER on the titles of all sections.
         """
-        for sectiontitle in self.sectiontitle_to_flatsection:
-            if sectiontitle not in self.sectiontitle_to_entities_title:
-                self.sectiontitle_to_entities_title[sectiontitle] = self._perform_ner(
-                    text=sectiontitle,
+        self._perform_ner_tasks(self._get_tasksner_titles())
+
+    @staticmethod
+    def perform_ner_documents(
+        documents_and_sectiontitle_selected_to_flatsection: Iterable[
+            tuple["Document", Mapping[str, Flatsection] | None]
+        ],
+    ) -> None:
+        """
+        Perform NER on the titles of all sections and, if given, on the text of the selected sections, of many
+        documents at once, batched across documents.
+        """
+        Document._perform_ner_tasks(
+            chain.from_iterable(
+                chain(
+                    document._get_tasksner_titles(),
+                    document._get_tasksner_texts(sectiontitle_selected_to_flatsection or {}),
                 )
+                for document, sectiontitle_selected_to_flatsection in documents_and_sectiontitle_selected_to_flatsection
+            ),
+        )
 
     def _extract_texts_and_tables(
         self,
-    ) -> None:
+    ) -> dict[str, Flatsection]:
         """
-        Extract texts and tables from documents while retaining structure.
-        Returns the number of sections extracted.
+        Extract texts and tables from documents while retaining structure, and the fall-back summary.
+        Returns the sections extracted.
         """
+        sectiontitle_to_flatsection: dict[str, Flatsection] = {}
         index_section = 0
         title_section_current = ""
         for nodeitem, _ in self.doclingdocument.iterate_items():
@@ -320,58 +557,46 @@ class Document:
                 case SectionHeaderItem(text=text):
                     if (
                         title_section_current := Document.normalize_string(text=text)
-                    ) and title_section_current not in self.sectiontitle_to_flatsection:
-                        self.sectiontitle_to_flatsection[title_section_current] = Flatsection()
+                    ) and title_section_current not in sectiontitle_to_flatsection:
+                        sectiontitle_to_flatsection[title_section_current] = Flatsection()
                     index_section += 1
                 case TextItem(text=text) if (
                     # TODO: Why is paragraph text being compared with section titles?
                     text_section_new := Document.normalize_string(text=text)
                 ):
                     # Add paragraph text, separated by a newline.
-                    if title_section_current in self.sectiontitle_to_flatsection:
-                        self.sectiontitle_to_flatsection[title_section_current].text += text_section_new + "\n"
+                    if title_section_current in sectiontitle_to_flatsection:
+                        sectiontitle_to_flatsection[title_section_current].text += text_section_new + "\n"
                     else:
-                        self.sectiontitle_to_flatsection[title_section_current] = Flatsection(
+                        sectiontitle_to_flatsection[title_section_current] = Flatsection(
                             text=text_section_new + "\n",
                         )
                     # At least a couple of words.
                     if (
                         index_section == 1
-                        and len(self.sectiontitle_to_flatsection[title_section_current].text) > self.LEN_SUMMARY_MIN
+                        and len(sectiontitle_to_flatsection[title_section_current].text) > self.LEN_SUMMARY_MIN
                     ):
-                        self.summary += self.sectiontitle_to_flatsection[title_section_current].text
+                        self._summary_fallback += sectiontitle_to_flatsection[title_section_current].text
                         logger.debug("Augmented fallback summary with a paragraph from the first section.")
                 case TableItem():
-                    table = nodeitem.export_to_dataframe()
-                    if title_section_current in self.sectiontitle_to_flatsection:
-                        self.sectiontitle_to_flatsection[title_section_current].tables.append(table)
+                    if title_section_current in sectiontitle_to_flatsection:
+                        sectiontitle_to_flatsection[title_section_current].tableitems.append(nodeitem)
                     else:
-                        self.sectiontitle_to_flatsection[title_section_current] = Flatsection(
-                            tables=[table],
+                        sectiontitle_to_flatsection[title_section_current] = Flatsection(
+                            tableitems=[nodeitem],
                         )
         logger.debug(
             "Extracted {} sections: {}.",
-            len(self.sectiontitle_to_flatsection.keys()),
-            tuple(self.sectiontitle_to_flatsection.keys()),
+            len(sectiontitle_to_flatsection.keys()),
+            tuple(sectiontitle_to_flatsection.keys()),
         )
+        return sectiontitle_to_flatsection
 
     def summarize(self) -> None:
         """
-        Summarizes the document (more than the fall-back summary).
+        Summarizes the document (more than the fall-back summary) now, rather than on first access of `summary`.
         """
-        if not self._is_summarized and (
-            sectiontitles_summary_found := [
-                sectiontitle
-                for sectiontitle_summary in self.SECTIONTITLES_SUMMARY
-                for sectiontitle in self.sectiontitle_to_flatsection
-                if sectiontitle_summary in sectiontitle
-            ]
-        ):
-            self.summary = "\n".join(
-                self.sectiontitle_to_flatsection[sectiontitle].text for sectiontitle in sectiontitles_summary_found
-            )
-            self._is_summarized = True
-            logger.debug("Found a {} words long summary section.", len(self.summary.split(" ")))
+        _ = self.summary
 
     # TODO: Can we avoid that we spend resources to run _extract_texts_and_tables, to then duplicate part of its data?
     # TODO: Must this method be public?
@@ -393,7 +618,7 @@ class Document:
                         sectiontitle_filtered_to_flatsection.setdefault(
                             sectiontitle,
                             Flatsection(),
-                        ).tables = flatsection.tables
+                        ).tableitems = flatsection.tableitems
                         if len(flatsection.text) > self.LENGTH_SECTION_MIN:
                             sectiontitle_filtered_to_flatsection[sectiontitle].text = flatsection.text
             if not sectiontitle_filtered_to_flatsection:
@@ -404,8 +629,8 @@ class Document:
         return sectiontitle_filtered_to_flatsection
 
     def _detect_language(self, text: str) -> Language:
-        if not (language := self._languagedetector.detect_language_of(text=text)):
+        if not (language := self._get_languagedetector(self.LANGUAGES).detect_language_of(text=text)):
             raise DocumentLanguageNotdetectedError()
-        if language not in self._language_to_nermodel:
-            raise DocumentLanguageUnsupportedError(language=language, languages=self._language_to_nermodel.keys())
+        if language not in self.LANGUAGES:
+            raise DocumentLanguageUnsupportedError(language=language, languages=self.LANGUAGES)
         return language
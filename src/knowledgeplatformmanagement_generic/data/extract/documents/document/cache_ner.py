@@ -0,0 +1,206 @@
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from functools import cache
+from hashlib import blake2b
+from os import utime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Final
+
+from loguru import logger
+
+from knowledgeplatformmanagement_generic.data.extract.documents.document import normalizer
+
+FRACTION_EVICTION: Final[float] = 0.125
+"""The share of the maximum number of entries on disk to evict at once, so that eviction doesn't run on every write."""
+SIZE_KEY: Final[int] = 16
+"""The size in bytes of a cache key."""
+
+type Entitiescached = tuple[tuple[str, str], ...]
+"""The entity types and values of the entities in a text, in order of appearance."""
+
+
+class Cachener:
+    """A cache of the named entities in texts, keyed by the NER model, the language, and the hash value of the
+    normalized text. NER is performed on the normalized text too, so texts that normalize alike have the same entities
+    whether cached or not.
+
+    Up to `n_entries_max` entries are kept in memory, beyond which the least recently used are dropped. If `path_dir` is
+    given, up to `n_entries_max_disk` entries are also kept on disk, as JSON files sharded over subdirectories by the
+    first two hexadecimal digits of their key, so that they outlive the process. Beyond that, the least recently used
+    are evicted, by the modification time of their files. Safe to use from multiple threads.
+    """
+
+    def __init__(self, *, n_entries_max: int, n_entries_max_disk: int, path_dir: Path | None) -> None:
+        self.n_entries_max: Final[int] = n_entries_max
+        self.n_entries_max_disk: Final[int] = n_entries_max_disk
+        self.path_dir: Final[Path | None] = path_dir
+        self.n_hits_disk = 0
+        self.n_hits_memory = 0
+        self.n_misses = 0
+        self._key_to_entitiescached: OrderedDict[bytes, Entitiescached] = OrderedDict()
+        self._lock = Lock()
+        self._lock_eviction = Lock()
+        # Counted on the first write, since counting scans the directory.
+        self._n_entries_disk: int | None = None
+
+    @property
+    def ratio_hits(self) -> float:
+        """The share of texts looked up whose entities were cached, in memory or on disk, or 0 if none were looked up
+        yet."""
+        n_hits = self.n_hits_disk + self.n_hits_memory
+        return n_hits / (n_hits + self.n_misses) if n_hits + self.n_misses else 0.0
+
+    @staticmethod
+    def _to_key(text_normalized: str, *, language: str, name_model: str) -> bytes:
+        return blake2b(f"{name_model}\0{language}\0{text_normalized}".encode(), digest_size=SIZE_KEY).digest()
+
+    @staticmethod
+    def _get_path_file(key: bytes, *, path_dir: Path) -> Path:
+        return path_dir / key.hex()[:2] / f"{key.hex()}.json"
+
+    def _put_memory(self, key: bytes, entitiescached: Entitiescached) -> None:
+        self._key_to_entitiescached[key] = entitiescached
+        self._key_to_entitiescached.move_to_end(key)
+        while len(self._key_to_entitiescached) > self.n_entries_max:
+            self._key_to_entitiescached.popitem(last=False)
+
+    def _read(self, key: bytes, *, path_dir: Path) -> Entitiescached | None:
+        path_file = self._get_path_file(key, path_dir=path_dir)
+        try:
+            pairs = json.loads(path_file.read_text(encoding="utf-8"))
+            # Mark the entry as used recently, so it's evicted last.
+            utime(path_file)
+        # Another thread or process may have evicted it meanwhile.
+        except FileNotFoundError:
+            return None
+        return tuple((entitytype, value) for entitytype, value in pairs)
+
+    def _write(self, key: bytes, entitiescached: Entitiescached, *, path_dir: Path) -> None:
+        path_file = self._get_path_file(key, path_dir=path_dir)
+        path_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Write to a uniquely named partial file first, so that neither a crash nor a concurrent write of the same
+        # entry ever leaves a truncated entry behind.
+        with NamedTemporaryFile(
+            delete=False,
+            dir=path_file.parent,
+            encoding="utf-8",
+            mode="w",
+            suffix=".partial",
+        ) as file_partial:
+            json.dump(entitiescached, file_partial)
+        is_new = not path_file.exists()
+        Path(file_partial.name).replace(path_file)
+        if is_new:
+            with self._lock:
+                if self._n_entries_disk is None:
+                    self._n_entries_disk = self._count_disk(path_dir=path_dir)
+                else:
+                    self._n_entries_disk += 1
+                is_full = self._n_entries_disk > self.n_entries_max_disk
+            if is_full:
+                self._evict(path_dir=path_dir)
+
+    @staticmethod
+    def _count_disk(*, path_dir: Path) -> int:
+        return sum(1 for _ in path_dir.glob("*/*.json"))
+
+    def _evict(self, *, path_dir: Path) -> None:
+        """Evicts the least recently used entries from disk, leaving `1 - FRACTION_EVICTION` of `n_entries_max_disk`.
+        Entries written or read are used."""
+        # Another thread is evicting already.
+        if not self._lock_eviction.acquire(blocking=False):
+            return
+        try:
+            mtimes_and_paths_file = []
+            for path_file in path_dir.glob("*/*.json"):
+                try:
+                    mtimes_and_paths_file.append((path_file.stat().st_mtime_ns, path_file))
+                except FileNotFoundError:
+                    continue
+            mtimes_and_paths_file.sort()
+            n_evicted = max(
+                len(mtimes_and_paths_file) - int(self.n_entries_max_disk * (1 - FRACTION_EVICTION)),
+                0,
+            )
+            for _, path_file in mtimes_and_paths_file[:n_evicted]:
+                path_file.unlink(missing_ok=True)
+            with self._lock:
+                self._n_entries_disk = len(mtimes_and_paths_file) - n_evicted
+            logger.debug(
+                "Evicted {n_evicted} entries from the NER cache in '{path_dir!s}'.",
+                n_evicted=n_evicted,
+                path_dir=path_dir,
+            )
+        finally:
+            self._lock_eviction.release()
+
+    def perform(
+        self,
+        texts: Sequence[str],
+        *,
+        language: str,
+        name_model: str,
+        perform: Callable[[list[str]], list[Entitiescached]],
+    ) -> list[Entitiescached]:
+        """Returns the entities in `texts`, calling `perform` only for the distinct normalized texts cached neither in
+        memory nor on disk, and caching their entities in turn."""
+        texts_normalized = [normalizer.normalize_string(text, keep_newlines=True) for text in texts]
+        keys = [
+            self._to_key(text_normalized, language=language, name_model=name_model)
+            for text_normalized in texts_normalized
+        ]
+        entitiesscached: list[Entitiescached] = [() for _ in texts]
+        key_to_indices_miss: dict[bytes, list[int]] = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                if (entitiescached := self._key_to_entitiescached.get(key)) is None:
+                    key_to_indices_miss.setdefault(key, []).append(index)
+                else:
+                    self._key_to_entitiescached.move_to_end(key)
+                    entitiesscached[index] = entitiescached
+                    self.n_hits_memory += 1
+        if self.path_dir is not None:
+            key_to_entitiescached_disk = {
+                key: entitiescached
+                for key in key_to_indices_miss
+                if (entitiescached := self._read(key, path_dir=self.path_dir)) is not None
+            }
+            with self._lock:
+                for key, entitiescached in key_to_entitiescached_disk.items():
+                    for index in key_to_indices_miss.pop(key):
+                        entitiesscached[index] = entitiescached
+                        self.n_hits_disk += 1
+                    self._put_memory(key, entitiescached)
+        if key_to_indices_miss:
+            # Perform NER outside the lock, so other threads can use the cache meanwhile.
+            entitiesscached_miss = perform([texts_normalized[indices[0]] for indices in key_to_indices_miss.values()])
+            for (key, indices), entitiescached in zip(key_to_indices_miss.items(), entitiesscached_miss, strict=True):
+                if self.path_dir is not None:
+                    self._write(key, entitiescached, path_dir=self.path_dir)
+                with self._lock:
+                    for index in indices:
+                        entitiesscached[index] = entitiescached
+                        self.n_misses += 1
+                    self._put_memory(key, entitiescached)
+        return entitiesscached
+
+    def log_metrics(self) -> None:
+        logger.info(
+            "NER cache: {n_hits_memory} hits in memory, {n_hits_disk} hits on disk, {n_misses} misses (hit rate "
+            "{ratio_hits:.1%}), {n_entries} entries in memory.",
+            n_entries=len(self._key_to_entitiescached),
+            n_hits_disk=self.n_hits_disk,
+            n_hits_memory=self.n_hits_memory,
+            n_misses=self.n_misses,
+            ratio_hits=self.ratio_hits,
+        )
+
+
+@cache
+def get_cachener(*, n_entries_max: int, n_entries_max_disk: int, path_dir: Path | None) -> Cachener:
+    """Returns the NER cache of the process for `n_entries_max`, `n_entries_max_disk` and `path_dir`, creating it on
+    first use."""
+    return Cachener(n_entries_max=n_entries_max, n_entries_max_disk=n_entries_max_disk, path_dir=path_dir)
@@ -0,0 +1,62 @@
+import re
+from functools import cache
+from unicodedata import category, normalize
+
+CATEGORIES_NOISY = frozenset({"Cc", "Cf", "Cn", "Co", "Cs", "Zp", "Zs"})
+"""The Unicode General Categories of characters to remove, such as control characters and separators other than the
+space and the newline. See https://unicode.org/reports/tr44/#General_Category_Values."""
+CODEPOINT_ASTRAL_FIRST = 0x10000
+"""The first code point beyond the Basic Multilingual Plane."""
+PATTERN_ASTRAL = re.compile(r"[\U00010000-\U0010ffff]")
+PATTERN_NEWLINES = re.compile(r"\n{2,}")
+PATTERN_SPACES = re.compile(r" {2,}")
+
+
+def _is_noisy(character: str) -> bool:
+    return character not in {" ", "\n"} and category(character) in CATEGORIES_NOISY
+
+
+class _Tablenoisy(dict[int, int | None]):
+    """A translation table that deletes noisy characters, and keeps others. Filled on first lookup of each character,
+    since a complete table would cover all code points."""
+
+    def __missing__(self, codepoint: int) -> int | None:
+        self[codepoint] = None if _is_noisy(chr(codepoint)) else codepoint
+        return self[codepoint]
+
+
+TABLE_NOISY = _Tablenoisy()
+
+
+@cache
+def _get_pattern_noisy() -> re.Pattern[str]:
+    """Compiles a character class of the noisy characters in the Basic Multilingual Plane, once, on first use. Limited
+    to it, so that the regular expression engine matches the class by bitmap rather than range by range."""
+    ranges: list[tuple[int, int]] = []
+    for codepoint in range(CODEPOINT_ASTRAL_FIRST):
+        if _is_noisy(chr(codepoint)):
+            if ranges and ranges[-1][1] == codepoint - 1:
+                ranges[-1] = (ranges[-1][0], codepoint)
+            else:
+                ranges.append((codepoint, codepoint))
+    return re.compile(
+        "["
+        + "".join(
+            re.escape(chr(start)) if start == end else f"{re.escape(chr(start))}-{re.escape(chr(end))}"
+            for start, end in ranges
+        )
+        + "]+",
+    )
+
+
+def normalize_string(text: str, *, keep_newlines: bool = False) -> str:
+    """Normalizes `text` like `Document.normalize_string()`, which calls this, with regular expressions and a
+    translation table rather than per character."""
+    # The line separator is the only character in category Zl. Neither it nor the tab is affected by NFKC, so both can
+    # be replaced before normalizing.
+    text = _get_pattern_noisy().sub("", normalize("NFKC", text.replace("\t", " ").replace("\u2028", "\n")))
+    # Characters beyond the Basic Multilingual Plane are rare, but many of them are unassigned or for private use.
+    if PATTERN_ASTRAL.search(text):
+        text = text.translate(TABLE_NOISY)
+    text = PATTERN_NEWLINES.sub("\n", PATTERN_SPACES.sub(" ", text).strip(" ")).strip("\n")
+    return text if keep_newlines else text.replace("\n", " ")
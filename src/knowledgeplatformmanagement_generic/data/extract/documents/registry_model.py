@@ -0,0 +1,76 @@
+from collections.abc import Callable
+from enum import StrEnum
+from threading import Lock
+from time import perf_counter
+from typing import Any, NamedTuple
+
+from loguru import logger
+
+
+class Framework(StrEnum):
+    LINGUA = "lingua"
+    SPACY = "spacy"
+    SPANMARKER = "span_marker"
+
+
+class Keymodel(NamedTuple):
+    framework: Framework
+    language: str | None
+    """The ISO 639-1 code of the language the model is for, or `None` if it's for several."""
+    name: str
+
+
+class Entrymodel(NamedTuple):
+    duration_load: float
+    model: Any
+    size: int | None
+    """The approximate size in bytes of the model in memory, or `None` if unknown."""
+
+
+class Registrymodel:
+    """A process-wide registry of NLP models, each loaded at most once, on first use, and shared from then on. Safe to
+    use from multiple threads: a model being loaded blocks only the threads waiting for the same model."""
+
+    def __init__(self) -> None:
+        self._key_to_entrymodel: dict[Keymodel, Entrymodel] = {}
+        self._key_to_lock: dict[Keymodel, Lock] = {}
+        self._lock = Lock()
+
+    def get[T](self, key: Keymodel, *, load: Callable[[], T], sizeof: Callable[[T], int] | None = None) -> T:
+        """Returns the model `key`, calling `load` to load it first if it isn't yet, and `sizeof` to account for the
+        memory it takes."""
+        if (entrymodel := self._key_to_entrymodel.get(key)) is not None:
+            return entrymodel.model  # type: ignore[no-any-return]
+        with self._lock:
+            lock = self._key_to_lock.setdefault(key, Lock())
+        with lock:
+            # Another thread may have loaded the model meanwhile.
+            if (entrymodel := self._key_to_entrymodel.get(key)) is None:
+                logger.info("Loading {framework} model {name} ...", framework=key.framework, name=key.name)
+                time_start = perf_counter()
+                model = load()
+                entrymodel = Entrymodel(
+                    duration_load=perf_counter() - time_start,
+                    model=model,
+                    size=sizeof(model) if sizeof else None,
+                )
+                self._key_to_entrymodel[key] = entrymodel
+                logger.info(
+                    "Loaded {framework} model {name} in {duration_load:.1f} s ({size}).",
+                    duration_load=entrymodel.duration_load,
+                    framework=key.framework,
+                    name=key.name,
+                    size="size unknown" if entrymodel.size is None else f"{entrymodel.size / 2**20:.0f} MiB",
+                )
+        return entrymodel.model  # type: ignore[no-any-return]
+
+    def get_size_total(self) -> int:
+        """Returns the approximate size in bytes of all loaded models in memory, insofar known."""
+        return sum(entrymodel.size or 0 for entrymodel in self._key_to_entrymodel.values())
+
+    def get_key_to_entrymodel(self) -> dict[Keymodel, Entrymodel]:
+        return dict(self._key_to_entrymodel)
+
+
+REGISTRYMODEL = Registrymodel()
+"""The registry of the process."""
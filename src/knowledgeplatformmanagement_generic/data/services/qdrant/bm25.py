@@ -0,0 +1,49 @@
+import re
+from collections import Counter
+from hashlib import blake2b
+from typing import Final
+
+from qdrant_client.models import SparseVector
+
+B: Final[float] = 0.75
+"""How much BM25 normalizes term frequencies by the length of the text."""
+K: Final[float] = 1.2
+"""How quickly BM25 term frequencies saturate."""
+LENGTH_AVERAGE: Final[float] = 256.0
+"""The assumed average number of tokens of a text, as the collection's isn't known when encoding."""
+PATTERN_TOKEN: Final[re.Pattern[str]] = re.compile(r"\w+(?:[-./]\w+)*")
+"""Matches words, and identifiers and codes like ‘P-2023-01’ or ‘4.12.3’ as a whole."""
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits `text` into lowercased tokens. An identifier or code yields itself as a whole, followed by its parts, so
+    that it matches on either."""
+    tokens: list[str] = []
+    for token in PATTERN_TOKEN.findall(text.casefold()):
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(re.findall(r"\w+", token))
+    return tokens
+
+
+def to_index(token: str) -> int:
+    """Derives the sparse vector index of `token` deterministically from its hash value."""
+    return int.from_bytes(blake2b(token.encode(), digest_size=4).digest(), byteorder="little", signed=False)
+
+
+def to_sparsevector_document(text: str) -> SparseVector:
+    """Encodes `text` as the BM25 term frequency weights of its tokens. Qdrant multiplies them by the inverse document
+    frequencies, if the sparse vector is configured with the IDF modifier."""
+    tokens = tokenize(text)
+    normalization = K * (1 - B + B * len(tokens) / LENGTH_AVERAGE)
+    index_to_count = Counter(to_index(token) for token in tokens)
+    return SparseVector(
+        indices=list(index_to_count),
+        values=[count * (K + 1) / (count + normalization) for count in index_to_count.values()],
+    )
+
+
+def to_sparsevector_query(text: str) -> SparseVector:
+    """Encodes `text` as a BM25 query, weighing each of its distinct tokens equally."""
+    indices = list(dict.fromkeys(to_index(token) for token in tokenize(text)))
+    return SparseVector(indices=indices, values=[1.0] * len(indices))
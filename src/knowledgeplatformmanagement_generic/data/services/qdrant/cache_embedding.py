@@ -0,0 +1,128 @@
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from typing import Any, Final
+
+from loguru import logger
+from numpy import empty, float16, float32, frombuffer, memmap, uint8, uint64
+from numpy.typing import DTypeLike, NDArray
+
+SIZE_KEY: Final[int] = 16
+"""The size in bytes of a cache key. A key of only zero bytes marks a free slot."""
+
+
+class Cacheembedding:
+    """An on-disk cache of the embeddings of texts, keyed by the encoder model, the task, and the text's hash value.
+
+    The cache has a slot for each of at most `n_entries_max` entries. Once full, the least recently used entry is
+    evicted. The embeddings are stored as float16 in a memory-mapped array, next to memory-mapped arrays of the key and
+    the time of last use of each slot, from which the index is rebuilt when the cache is opened. Safe to use from
+    multiple threads.
+    """
+
+    def __init__(self, *, dimension: int, n_entries_max: int, name_model: str, path_dir: Path) -> None:
+        self.dimension: Final[int] = dimension
+        self.n_entries_max: Final[int] = n_entries_max
+        self.name_model: Final[str] = name_model
+        self.n_hits = 0
+        self.n_misses = 0
+        self._lock = Lock()
+        path_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path_file_meta = path_dir / "meta.json"
+        meta = {"dimension": dimension, "n_entries_max": n_entries_max, "name_model": name_model}
+        is_valid = path_file_meta.exists() and json.loads(path_file_meta.read_text(encoding="utf-8")) == meta
+        if path_file_meta.exists() and not is_valid:
+            logger.info(
+                "Discarding the embedding cache in '{path_dir!s}', since its configuration changed.",
+                path_dir=path_dir,
+            )
+        self._keys = self._open(path_dir / "keys.u8", dtype=uint8, is_valid=is_valid, shape=(n_entries_max, SIZE_KEY))
+        self._ticks = self._open(path_dir / "ticks.u64", dtype=uint64, is_valid=is_valid, shape=(n_entries_max,))
+        self._vectors = self._open(
+            path_dir / "vectors.f16",
+            dtype=float16,
+            is_valid=is_valid,
+            shape=(n_entries_max, dimension),
+        )
+        if not is_valid:
+            path_file_meta.write_text(json.dumps(meta), encoding="utf-8")
+        is_occupied = self._keys.any(axis=1)
+        # Reversed, so that the lowest free slot is taken first.
+        self._slots_free: list[int] = (~is_occupied).nonzero()[0][::-1].tolist()
+        slots = is_occupied.nonzero()[0].tolist()
+        slots.sort(key=lambda slot: int(self._ticks[slot]))
+        self._key_to_slot: OrderedDict[bytes, int] = OrderedDict((self._keys[slot].tobytes(), slot) for slot in slots)
+        self._tick = int(self._ticks.max(initial=0)) + 1
+
+    @staticmethod
+    def _open(path_file: Path, *, dtype: DTypeLike, is_valid: bool, shape: tuple[int, ...]) -> memmap[Any, Any]:
+        return memmap(path_file, dtype=dtype, mode="r+" if is_valid and path_file.exists() else "w+", shape=shape)
+
+    def _to_key(self, text: str, *, task: str) -> bytes:
+        return blake2b(f"{self.name_model}\0{task}\0{text}".encode(), digest_size=SIZE_KEY).digest()
+
+    def _touch(self, key: bytes, slot: int) -> None:
+        self._key_to_slot.move_to_end(key)
+        self._ticks[slot] = self._tick
+        self._tick += 1
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        *,
+        encode: Callable[[list[str]], NDArray[float32]],
+        task: str,
+    ) -> NDArray[float32]:
+        """Returns the embeddings of `texts` for `task`, calling `encode` only for the distinct texts not in the cache,
+        and caching their embeddings in turn."""
+        keys = [self._to_key(text, task=task) for text in texts]
+        vectors = empty((len(texts), self.dimension), dtype=float32)
+        key_to_indices_miss: dict[bytes, list[int]] = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                slot = self._key_to_slot.get(key)
+                if slot is None:
+                    key_to_indices_miss.setdefault(key, []).append(index)
+                    self.n_misses += 1
+                else:
+                    self._touch(key, slot)
+                    vectors[index] = self._vectors[slot]
+                    self.n_hits += 1
+        if key_to_indices_miss:
+            # Encode outside the lock, so other threads can use the cache meanwhile.
+            vectors_miss = encode([texts[indices[0]] for indices in key_to_indices_miss.values()])
+            with self._lock:
+                for (key, indices), vector in zip(key_to_indices_miss.items(), vectors_miss, strict=True):
+                    vectors[indices] = vector
+                    self._put(key, vector)
+        return vectors
+
+    def _put(self, key: bytes, vector: NDArray[float32]) -> None:
+        if key in self._key_to_slot:
+            slot = self._key_to_slot[key]
+        elif self._slots_free:
+            slot = self._key_to_slot[key] = self._slots_free.pop()
+        else:
+            _, slot = self._key_to_slot.popitem(last=False)
+            self._key_to_slot[key] = slot
+        # Free the slot while writing the vector, so an interrupted write can't leave a key with the wrong vector.
+        self._keys[slot] = 0
+        self._vectors[slot] = vector
+        self._keys[slot] = frombuffer(key, dtype=uint8)
+        self._touch(key, slot)
+
+    def flush(self) -> None:
+        """Writes the cache to disk."""
+        with self._lock:
+            self._vectors.flush()
+            self._keys.flush()
+            self._ticks.flush()
+        logger.info(
+            "Embedding cache: {n_hits} hits, {n_misses} misses, {n_entries} entries.",
+            n_entries=len(self._key_to_slot),
+            n_hits=self.n_hits,
+            n_misses=self.n_misses,
+        )
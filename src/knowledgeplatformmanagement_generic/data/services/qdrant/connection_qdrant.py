@@ -1,6 +1,15 @@
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from functools import partial
 from hashlib import blake2b
-from typing import Any, Final, TypedDict
+from itertools import batched
+from time import perf_counter
+from typing import Final, NamedTuple, TypedDict
+from unicodedata import normalize
+
+from anyio import create_memory_object_stream, create_task_group, from_thread, to_thread
+from anyio.streams.memory import MemoryObjectSendStream
 
 # TODO: See https://github.com/DS4SD/docling/issues/614
 from docling.chunking import BaseChunker  # type: ignore[attr-defined]
@@ -8,47 +17,180 @@ from docling.datamodel.document import DoclingDocument  # type: ignore[attr-defi
 from docling_core.types.doc import DocumentOrigin  # type: ignore[attr-defined]
 from docling_core.types.doc.document import Uint64
 from loguru import logger
-from qdrant_client import AsyncQdrantClient
-from qdrant_client.conversions.common_types import ScoredPoint, StrictModeConfig, VectorParams
+from numpy import empty, float32
+from numpy.typing import NDArray
+from qdrant_client.conversions.common_types import Record, ScoredPoint, StrictModeConfig, VectorParams
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
     Distance,
     FieldCondition,
     Filter,
-    IsEmptyCondition,
+    FusionQuery,
+    HnswConfigDiff,
     MatchValue,
+    Modifier,
     OptimizersConfigDiff,
-    PayloadField,
+    PayloadSchemaType,
+    PointGroup,
     PointStruct,
+    Prefetch,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SparseIndexParams,
+    SparseVector,
+    SparseVectorParams,
 )
+from qdrant_client.models import Fusion as FusionQdrant
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
 from knowledgeplatformmanagement_generic.data.extract.documents.document import Document
+from knowledgeplatformmanagement_generic.data.services.qdrant.bm25 import (
+    to_sparsevector_document,
+    to_sparsevector_query,
+)
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.store_document import Storedocument
 from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing
 from knowledgeplatformmanagement_generic.settings import Configuration
+from knowledgeplatformmanagement_generic.settings.profile_collection import Fusion, Profilecollection, Quantization
+
+
+class Kindpoint(StrEnum):
+    """Discriminates the points stored in a collection, as stored in their `kind` payload field."""
+
+    CHUNK = "chunk"
+    FULLDOCUMENT = "fulldocument"
+    SENTENCE = "sentence"
 
 
 class PayloadChunk(TypedDict):
     hashvalue: str
+    kind: Kindpoint
     text: str
 
 
 class PayloadFulldocument(TypedDict):
-    doclingdocument: dict[str, Any]
+    """Lightweight metadata of a full document. The document itself is in the document store, under `hashvalue`."""
+
     hashvalue: str
+    kind: Kindpoint
     name_file: str
     language: str
     mediatype: str
     sectiontitles: list[str]
-    text_full: str
     text_summary: str
 
 
+KEYS_PAYLOAD_RETRIEVAL: Final[tuple[str, ...]] = ("hashvalue", "kind", "text")
+"""The payload fields of retrieved points by default. Enough to show a hit, and to fetch its full document by."""
+NAMES_FIELD_INDEXED: Final[tuple[str, ...]] = ("hashvalue", "kind")
+"""The payload fields that filters match on, which are indexed so that filtering doesn't scan payloads."""
+NAME_VECTOR_DENSE: Final[str] = ""
+"""The name of the dense vector encoded by the encoder model, which is the collection's default, unnamed vector."""
+NAME_VECTOR_SPARSE: Final[str] = "bm25"
+"""The name of the sparse vector of BM25 term frequency weights."""
+TASK_PASSAGE: Final[str] = "retrieval.passage"
+"""The task of the encoder model to encode texts to retrieve with."""
+TASK_QUERY: Final[str] = "retrieval.query"
+"""The task of the encoder model to encode queries to retrieve texts by."""
+
+
+class Embeddingbatch(NamedTuple):
+    """A batch of sentences encoded in a single call to the encoder model, ready to upload as points."""
+
+    ids: list[int]
+    payloads: list[dict[str, str]]
+    sparsevectors: list[SparseVector]
+    vectors_dense: NDArray[float32]
+    """As returned by the encoder model, converted to lists only while uploading."""
+
+
+class Documentpreparation(NamedTuple):
+    """A document ready to encode the chunks of and to upload."""
+
+    payload_chunk: PayloadChunk
+    payload_fulldocument: PayloadFulldocument
+    texts: list[str]
+
+
+def to_id_point(text: str) -> int:
+    """Derives the point ID of `text` deterministically from its hash value. The full document point is identified by
+    the string of its integer hash value, so it can be retrieved directly rather than searched for."""
+    # Must be reduced to six bits because of https://github.com/qdrant/qdrant-client/issues/936/.
+    hashvalue = int.from_bytes(blake2b(text.encode(), digest_size=6).digest(), byteorder="little", signed=False)
+    return hashvalue & ((1 << 53) - 1)
+
+
+def normalize_query(query: str) -> str:
+    """Normalizes `query` for encoding and caching, so that queries differing only in Unicode representation or
+    whitespace are encoded once."""
+    return " ".join(normalize("NFKC", query).split())
+
+
+def to_vectors(vector_dense: NDArray[float32], *, text: str) -> dict[str, list[float] | SparseVector]:
+    """Returns the named vectors of a point for `text`, encoded as `vector_dense` by the encoder model."""
+    return {NAME_VECTOR_DENSE: vector_dense.tolist(), NAME_VECTOR_SPARSE: to_sparsevector_document(text)}
+
+
+def iterate_vectors(
+    vectors_dense: NDArray[float32],
+    *,
+    sparsevectors: Iterable[SparseVector],
+) -> Iterator[dict[str, list[float] | SparseVector]]:
+    """Yields the named vectors of each point of a batch, converting its dense vectors to lists in a single call once
+    iterated. The Qdrant client only takes named vectors as arrays if all of them are dense, and then converts them
+    point by point."""
+    for vector_dense, sparsevector in zip(vectors_dense.tolist(), sparsevectors, strict=True):
+        yield {NAME_VECTOR_DENSE: vector_dense, NAME_VECTOR_SPARSE: sparsevector}
+
+
+def to_quantizationconfig(profilecollection: Profilecollection) -> QuantizationConfig | None:
+    match profilecollection.quantization:
+        case Quantization.BINARY:
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        case Quantization.SCALAR:
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(always_ram=True, quantile=0.99, type=ScalarType.INT8),
+            )
+        case Quantization.NONE:
+            return None
+
+
+def to_searchparams(profilecollection: Profilecollection) -> SearchParams:
+    return SearchParams(
+        hnsw_ef=profilecollection.hnsw_ef,
+        quantization=(
+            None
+            if profilecollection.quantization is Quantization.NONE
+            else QuantizationSearchParams(
+                oversampling=profilecollection.oversampling,
+                rescore=profilecollection.rescore,
+            )
+        ),
+    )
+
+
 class ConnectionQdrantDocumentstoreError(ValueError):
     def __init__(self, name: str) -> None:
         super().__init__(f"Failed to store document '{name}', since it misses an `origin` attribute.")
 
 
+class ConnectionQdrantCollectionOutdatedError(ValueError):
+    def __init__(self, *, lacking: Sequence[str], name_database: str) -> None:
+        super().__init__(
+            f"Qdrant collection ({name_database}) was created by an earlier version, and lacks {', '.join(lacking)}. "
+            "Rebuild required: delete the collection, and insert its documents and things again.",
+        )
+
+
 # We use this abstraction as part of architectural design, even if right now there are few public methods.
 # TODO: Add methods.
 # pylint: disable-next=too-few-public-methods
@@ -56,88 +198,246 @@ class ConnectionQdrant:
     def __init__(
         self,
         *,
-        asyncqdrantclient: AsyncQdrantClient,
+        cacheembedding: Cacheembedding,
         chunker: BaseChunker,
         configuration: Configuration,
         length_chunk_max: int,
         model_encoder: SentenceTransformer,
+        poolqdrant: PoolQdrant,
+        storedocument: Storedocument,
     ) -> None:
-        self._asyncqdrantclient: Final[AsyncQdrantClient] = asyncqdrantclient
+        self._cacheembedding: Final[Cacheembedding] = cacheembedding
         self._chunker: Final[BaseChunker] = chunker
         self._length_chunk_max: Final[int] = length_chunk_max
         self._model_encoder: Final[SentenceTransformer] = model_encoder
+        self._poolqdrant: Final[PoolQdrant] = poolqdrant
+        self._storedocument: Final[Storedocument] = storedocument
         self.configuration: Final[Configuration] = configuration
 
+    async def check_collection(self) -> bool:
+        """Checks whether the collection exists. If it does, checks that it has the sparse vector and payload indexes
+        that searches rely on, which collections created by earlier versions lack, and raises
+        `ConnectionQdrantCollectionOutdatedError` if not."""
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            if not await asyncqdrantclient.collection_exists(collection_name=self.configuration.name_database):
+                return False
+            collectioninfo = await asyncqdrantclient.get_collection(collection_name=self.configuration.name_database)
+            # Qdrant run in process, as in tests, ignores payload indexes.
+            is_local = (
+                asyncqdrantclient.init_options.get("location") == ":memory:"
+                or asyncqdrantclient.init_options.get("path") is not None
+            )
+        lacking = []
+        if NAME_VECTOR_SPARSE not in (collectioninfo.config.params.sparse_vectors or {}):
+            lacking.append(f"the sparse vector '{NAME_VECTOR_SPARSE}'")
+        if not is_local:
+            lacking.extend(
+                f"the payload index of '{name_field}'"
+                for name_field in NAMES_FIELD_INDEXED
+                if name_field not in collectioninfo.payload_schema
+            )
+        if lacking:
+            raise ConnectionQdrantCollectionOutdatedError(
+                lacking=lacking,
+                name_database=self.configuration.name_database,
+            )
+        return True
+
     async def create_collection(self) -> bool:
+        """Creates the collection, unless it exists already. Returns whether it was created. Raises
+        `ConnectionQdrantCollectionOutdatedError` if it exists, but was created by an earlier version."""
+        if await self.check_collection():
+            logger.info(
+                "Skipping creating Qdrant collection ({name_database}), since it exists already.",
+                name_database=self.configuration.name_database,
+            )
+            return False
         logger.info(
             "Creating Qdrant collection ({name_database}) ...",
             name_database=self.configuration.name_database,
         )
-        return await self._asyncqdrantclient.create_collection(
-            collection_name=self.configuration.name_database,
-            # TODO: Update indexing threshold after persisting. Configure indexing properly in the first place
-            # https://qdrant.tech/documentation/concepts/indexing/
-            optimizers_config=OptimizersConfigDiff(indexing_threshold=0, default_segment_number=2),
-            shard_number=4,
-            strict_mode_config=StrictModeConfig(enabled=True),
-            vectors_config=VectorParams(
-                distance=Distance.COSINE,
-                on_disk=True,
-                size=self._model_encoder.get_sentence_embedding_dimension(),
-            ),
+        profilecollection = self.configuration.qdrant_profile
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            created = await asyncqdrantclient.create_collection(
+                collection_name=self.configuration.name_database,
+                hnsw_config=HnswConfigDiff(
+                    ef_construct=profilecollection.hnsw_ef_construct,
+                    m=profilecollection.hnsw_m,
+                    on_disk=profilecollection.on_disk,
+                ),
+                optimizers_config=OptimizersConfigDiff(
+                    default_segment_number=profilecollection.n_segments,
+                    indexing_threshold=profilecollection.indexing_threshold,
+                ),
+                quantization_config=to_quantizationconfig(profilecollection),
+                shard_number=profilecollection.n_shards,
+                sparse_vectors_config={
+                    # Qdrant weighs the term frequencies by the inverse document frequencies across the collection.
+                    NAME_VECTOR_SPARSE: SparseVectorParams(
+                        index=SparseIndexParams(on_disk=profilecollection.on_disk),
+                        modifier=Modifier.IDF,
+                    ),
+                },
+                strict_mode_config=StrictModeConfig(enabled=True),
+                vectors_config=VectorParams(
+                    distance=Distance.COSINE,
+                    on_disk=profilecollection.on_disk,
+                    size=self._model_encoder.get_sentence_embedding_dimension(),
+                ),
+            )
+        for name_field in NAMES_FIELD_INDEXED:
+            async with self._poolqdrant.operation() as asyncqdrantclient:
+                await asyncqdrantclient.create_payload_index(
+                    collection_name=self.configuration.name_database,
+                    field_name=name_field,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+        return created
+
+    @asynccontextmanager
+    async def bulkload(self) -> AsyncIterator[None]:
+        """Switches indexing off while loading points in bulk, so that Qdrant indexes them once afterwards rather than
+        while they're loaded. See https://qdrant.tech/documentation/database-tutorials/bulk-upload/."""
+        await self._update_indexing_threshold(0)
+        try:
+            yield
+        finally:
+            # Qdrant builds the index in the background.
+            await self._update_indexing_threshold(self.configuration.qdrant_profile.indexing_threshold)
+
+    async def _update_indexing_threshold(self, indexing_threshold: int) -> None:
+        logger.debug(
+            "Setting the indexing threshold of Qdrant collection ({name_database}) to {indexing_threshold} kB ...",
+            indexing_threshold=indexing_threshold,
+            name_database=self.configuration.name_database,
         )
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            await asyncqdrantclient.update_collection(
+                collection_name=self.configuration.name_database,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+            )
+
+    async def delete_collection(self) -> bool:
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            return await asyncqdrantclient.delete_collection(collection_name=self.configuration.name_database)
 
     async def check_document_already_inserted(self, *, hashvalue: str) -> bool:
         """Check whether a document with a certain integer hash value (as produced by Docling) was already inserted.
-        The result is based on whether at least one Point with the hash value is already stored in Qdrant.
+        The result is based on whether the full document point with the hash value is already stored in Qdrant.
 
         Args:
             hashvalue: integer hash value (as produced by Docling). Must be a string to avoid integer overflow.
         """
-        filter_alreadyindexed = Filter(
-            must=[FieldCondition(key="hashvalue", match=MatchValue(value=hashvalue))],
-        )
-        points, _ = await self._asyncqdrantclient.scroll(
-            collection_name=self.configuration.name_database,
-            limit=1,
-            scroll_filter=filter_alreadyindexed,
-            with_payload=False,
-            with_vectors=False,
-        )
-        return bool(points and points[0] and points[0].payload)
+        return bool(await self.check_documents_already_inserted(hashvalues=(hashvalue,)))
+
+    async def check_documents_already_inserted(self, *, hashvalues: Sequence[str]) -> set[str]:
+        """Like `check_document_already_inserted()`, but for many documents in a single call. Returns the hash values
+        of those already inserted."""
+        return set(await self._retrieve_fulldocuments(hashvalues=hashvalues))
+
+    async def _retrieve_fulldocuments(
+        self,
+        *,
+        hashvalues: Sequence[str],
+        keys_payload: Sequence[str] = (),
+    ) -> dict[str, Record]:
+        """Retrieves the full document points of the documents with integer hash values `hashvalues` by their point
+        IDs, with the payload fields `keys_payload`. Returns those stored by hash value."""
+        id_to_hashvalue = {to_id_point(hashvalue): hashvalue for hashvalue in hashvalues}
+        if not id_to_hashvalue:
+            return {}
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            records = await asyncqdrantclient.retrieve(
+                collection_name=self.configuration.name_database,
+                ids=list(id_to_hashvalue),
+                # The hash value tells full document points from points with colliding IDs.
+                with_payload=["hashvalue", *keys_payload],
+                with_vectors=False,
+            )
+        hashvalue_to_record: dict[str, Record] = {}
+        for record in records:
+            hashvalue = id_to_hashvalue[int(record.id)]
+            if record.payload and record.payload.get("hashvalue") == hashvalue:
+                hashvalue_to_record[hashvalue] = record
+        return hashvalue_to_record
 
     async def insert_typeqlthings(
         self,
         *,
         typeqlthings: Iterable[TypeqlThing],
     ) -> None:
+        await self.insert_sentences(sentences=(str(typeqlthing) for typeqlthing in typeqlthings))
+
+    async def insert_sentences(
+        self,
+        *,
+        sentences: Iterable[str],
+    ) -> None:
+        """Inserts the natural-language `sentences` rendered from TypeQL things. `sentences` is consumed on a worker
+        thread, so it may block. The sentences are encoded `encoder_size_batch` at a time on one worker thread, while
+        the batch encoded before is uploaded from another."""
         logger.trace(
             "Inserting TypeQL things into Qdrant collection ({name_database}) ...",
             name_database=self.configuration.name_database,
         )
-        self._asyncqdrantclient.upload_points(
-            batch_size=self.configuration.qdrant_size_batch,
-            collection_name=self.configuration.name_database,
-            points=(
-                PointStruct(
-                    # Must be reduced to six bits because of https://github.com/qdrant/qdrant-client/issues/936/.
-                    id=int.from_bytes(
-                        blake2b(str_typeqlthing.encode(), digest_size=6).digest(),
-                        byteorder="little",
-                        signed=False,
-                    )
-                    & ((1 << 53) - 1),
-                    payload={"text": str_typeqlthing},
-                    vector=self._model_encoder.encode(
-                        str_typeqlthing,
-                        task="retrieval.passage",
-                    ).tolist(),
-                )
-                for typeqlthing in tqdm(typeqlthings)
-                if (str_typeqlthing := str(typeqlthing))
-            ),
+        # Buffer a single batch, so encoding runs at most one batch ahead of uploading.
+        sendstream, receivestream = create_memory_object_stream[Embeddingbatch](max_buffer_size=1)
+        n_sentences = 0
+        time_start = perf_counter()
+        async with create_task_group() as taskgroup:
+            taskgroup.start_soon(
+                to_thread.run_sync,
+                partial(self._encode_sentences, sendstream=sendstream, sentences=sentences),
+            )
+            async with receivestream:
+                async for embeddingbatch in receivestream:
+                    async with self._poolqdrant.operation() as asyncqdrantclient:
+                        await to_thread.run_sync(
+                            partial(
+                                asyncqdrantclient.upload_collection,
+                                batch_size=self.configuration.qdrant_size_batch,
+                                collection_name=self.configuration.name_database,
+                                ids=embeddingbatch.ids,
+                                payload=embeddingbatch.payloads,
+                                vectors=iterate_vectors(
+                                    embeddingbatch.vectors_dense,
+                                    sparsevectors=embeddingbatch.sparsevectors,
+                                ),
+                            ),
+                        )
+                    n_sentences += len(embeddingbatch.ids)
+        await to_thread.run_sync(self._cacheembedding.flush)
+        duration = perf_counter() - time_start
+        logger.info(
+            "Inserted {n_sentences} sentences in {duration:.1f} s ({throughput:.0f} sentences/s).",
+            duration=duration,
+            n_sentences=n_sentences,
+            throughput=n_sentences / duration if duration else float("inf"),
         )
 
+    def _encode_sentences(
+        self,
+        *,
+        sendstream: MemoryObjectSendStream[Embeddingbatch],
+        sentences: Iterable[str],
+    ) -> None:
+        try:
+            for batch in batched(
+                (sentence for sentence in tqdm(sentences) if sentence),
+                self.configuration.encoder_size_batch,
+            ):
+                from_thread.run(
+                    sendstream.send,
+                    Embeddingbatch(
+                        ids=[to_id_point(sentence) for sentence in batch],
+                        payloads=[{"kind": Kindpoint.SENTENCE, "text": sentence} for sentence in batch],
+                        sparsevectors=[to_sparsevector_document(sentence) for sentence in batch],
+                        vectors_dense=self._encode_passages(batch),
+                    ),
+                )
+        finally:
+            from_thread.run_sync(sendstream.close)
+
     async def insert_document(
         self,
         *,
@@ -150,151 +450,380 @@ class ConnectionQdrant:
 
         Returns: integer hash value of the document file.
         """
-        if not doclingdocument.origin:
-            raise ConnectionQdrantDocumentstoreError(name=doclingdocument.name)
-        hashvalue_integer = doclingdocument.origin.binary_hash
-        logger.trace(
-            "Inserting document '{name_file}' (integer hash value: {hashvalue_integer}) and its chunks into Qdrant "
-            "collection ({name_database}) ...",
-            hashvalue_integer=hashvalue_integer,
-            name_file=doclingdocument.origin.filename,
-            name_database=self.configuration.name_database,
+        (hashvalue_integer,) = await self.insert_documents(doclingdocuments=(doclingdocument,))
+        return hashvalue_integer
+
+    async def insert_documents(
+        self,
+        *,
+        doclingdocuments: Iterable[DoclingDocument],
+    ) -> list[Uint64]:
+        """Store Docling documents and their chunks, like `insert_document()`, but encoding the chunks of all documents
+        together and uploading all points in a single batched call.
+
+        Returns: integer hash values of the document files, in order.
+        """
+        doclingdocuments = list(doclingdocuments)
+        hashvalues_integer: list[Uint64] = []
+        for doclingdocument in doclingdocuments:
+            if not doclingdocument.origin:
+                raise ConnectionQdrantDocumentstoreError(name=doclingdocument.name)
+            hashvalues_integer.append(doclingdocument.origin.binary_hash)
+        hashvalues_inserted = await self.check_documents_already_inserted(
+            hashvalues=[str(hashvalue_integer) for hashvalue_integer in hashvalues_integer],
         )
-        if await self.check_document_already_inserted(hashvalue=str(doclingdocument.origin.binary_hash)):
-            logger.debug(
-                "Skipping document (name: '{name_file}', integer hash value: {hashvalue_integer}), as it's already "
-                "stored in the Qdrant collection.",
-                hashvalue_integer=hashvalue_integer,
-                name_file=doclingdocument.origin.filename,
-            )
-        else:
-            logger.debug(
-                "Vectorizing document (name: '{name_file}', integer hash value: {hashvalue_integer}) ...",
+        documentpreparations: list[Documentpreparation] = []
+        for doclingdocument, hashvalue_integer in zip(doclingdocuments, hashvalues_integer, strict=True):
+            assert doclingdocument.origin
+            logger.trace(
+                "Inserting document '{name_file}' (integer hash value: {hashvalue_integer}) and its chunks into Qdrant "
+                "collection ({name_database}) ...",
                 hashvalue_integer=hashvalue_integer,
                 name_file=doclingdocument.origin.filename,
+                name_database=self.configuration.name_database,
             )
-            document = Document(configuration=self.configuration, doclingdocument=doclingdocument)
-            document.summarize()
-            # TODO: Serialize our own Document-objects rather than DoclingDocuments.
-            # TODO: Store documents in TypeDB database instead of on-disk?
-            doclingdocument_origin_dump = doclingdocument.origin.model_dump(
-                include={"binary_hash", "mimetype", "filename"},
-            )
-            # Prepare document chunks.
-            hashvalue_str = str(doclingdocument_origin_dump["binary_hash"])
-            payload_chunks = PayloadChunk(
-                # This integer can be too large to fit in the integer datatype that Qdrant converts it to, so
-                # convert to string. See also https://github.com/qdrant/qdrant-client/issues/936.
-                hashvalue=hashvalue_str,
-                text="",
-            )
-            pointstructs = [
-                PointStruct(
-                    id=int.from_bytes(
-                        blake2b(text.encode(), digest_size=6).digest(),
-                        byteorder="little",
-                        signed=False,
-                    )
-                    & ((1 << 53) - 1),
-                    payload=payload_chunks | {"text": text},
-                    vector=self._model_encoder.encode(
-                        # TODO: Fix overlong chunk handling.
-                        text,
-                        task="retrieval.passage",
-                    ).tolist(),
+            if str(hashvalue_integer) in hashvalues_inserted:
+                logger.debug(
+                    "Skipping document (name: '{name_file}', integer hash value: {hashvalue_integer}), as it's already "
+                    "stored in the Qdrant collection.",
+                    hashvalue_integer=hashvalue_integer,
+                    name_file=doclingdocument.origin.filename,
                 )
-                for chunk in self._chunker.chunk(dl_doc=doclingdocument)
-                if (text := self._chunker.serialize(chunk)[: self._length_chunk_max])
-            ]
-            # Overwrite because this information is duplicated in the payload, and because it can contain a large
-            # integers that Qdrant can't handle.
-            doclingdocument.origin = None
-            # Prepare full document.
-            payload_fulldocument = PayloadFulldocument(
-                doclingdocument=doclingdocument.export_to_dict(),
-                hashvalue=hashvalue_str,
-                language=document.language.name,
-                mediatype=doclingdocument_origin_dump["mimetype"],
-                name_file=doclingdocument_origin_dump["filename"],
-                sectiontitles=list(document.sectiontitle_to_flatsection.keys()),
-                text_full=document.text_full,
-                text_summary=document.summary,
-            )
-            pointstructs.append(
-                PointStruct(
-                    id=int.from_bytes(
-                        blake2b(hashvalue_str.encode(), digest_size=6).digest(),
-                        byteorder="little",
-                        signed=False,
+            else:
+                documentpreparations.append(
+                    await to_thread.run_sync(partial(self._prepare_document, doclingdocument=doclingdocument)),
+                )
+        if documentpreparations:
+            texts = [text for documentpreparation in documentpreparations for text in documentpreparation.texts]
+            vectors = iter(await to_thread.run_sync(partial(self._encode_texts, texts=texts)))
+            pointstructs: list[PointStruct] = []
+            for documentpreparation in documentpreparations:
+                pointstructs.extend(
+                    PointStruct(
+                        id=to_id_point(text),
+                        payload=documentpreparation.payload_chunk | {"text": text},
+                        vector=to_vectors(next(vectors), text=text),
                     )
-                    & ((1 << 53) - 1),
-                    payload=payload_fulldocument,
-                    vector={},
-                ),
-            )
-            self._asyncqdrantclient.upload_points(
-                collection_name=self.configuration.name_database,
-                points=pointstructs,
-            )
-            logger.info(
-                "Stored document '{name_file}' (integer hash value: {hashvalue_integer}) and its chunks in Qdrant.",
-                hashvalue_integer=hashvalue_integer,
-                name_file=doclingdocument_origin_dump["filename"],
-            )
-        return hashvalue_integer
+                    for text in documentpreparation.texts
+                )
+                pointstructs.append(
+                    PointStruct(
+                        id=to_id_point(documentpreparation.payload_fulldocument["hashvalue"]),
+                        payload=documentpreparation.payload_fulldocument,
+                        vector={},
+                    ),
+                )
+            await to_thread.run_sync(self._cacheembedding.flush)
+            async with self._poolqdrant.operation() as asyncqdrantclient:
+                await to_thread.run_sync(
+                    partial(
+                        asyncqdrantclient.upload_points,
+                        batch_size=self.configuration.qdrant_size_batch,
+                        collection_name=self.configuration.name_database,
+                        points=pointstructs,
+                    ),
+                )
+            for documentpreparation in documentpreparations:
+                logger.info(
+                    "Stored document '{name_file}' (integer hash value: {hashvalue_integer}) and its chunks in Qdrant.",
+                    hashvalue_integer=documentpreparation.payload_fulldocument["hashvalue"],
+                    name_file=documentpreparation.payload_fulldocument["name_file"],
+                )
+        return hashvalues_integer
+
+    def _prepare_document(self, *, doclingdocument: DoclingDocument) -> Documentpreparation:
+        """Serializes the chunks of `doclingdocument` and prepares its full document payload, without encoding."""
+        assert doclingdocument.origin
+        logger.debug(
+            "Vectorizing document (name: '{name_file}', integer hash value: {hashvalue_integer}) ...",
+            hashvalue_integer=doclingdocument.origin.binary_hash,
+            name_file=doclingdocument.origin.filename,
+        )
+        # Only the summary, section titles and language are used, so the document is neither tokenized nor are its
+        # tables converted.
+        document = Document(configuration=self.configuration, doclingdocument=doclingdocument)
+        # TODO: Serialize our own Document-objects rather than DoclingDocuments.
+        # TODO: Store documents in TypeDB database instead of on-disk?
+        doclingdocument_origin_dump = doclingdocument.origin.model_dump(
+            include={"binary_hash", "mimetype", "filename"},
+        )
+        # Prepare document chunks.
+        hashvalue_str = str(doclingdocument_origin_dump["binary_hash"])
+        payload_chunk = PayloadChunk(
+            # This integer can be too large to fit in the integer datatype that Qdrant converts it to, so
+            # convert to string. See also https://github.com/qdrant/qdrant-client/issues/936.
+            hashvalue=hashvalue_str,
+            kind=Kindpoint.CHUNK,
+            text="",
+        )
+        texts = [
+            # TODO: Fix overlong chunk handling.
+            text
+            for chunk in self._chunker.chunk(dl_doc=doclingdocument)
+            if (text := self._chunker.serialize(chunk)[: self._length_chunk_max])
+        ]
+        # Overwrite because this information is duplicated in the payload, and because it can contain a large
+        # integers that Qdrant can't handle.
+        doclingdocument.origin = None
+        # Store the full document before any point refers to it.
+        self._storedocument.put(doclingdocument, hashvalue=hashvalue_str)
+        payload_fulldocument = PayloadFulldocument(
+            hashvalue=hashvalue_str,
+            kind=Kindpoint.FULLDOCUMENT,
+            language=document.language.name,
+            mediatype=doclingdocument_origin_dump["mimetype"],
+            name_file=doclingdocument_origin_dump["filename"],
+            sectiontitles=list(document.sectiontitle_to_flatsection.keys()),
+            text_summary=document.summary,
+        )
+        return Documentpreparation(payload_chunk=payload_chunk, payload_fulldocument=payload_fulldocument, texts=texts)
+
+    def _encode_texts(self, *, texts: Sequence[str]) -> NDArray[float32]:
+        """Encodes `texts` `encoder_size_batch` at a time, grouping texts of similar length into the same batch so as to
+        pad them little. Returns their vectors in the order of `texts`."""
+        vectors = empty((len(texts), self._model_encoder.get_sentence_embedding_dimension() or 0), dtype=float32)
+        indices_sorted = sorted(range(len(texts)), key=lambda index: len(texts[index]), reverse=True)
+        for indices in batched(indices_sorted, self.configuration.encoder_size_batch):
+            vectors[list(indices)] = self._encode_passages([texts[index] for index in indices])
+        return vectors
+
+    def _encode_passages(self, texts: Sequence[str]) -> NDArray[float32]:
+        """Encodes `texts` as passages to retrieve, in a single call to the encoder model for those not cached."""
+        return self._cacheembedding.encode(
+            texts,
+            encode=lambda texts_miss: self._model_encoder.encode(
+                texts_miss,
+                batch_size=len(texts_miss),
+                convert_to_numpy=True,
+                task=TASK_PASSAGE,
+            ),
+            task=TASK_PASSAGE,
+        )
 
     async def fetch_full_document(self, *, hashvalue_document: Uint64) -> DoclingDocument | None:
         """
         Load a Docling document or convert a raw document file (insofar supported by Docling) to a Docling document.
         """
-        logger.debug("Fetching full document (integer hash value: {}) ...", hashvalue_document)
-        filter_fulldocument = Filter(
-            must=[FieldCondition(key="hashvalue", match=MatchValue(value=str(hashvalue_document)))],
-            must_not=[IsEmptyCondition(is_empty=PayloadField(key="text_full"))],
+        (doclingdocument,) = await self.fetch_full_documents(hashvalues_document=(hashvalue_document,))
+        return doclingdocument
+
+    async def fetch_full_documents(self, *, hashvalues_document: Sequence[Uint64]) -> list[DoclingDocument | None]:
+        """Like `fetch_full_document()`, but for many documents in a single call. Returns the documents in order, or
+        `None` for those not stored."""
+        logger.debug("Fetching {n} full documents ...", n=len(hashvalues_document))
+        hashvalue_to_record = await self._retrieve_fulldocuments(
+            hashvalues=[str(hashvalue_document) for hashvalue_document in hashvalues_document],
+            keys_payload=("mediatype", "name_file"),
+        )
+        hashvalues_unstored = await to_thread.run_sync(
+            lambda: [hashvalue for hashvalue in hashvalue_to_record if not self._storedocument.has(hashvalue)],
         )
-        points, offset = await self._asyncqdrantclient.scroll(
-            collection_name=self.configuration.name_database,
-            limit=1,
-            scroll_filter=filter_fulldocument,
-            with_payload=True,
-            with_vectors=True,
+        if hashvalues_unstored:
+            await self._move_fulldocuments_to_storedocument(hashvalues=hashvalues_unstored)
+        return await to_thread.run_sync(
+            partial(self._load_fulldocuments, hashvalue_to_record=hashvalue_to_record, hashvalues=hashvalues_document),
         )
-        assert offset is None
-        if points and points[0] and points[0].payload and (doclingdocument_str := points[0].payload["doclingdocument"]):
-            doclingdocument = DoclingDocument.model_validate(doclingdocument_str)
-            assert not doclingdocument.origin
-            doclingdocument.origin = DocumentOrigin(
-                mimetype=points[0].payload["mediatype"],
-                binary_hash=int(points[0].payload["hashvalue"]),
-                filename=points[0].payload["name_file"],
+
+    async def _move_fulldocuments_to_storedocument(self, *, hashvalues: Sequence[str]) -> None:
+        """Moves the documents of full document points inserted before the document store existed, which kept them in
+        their `doclingdocument` payload, into the document store."""
+        hashvalue_to_record = await self._retrieve_fulldocuments(
+            hashvalues=hashvalues,
+            keys_payload=("doclingdocument",),
+        )
+        hashvalues_moved = await to_thread.run_sync(
+            partial(self._store_fulldocuments, hashvalue_to_record=hashvalue_to_record),
+        )
+        if hashvalues_moved:
+            logger.info(
+                "Moved {n} documents from their full document points in Qdrant into the document store.",
+                n=len(hashvalues_moved),
             )
-            return doclingdocument
-        return None
+            async with self._poolqdrant.operation() as asyncqdrantclient:
+                await asyncqdrantclient.delete_payload(
+                    collection_name=self.configuration.name_database,
+                    keys=["doclingdocument"],
+                    points=[to_id_point(hashvalue) for hashvalue in hashvalues_moved],
+                )
+
+    def _store_fulldocuments(self, *, hashvalue_to_record: dict[str, Record]) -> list[str]:
+        """Stores the documents in the `doclingdocument` payloads of the full document points `hashvalue_to_record`.
+        Returns the hash values of those stored."""
+        hashvalues_stored = []
+        for hashvalue, record in hashvalue_to_record.items():
+            if record.payload and (doclingdocument_dict := record.payload.get("doclingdocument")):
+                doclingdocument = DoclingDocument.model_validate(doclingdocument_dict)
+                doclingdocument.origin = None
+                self._storedocument.put(doclingdocument, hashvalue=hashvalue)
+                hashvalues_stored.append(hashvalue)
+        return hashvalues_stored
+
+    def _load_fulldocuments(
+        self,
+        *,
+        hashvalue_to_record: dict[str, Record],
+        hashvalues: Sequence[Uint64],
+    ) -> list[DoclingDocument | None]:
+        """Loads the documents of the full document points `hashvalue_to_record` from the document store."""
+        doclingdocuments: list[DoclingDocument | None] = []
+        for hashvalue in hashvalues:
+            record = hashvalue_to_record.get(str(hashvalue))
+            if record and record.payload and (doclingdocument := self._storedocument.get(str(hashvalue))):
+                assert not doclingdocument.origin
+                doclingdocument.origin = DocumentOrigin(
+                    mimetype=record.payload["mediatype"],
+                    binary_hash=int(record.payload["hashvalue"]),
+                    filename=record.payload["name_file"],
+                )
+                doclingdocuments.append(doclingdocument)
+            else:
+                doclingdocuments.append(None)
+        return doclingdocuments
 
     async def fetch_query_vectors(
         self,
         *,
+        keys_payload: Sequence[str] = KEYS_PAYLOAD_RETRIEVAL,
         limit: int,
         query: str,
     ) -> list[ScoredPoint]:
-        logger.debug("Fetching retrieval vectors for query ...")
-        queryvector = self._model_encoder.encode(
-            query,
-            prompt="retrieval.query",
-            task="retrieval.query",
-        ).tolist()
-        filter_knowledgeplatform = Filter(
-            should=[
-                IsEmptyCondition(is_empty=PayloadField(key="text")),
-                IsEmptyCondition(is_empty=PayloadField(key="text_full")),
-            ],
-            must_not=[
-                IsEmptyCondition(is_empty=PayloadField(key="hashvalue")),
-            ],
+        """Fetches the `limit` chunks most relevant to `query`, by fusing a dense search by the encoder model with a
+        sparse search by BM25, which matches exact tokens like identifiers and names, as configured by the collection
+        profile. The chunks carry only the payload fields `keys_payload`. `hydrate()` fetches their full documents."""
+        (scoredpoints,) = await self.fetch_query_vectors_batch(keys_payload=keys_payload, limit=limit, queries=(query,))
+        return scoredpoints
+
+    async def fetch_query_documents(
+        self,
+        *,
+        keys_payload: Sequence[str] = KEYS_PAYLOAD_RETRIEVAL,
+        limit: int,
+        query: str,
+        size_group: int = 1,
+    ) -> list[PointGroup]:
+        """Like `fetch_query_vectors()`, but fetches the `limit` documents most relevant to `query` instead, each with
+        its `size_group` most relevant chunks, grouped by the document's hash value."""
+        logger.debug("Fetching retrieval documents for query ...")
+        query_normalized = normalize_query(query)
+        (queryvector,) = await to_thread.run_sync(partial(self._encode_queries, queries=(query_normalized,)))
+        queryrequest = self._to_queryrequest(
+            keys_payload=keys_payload,
+            limit=limit,
+            query=query_normalized,
+            queryvector=queryvector.tolist(),
+        )
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            groupsresult = await asyncqdrantclient.query_points_groups(
+                collection_name=self.configuration.name_database,
+                group_by="hashvalue",
+                group_size=size_group,
+                limit=limit,
+                prefetch=queryrequest.prefetch,
+                query=queryrequest.query,
+                query_filter=queryrequest.filter,
+                search_params=queryrequest.params,
+                with_payload=list(keys_payload),
+            )
+        return groupsresult.groups
+
+    async def hydrate(self, *, scoredpoints: Iterable[ScoredPoint]) -> dict[str, DoclingDocument]:
+        """Fetches the full documents of the chunks `scoredpoints`, each once. Returns them by hash value."""
+        hashvalues = list(
+            dict.fromkeys(
+                str(scoredpoint.payload["hashvalue"])
+                for scoredpoint in scoredpoints
+                if scoredpoint.payload and "hashvalue" in scoredpoint.payload
+            ),
+        )
+        doclingdocuments = await self.fetch_full_documents(
+            hashvalues_document=[int(hashvalue) for hashvalue in hashvalues],
         )
-        return await self._asyncqdrantclient.search(
-            collection_name=self.configuration.name_database,
+        return {
+            hashvalue: doclingdocument
+            for hashvalue, doclingdocument in zip(hashvalues, doclingdocuments, strict=True)
+            if doclingdocument
+        }
+
+    async def fetch_query_vectors_batch(
+        self,
+        *,
+        keys_payload: Sequence[str] = KEYS_PAYLOAD_RETRIEVAL,
+        limit: int,
+        queries: Sequence[str],
+    ) -> list[list[ScoredPoint]]:
+        """Like `fetch_query_vectors()`, but for many queries at once. The queries not encoded before are encoded in a
+        single call to the encoder model, and all are searched for in a single call to Qdrant. Returns the results of
+        each query, in order."""
+        logger.debug("Fetching retrieval vectors for {n} queries ...", n=len(queries))
+        if not queries:
+            return []
+        queries_normalized = [normalize_query(query) for query in queries]
+        queryvectors = await to_thread.run_sync(partial(self._encode_queries, queries=queries_normalized))
+        async with self._poolqdrant.operation() as asyncqdrantclient:
+            queryresponses = await asyncqdrantclient.query_batch_points(
+                collection_name=self.configuration.name_database,
+                requests=[
+                    self._to_queryrequest(
+                        keys_payload=keys_payload,
+                        limit=limit,
+                        query=query,
+                        queryvector=queryvector.tolist(),
+                    )
+                    for query, queryvector in zip(queries_normalized, queryvectors, strict=True)
+                ],
+            )
+        return [queryresponse.points for queryresponse in queryresponses]
+
+    def _encode_queries(self, *, queries: Sequence[str]) -> NDArray[float32]:
+        """Encodes `queries` in a single call to the encoder model for those not cached."""
+        return self._cacheembedding.encode(
+            queries,
+            encode=lambda queries_miss: self._model_encoder.encode(
+                queries_miss,
+                batch_size=len(queries_miss),
+                convert_to_numpy=True,
+                prompt=TASK_QUERY,
+                task=TASK_QUERY,
+            ),
+            task=TASK_QUERY,
+        )
+
+    def _to_queryrequest(
+        self,
+        *,
+        keys_payload: Sequence[str],
+        limit: int,
+        query: str,
+        queryvector: list[float],
+    ) -> QueryRequest:
+        profilecollection = self.configuration.qdrant_profile
+        # Full document points have no vectors to match, so only chunks can be retrieved.
+        filter_knowledgeplatform = Filter(must=[FieldCondition(key="kind", match=MatchValue(value=Kindpoint.CHUNK))])
+        if profilecollection.fusion is Fusion.NONE:
+            return QueryRequest(
+                filter=filter_knowledgeplatform,
+                limit=limit,
+                params=to_searchparams(profilecollection),
+                query=queryvector,
+                with_payload=list(keys_payload),
+            )
+        limit_prefetch = limit * profilecollection.factor_prefetch
+        return QueryRequest(
             limit=limit,
-            query_filter=filter_knowledgeplatform,
-            query_vector=queryvector,
+            prefetch=[
+                Prefetch(
+                    filter=filter_knowledgeplatform,
+                    limit=limit_prefetch,
+                    params=to_searchparams(profilecollection),
+                    query=queryvector,
+                ),
+                Prefetch(
+                    filter=filter_knowledgeplatform,
+                    limit=limit_prefetch,
+                    query=to_sparsevector_query(query),
+                    using=NAME_VECTOR_SPARSE,
+                ),
+            ],
+            query=FusionQuery(fusion=FusionQdrant(profilecollection.fusion.value)),
+            with_payload=list(keys_payload),
         )
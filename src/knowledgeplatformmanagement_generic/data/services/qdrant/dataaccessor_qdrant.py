@@ -1,4 +1,5 @@
-from contextvars import ContextVar
+from collections.abc import Callable
+from functools import partial
 from types import TracebackType
 from typing import Final
 
@@ -7,20 +8,35 @@ from qdrant_client import AsyncQdrantClient
 from sentence_transformers import SentenceTransformer
 
 from knowledgeplatformmanagement_generic.data.services import Dataaccessor
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
 from knowledgeplatformmanagement_generic.data.services.qdrant.connection_qdrant import ConnectionQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.store_document import Storedocument
 from knowledgeplatformmanagement_generic.settings import Configuration
 
-_asyncqdrantclient: ContextVar[AsyncQdrantClient] = ContextVar("asyncqdrantclient")
-
 
 class DataaccessorQdrant(Dataaccessor[ConnectionQdrant]):
     def __init__(
         self,
         *,
         configuration: Configuration,
+        factory_asyncqdrantclient: Callable[[], AsyncQdrantClient] | None = None,
         model_encoder: SentenceTransformer,
     ) -> None:
         self.configuration: Final[Configuration] = configuration
+        self.poolqdrant: Final[PoolQdrant] = PoolQdrant(
+            factory_asyncqdrantclient=factory_asyncqdrantclient
+            or partial(
+                AsyncQdrantClient,
+                cloud_inference=False,
+                prefer_grpc=True,
+                timeout=self.configuration.timeout_qdrant,
+                url=str(self.configuration.url_qdrant),
+            ),
+            interval_health=self.configuration.qdrant_interval_health,
+            n_operations_max=self.configuration.qdrant_n_operations_max,
+            timeout_health=self.configuration.qdrant_timeout_health,
+        )
         self._chunker = HybridChunker(
             max_tokens=model_encoder.get_max_seq_length(),
             merge_peers=True,
@@ -29,24 +45,33 @@ class DataaccessorQdrant(Dataaccessor[ConnectionQdrant]):
         self._model_encoder = model_encoder
         self._length_chunk_max = self._model_encoder.get_max_seq_length()
         assert self._length_chunk_max
+        dimension = self._model_encoder.get_sentence_embedding_dimension()
+        assert dimension
+        self._cacheembedding = Cacheembedding(
+            dimension=dimension,
+            n_entries_max=self.configuration.encoder_cache_n_entries_max,
+            name_model=self.configuration.name_model_encoder,
+            # Name the directory like the Hugging Face cache does.
+            path_dir=self.configuration.paths._path_dir_embeddings
+            / self.configuration.name_model_encoder.replace("/", "--"),
+        )
+        self._storedocument = Storedocument(
+            n_documents_cached=self.configuration.documentstore_n_documents_cached,
+            path_dir=self.configuration.paths._path_dir_documents,
+        )
 
     async def __aenter__(self) -> ConnectionQdrant:
         # Duplication required due to Mypy defect.
         assert self._length_chunk_max
-        _asyncqdrantclient.set(
-            AsyncQdrantClient(
-                cloud_inference=False,
-                prefer_grpc=True,
-                timeout=self.configuration.timeout_qdrant,
-                url=str(self.configuration.url_qdrant),
-            ),
-        )
+        await self.poolqdrant.check_health_due()
         return ConnectionQdrant(
-            asyncqdrantclient=_asyncqdrantclient.get(),
+            cacheembedding=self._cacheembedding,
             configuration=self.configuration,
             chunker=self._chunker,
             length_chunk_max=self._length_chunk_max,
             model_encoder=self._model_encoder,
+            poolqdrant=self.poolqdrant,
+            storedocument=self._storedocument,
         )
 
     async def __aexit__(
@@ -55,6 +80,5 @@ class DataaccessorQdrant(Dataaccessor[ConnectionQdrant]):
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        asyncqdrantclient = _asyncqdrantclient.get()
-        await asyncqdrantclient.close()
-        del asyncqdrantclient
+        # The pooled client outlives the connection, to be reused by the next one.
+        pass
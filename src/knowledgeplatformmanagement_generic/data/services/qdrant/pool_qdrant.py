@@ -0,0 +1,114 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Final
+
+from anyio import CancelScope, Lock, Semaphore, current_time, fail_after
+from loguru import logger
+from qdrant_client import AsyncQdrantClient
+
+
+class PoolQdrant:
+    """Keeps a single Qdrant client, and so its gRPC channel, alive across connections, and lets at most
+    `n_operations_max` operations through it at a time.
+
+    The client is built lazily, and replaced after it fails a health check. A replaced client is only closed once the
+    operations still running through it finish. `check_health_due()` runs a health check at most every
+    `interval_health` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        factory_asyncqdrantclient: Callable[[], AsyncQdrantClient],
+        interval_health: float,
+        n_operations_max: int,
+        timeout_health: float,
+    ) -> None:
+        self._asyncqdrantclient: AsyncQdrantClient | None = None
+        self._factory_asyncqdrantclient: Final[Callable[[], AsyncQdrantClient]] = factory_asyncqdrantclient
+        # By client ID, the replaced clients that operations still run through.
+        self._id_to_asyncqdrantclient_replaced: Final[dict[int, AsyncQdrantClient]] = {}
+        # By client ID, the number of operations running through it.
+        self._id_to_n_operations: Final[dict[int, int]] = {}
+        self._interval_health: Final[float] = interval_health
+        self._lock_health: Final[Lock] = Lock()
+        self._semaphore: Final[Semaphore] = Semaphore(n_operations_max)
+        self._time_healthy: float | None = None
+        self._timeout_health: Final[float] = timeout_health
+        self.n_operations_max: Final[int] = n_operations_max
+
+    async def close(self) -> None:
+        await self.invalidate()
+
+    def get_asyncqdrantclient(self) -> AsyncQdrantClient:
+        if self._asyncqdrantclient is None:
+            logger.debug("Building a Qdrant client ...")
+            self._asyncqdrantclient = self._factory_asyncqdrantclient()
+        return self._asyncqdrantclient
+
+    async def invalidate(self) -> None:
+        """Lets the next operation build a new client. The current one is closed as soon as no operation runs through
+        it anymore."""
+        asyncqdrantclient, self._asyncqdrantclient = self._asyncqdrantclient, None
+        self._time_healthy = None
+        if asyncqdrantclient is None:
+            return
+        if self._id_to_n_operations.get(id(asyncqdrantclient)):
+            self._id_to_asyncqdrantclient_replaced[id(asyncqdrantclient)] = asyncqdrantclient
+        else:
+            await asyncqdrantclient.close()
+
+    async def check_health(self) -> bool:
+        """Checks whether Qdrant answers through the client within `timeout_health` seconds. If not, invalidates the
+        client, so that the next operation builds a new one."""
+        async with self._lock_health:
+            return await self._check_health()
+
+    async def check_health_due(self) -> None:
+        """Runs a health check, unless the last one succeeded less than `interval_health` seconds ago. Concurrent
+        callers wait for a single health check."""
+        async with self._lock_health:
+            if self._time_healthy is None or current_time() - self._time_healthy >= self._interval_health:
+                await self._check_health()
+
+    async def _check_health(self) -> bool:
+        async with self._track() as asyncqdrantclient:
+            try:
+                with fail_after(self._timeout_health):
+                    await asyncqdrantclient.get_collections()
+            # Whatever the transport raises, the client is unhealthy.
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                logger.warning(
+                    "The Qdrant client failed its health check ({exception!r}). Replacing it on the next operation "
+                    "...",
+                    exception=exception,
+                )
+                if asyncqdrantclient is self._asyncqdrantclient:
+                    await self.invalidate()
+                return False
+        self._time_healthy = current_time()
+        return True
+
+    @asynccontextmanager
+    async def _track(self) -> AsyncIterator[AsyncQdrantClient]:
+        """Yields the client, and counts the yielded client as in use meanwhile, so it isn't closed under it."""
+        asyncqdrantclient = self.get_asyncqdrantclient()
+        id_asyncqdrantclient = id(asyncqdrantclient)
+        self._id_to_n_operations[id_asyncqdrantclient] = self._id_to_n_operations.get(id_asyncqdrantclient, 0) + 1
+        try:
+            yield asyncqdrantclient
+        finally:
+            self._id_to_n_operations[id_asyncqdrantclient] -= 1
+            if not self._id_to_n_operations[id_asyncqdrantclient]:
+                del self._id_to_n_operations[id_asyncqdrantclient]
+                if id_asyncqdrantclient in self._id_to_asyncqdrantclient_replaced:
+                    del self._id_to_asyncqdrantclient_replaced[id_asyncqdrantclient]
+                    with CancelScope(shield=True):
+                        await asyncqdrantclient.close()
+
+    @asynccontextmanager
+    async def operation(self) -> AsyncIterator[AsyncQdrantClient]:
+        """Yields the client to run a single operation through, once fewer than `n_operations_max` are in flight."""
+        async with self._semaphore, self._track() as asyncqdrantclient:
+            yield asyncqdrantclient
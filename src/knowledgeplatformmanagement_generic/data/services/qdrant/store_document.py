@@ -0,0 +1,75 @@
+import gzip
+import json
+from collections import OrderedDict
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Final
+
+from docling.datamodel.document import DoclingDocument  # type: ignore[attr-defined]
+from loguru import logger
+
+
+class Storedocument:
+    """An on-disk, content-addressed store of full Docling documents, keyed by their integer hash value (as produced by
+    Docling).
+
+    Each document is stored as a gzip-compressed JSON file, sharded over subdirectories by the last two digits of its
+    hash value. Up to `n_documents_cached` parsed documents are kept in memory, beyond which the least recently used are
+    dropped. Safe to use from multiple threads.
+    """
+
+    def __init__(self, *, n_documents_cached: int, path_dir: Path) -> None:
+        self.n_documents_cached: Final[int] = n_documents_cached
+        self.path_dir: Final[Path] = path_dir
+        self._hashvalue_to_doclingdocument: OrderedDict[str, DoclingDocument] = OrderedDict()
+        self._lock = Lock()
+
+    def _get_path_file(self, hashvalue: str) -> Path:
+        return self.path_dir / hashvalue[-2:] / f"{hashvalue}.json.gz"
+
+    def put(self, doclingdocument: DoclingDocument, *, hashvalue: str) -> None:
+        """Stores `doclingdocument` under `hashvalue`, unless a document is stored under it already. Since the store is
+        content-addressed, that document is the same."""
+        path_file = self._get_path_file(hashvalue)
+        if path_file.exists():
+            return
+        path_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Write to a uniquely named partial file first, so that neither a crash nor a concurrent put of the same
+        # document ever leaves a truncated document behind.
+        with NamedTemporaryFile(delete=False, dir=path_file.parent, suffix=".partial") as file_partial:
+            with gzip.open(file_partial, mode="wt", encoding="utf-8") as file:
+                json.dump(doclingdocument.export_to_dict(), file)
+        Path(file_partial.name).replace(path_file)
+
+    def has(self, hashvalue: str) -> bool:
+        """Returns whether a document is stored under `hashvalue`."""
+        with self._lock:
+            if hashvalue in self._hashvalue_to_doclingdocument:
+                return True
+        return self._get_path_file(hashvalue).exists()
+
+    def get(self, hashvalue: str) -> DoclingDocument | None:
+        """Returns a copy of the document stored under `hashvalue`, or `None` if none is. Callers may modify the copy
+        freely."""
+        with self._lock:
+            doclingdocument = self._hashvalue_to_doclingdocument.get(hashvalue)
+            if doclingdocument is not None:
+                self._hashvalue_to_doclingdocument.move_to_end(hashvalue)
+        if doclingdocument is None:
+            try:
+                with gzip.open(self._get_path_file(hashvalue), mode="rb") as file:
+                    doclingdocument = DoclingDocument.model_validate_json(file.read())
+            except FileNotFoundError:
+                logger.warning(
+                    "Document (integer hash value: {hashvalue}) isn't in the document store in '{path_dir!s}'.",
+                    hashvalue=hashvalue,
+                    path_dir=self.path_dir,
+                )
+                return None
+            if self.n_documents_cached:
+                with self._lock:
+                    self._hashvalue_to_doclingdocument[hashvalue] = doclingdocument
+                    while len(self._hashvalue_to_doclingdocument) > self.n_documents_cached:
+                        self._hashvalue_to_doclingdocument.popitem(last=False)
+        return doclingdocument.model_copy(deep=True)
@@ -0,0 +1,77 @@
+import gzip
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from loguru import logger
+
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing, TypeqlThingRelation
+
+SEPARATOR_QUERY: Final[str] = "\n#\x1e\n"
+"""Separates the queries in a bundle file. It's a TypeQL comment, so that a bundle file is a valid TypeQL script."""
+SIZE_READ: Final[int] = 1 << 20
+
+
+class Bundle(NamedTuple):
+    """A TypeQL bundle: gzip-compressed TypeQL scripts of insert queries, one for each TypeQL thing, in the order of
+    the things. Entities go in one file, and relations in another, so that the entities can be loaded before the
+    relations that depend on them."""
+
+    path_file_entities: Path
+    path_file_relations: Path
+
+    @classmethod
+    def in_dir(cls, path_dir: Path) -> "Bundle":
+        return cls(
+            path_file_entities=path_dir / "entities.tql.gz",
+            path_file_relations=path_dir / "relations.tql.gz",
+        )
+
+
+class BundleQuerySeparatorError(ValueError):
+    def __init__(self, *, query: str) -> None:
+        super().__init__(f"TypeQL query {query!r} contains the bundle query separator, so can't be bundled.")
+
+
+def read_queries(path_file: Path) -> Iterator[str]:
+    """Lazily reads the queries from the bundle file in `path_file`."""
+    remainder = ""
+    with gzip.open(path_file, mode="rt", encoding="utf-8", newline="") as file:
+        # pylint: disable-next=while-used
+        while chunk := file.read(SIZE_READ):
+            *queries, remainder = (remainder + chunk).split(SEPARATOR_QUERY)
+            yield from queries
+    if remainder.strip():
+        yield remainder
+
+
+def write_bundle(*, bundle: Bundle, typeqlthings: Iterable[TypeqlThing]) -> None:
+    """Writes `typeqlthings` to `bundle`, replacing it only once all have been written."""
+    bundle.path_file_entities.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path_file_entities_partial = bundle.path_file_entities.with_suffix(".partial")
+    path_file_relations_partial = bundle.path_file_relations.with_suffix(".partial")
+    n_entities = n_relations = 0
+    with (
+        gzip.open(path_file_entities_partial, mode="wt", encoding="utf-8", newline="") as file_entities,
+        gzip.open(path_file_relations_partial, mode="wt", encoding="utf-8", newline="") as file_relations,
+    ):
+        for typeqlthing in typeqlthings:
+            query = typeqlthing.to_typeql()
+            if SEPARATOR_QUERY in query:
+                raise BundleQuerySeparatorError(query=query)
+            if isinstance(typeqlthing, TypeqlThingRelation):
+                file_relations.write(query + SEPARATOR_QUERY)
+                n_relations += 1
+            else:
+                file_entities.write(query + SEPARATOR_QUERY)
+                n_entities += 1
+    path_file_entities_partial.replace(bundle.path_file_entities)
+    path_file_relations_partial.replace(bundle.path_file_relations)
+    logger.info(
+        "Wrote {n_entities} entities to '{path_file_entities!s}' and {n_relations} relations to "
+        "'{path_file_relations!s}'.",
+        n_entities=n_entities,
+        n_relations=n_relations,
+        path_file_entities=bundle.path_file_entities,
+        path_file_relations=bundle.path_file_relations,
+    )
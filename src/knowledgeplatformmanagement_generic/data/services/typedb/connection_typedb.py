@@ -1,42 +1,148 @@
-from collections.abc import AsyncGenerator, Iterable
-from typing import Any, Final
+from collections.abc import AsyncGenerator, Callable, Container, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from hashlib import blake2b
+from itertools import batched, chain, islice
+from queue import SimpleQueue
+from time import perf_counter
+from typing import Any, Final, NamedTuple
 
-from anyio import Path
+from anyio import CancelScope, Path
 from loguru import logger
-from typedb.driver import SessionType, TransactionType, TypeDBDriver
+from typedb.driver import SessionType, TransactionType, TypeDBSession, TypeDBTransaction
 
-from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing
+from knowledgeplatformmanagement_generic.data.services.typedb.bundle_typedb import Bundle, read_queries
+from knowledgeplatformmanagement_generic.data.services.typedb.pool_typedb import PoolTypedb
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import (
+    TypeqlBatch,
+    TypeqlThing,
+    TypeqlThingRelation,
+    batch_typeqlthings,
+)
 from knowledgeplatformmanagement_generic.settings import Configuration
 
 
+type Oncommitted = Callable[[tuple[int, ...]], None]
+"""Called from a worker thread with the positions of the things in each committed write transaction."""
+
+
+class Commitchunk(NamedTuple):
+    """TypeQL batches to insert in a single write transaction, which is committed as a whole."""
+
+    is_relation: bool
+    n_things: int
+    typeqlbatches: tuple[TypeqlBatch, ...]
+
+
+def _to_commitchunk(typeqlbatches: list[TypeqlBatch], *, is_relation: bool) -> Commitchunk:
+    return Commitchunk(
+        is_relation=is_relation,
+        n_things=sum(len(typeqlbatch.typeqlthings) for typeqlbatch in typeqlbatches),
+        typeqlbatches=tuple(typeqlbatches),
+    )
+
+
+def chunk_typeqlbatches(typeqlbatches: Iterable[TypeqlBatch], *, size_commit: int) -> Iterator[Commitchunk]:
+    """Chunks `typeqlbatches` to commit every `size_commit` queries. A chunk never mixes entities and relations, so that
+    relations can wait for the entities they depend on to be committed."""
+    typeqlbatches_pending: list[TypeqlBatch] = []
+    is_relation_pending = False
+    for typeqlbatch in typeqlbatches:
+        is_relation = isinstance(typeqlbatch.typeqlthings[0], TypeqlThingRelation)
+        if typeqlbatches_pending and (
+            is_relation != is_relation_pending or len(typeqlbatches_pending) >= size_commit
+        ):
+            yield _to_commitchunk(typeqlbatches_pending, is_relation=is_relation_pending)
+            typeqlbatches_pending = []
+        typeqlbatches_pending.append(typeqlbatch)
+        is_relation_pending = is_relation
+    if typeqlbatches_pending:
+        yield _to_commitchunk(typeqlbatches_pending, is_relation=is_relation_pending)
+
+
+def chunk_queries(queries: Iterable[str], *, is_relation: bool, size_commit: int) -> Iterator[Commitchunk]:
+    """Chunks the queries of single things, as from a bundle, to commit every `size_commit` queries."""
+    for chunk in batched(queries, size_commit):
+        yield Commitchunk(
+            is_relation=is_relation,
+            n_things=len(chunk),
+            typeqlbatches=tuple(TypeqlBatch(query=query, typeqlthings=(), is_matched=False) for query in chunk),
+        )
+
+
+def _drain(futures: set[Future[int]], *, n_max_pending: int) -> int:
+    """Waits until at most `n_max_pending` of `futures` are pending, and returns the sum of the results of the others,
+    re-raising their exceptions, if any."""
+    n = 0
+    while len(futures) > n_max_pending:
+        futures_done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in futures_done:
+            futures.remove(future)
+            n += future.result()
+    return n
+
+
 class ConnectionTypedb:
-    def __init__(self, *, configuration: Configuration, typedbdriver: TypeDBDriver) -> None:
-        self._typedbdriver: Final[TypeDBDriver] = typedbdriver
+    def __init__(self, *, configuration: Configuration, pooltypedb: PoolTypedb) -> None:
+        self._pooltypedb: Final[PoolTypedb] = pooltypedb
         self.configuration: Final[Configuration] = configuration
 
-    def create_database(self) -> None:
-        if self._typedbdriver is not None:
-            self._typedbdriver.databases.create(self.configuration.name_database)
-
-    async def create_schema(self, *, path_file_schema: Path) -> None:
-        assert self._typedbdriver is not None
-        with (
-            self._typedbdriver.session(
-                database_name=self.configuration.name_database,
-                session_type=SessionType.SCHEMA,
-            ) as session,
-            session.transaction(TransactionType.WRITE) as transaction_write,
-        ):
-            async with await path_file_schema.open(
-                encoding="utf-8",
-            ) as file:
-                query = await file.read()
-                transaction_write.query.define(query)
-                transaction_write.commit()
+    async def create_database(self) -> bool:
+        """Creates the database, unless it exists already. Returns whether it was created."""
+
+        def create() -> bool:
+            databases = self._pooltypedb.get_typedbdriver().databases
+            if databases.contains(self.configuration.name_database):
+                return False
+            databases.create(self.configuration.name_database)
+            return True
+
+        is_created = await self._pooltypedb.run_sync(create)
+        if is_created:
+            # A fingerprint left behind by a database deleted out of band is stale.
+            await self._get_path_file_fingerprint_schema().unlink(missing_ok=True)
+        return is_created
+
+    async def create_schema(self, *, path_file_schema: Path) -> bool:
+        """Defines the schema in `path_file_schema`, unless it's the schema last defined in the database, as recorded
+        by its fingerprint. Returns whether it was defined."""
+        async with await path_file_schema.open(
+            encoding="utf-8",
+        ) as file:
+            query = await file.read()
+        fingerprint = blake2b(query.encode()).hexdigest()
+        path_file_fingerprint = self._get_path_file_fingerprint_schema()
+        if await path_file_fingerprint.exists() and await path_file_fingerprint.read_text() == fingerprint:
+            logger.info(
+                "Skipping defining the schema, since the TypeDB database ({name_database}) has it already.",
+                name_database=self.configuration.name_database,
+            )
+            return False
+        async with self._pooltypedb.session(
+            database_name=self.configuration.name_database,
+            session_type=SessionType.SCHEMA,
+        ) as session:
+            await self._pooltypedb.run_sync(partial(self._define, query=query, session=session))
+        await path_file_fingerprint.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        await path_file_fingerprint.write_text(fingerprint)
+        return True
+
+    @staticmethod
+    def _define(*, query: str, session: TypeDBSession) -> None:
+        with session.transaction(TransactionType.WRITE) as transaction_write:
+            transaction_write.query.define(query)
+            transaction_write.commit()
 
-    def delete_database(self) -> None:
-        if self._typedbdriver is not None:
-            self._typedbdriver.databases.get(self.configuration.name_database).delete()
+    async def delete_database(self) -> None:
+        await self._pooltypedb.run_sync(
+            lambda: self._pooltypedb.get_typedbdriver().databases.get(self.configuration.name_database).delete(),
+        )
+        await self._get_path_file_fingerprint_schema().unlink(missing_ok=True)
+        # TypeDB invalidates the driver a database has been deleted through.
+        await self._pooltypedb.run_sync(self._pooltypedb.invalidate)
+
+    def _get_path_file_fingerprint_schema(self) -> Path:
+        return Path(self.configuration.paths._path_dir_fingerprints / f"{self.configuration.name_database}.schema")
 
     async def fetch(
         self,
@@ -44,27 +150,176 @@ class ConnectionTypedb:
         path_file_query: Path,
         type_transaction: TransactionType = TransactionType.READ,
     ) -> AsyncGenerator[dict[str, Any]]:
+        """Fetches the results of the query in `path_file_query`, `typedb_size_fetch` at a time from a worker thread,
+        so the event loop keeps running while TypeDB answers."""
         query = await path_file_query.read_text(encoding="utf-8")
-        with (
-            self._typedbdriver.session(
-                database_name=self.configuration.name_database,
-                session_type=SessionType.DATA,
-            ) as session,
-            session.transaction(type_transaction) as transaction,
-        ):
-            for result in transaction.query.fetch(query):
-                yield result
-
-    async def insert_typeqlthings(self, *, typeqlthings: Iterable[TypeqlThing]) -> None:
-        with (
-            self._typedbdriver.session(
-                database_name=self.configuration.name_database,
-                session_type=SessionType.DATA,
-            ) as session,
-            session.transaction(TransactionType.WRITE) as transaction_write,
-        ):
-            for thing in typeqlthings:
+        async with self._pooltypedb.session(
+            database_name=self.configuration.name_database,
+            session_type=SessionType.DATA,
+        ) as session:
+            transaction = await self._pooltypedb.run_sync(partial(session.transaction, type_transaction))
+            try:
+                answers = await self._pooltypedb.run_sync(partial(transaction.query.fetch, query))
+                while results := await self._pooltypedb.run_sync(
+                    lambda: list(islice(answers, self.configuration.typedb_size_fetch)),
+                ):
+                    for result in results:
+                        yield result
+            finally:
+                with CancelScope(shield=True):
+                    await self._pooltypedb.run_sync(transaction.close)
+
+    def _commit(
+        self,
+        *,
+        commitchunk: Commitchunk,
+        on_committed: Oncommitted | None,
+        sessions: SimpleQueue[TypeDBSession],
+    ) -> int:
+        session = sessions.get()
+        try:
+            time_start = perf_counter()
+            with session.transaction(TransactionType.WRITE) as transaction_write:
+                for typeqlbatch in commitchunk.typeqlbatches:
+                    self._insert_typeqlbatch(transaction_write=transaction_write, typeqlbatch=typeqlbatch)
+                transaction_write.commit()
+            duration = perf_counter() - time_start
+        finally:
+            sessions.put(session)
+        if on_committed is not None:
+            # Report right away rather than once all chunks are committed, so that progress is kept if a later chunk
+            # fails.
+            on_committed(tuple(chain.from_iterable(typeqlbatch.positions for typeqlbatch in commitchunk.typeqlbatches)))
+        n_things = commitchunk.n_things
+        logger.debug(
+            "Committed {n_queries} queries inserting {n_things} {kind} in {duration:.3f} s "
+            "({throughput:.0f} things/s).",
+            duration=duration,
+            kind="relations" if commitchunk.is_relation else "entities",
+            n_queries=len(commitchunk.typeqlbatches),
+            n_things=n_things,
+            throughput=n_things / duration if duration else float("inf"),
+        )
+        return n_things
+
+    @staticmethod
+    def _insert_typeqlbatch(*, transaction_write: TypeDBTransaction, typeqlbatch: TypeqlBatch) -> None:
+        if typeqlbatch.query_delete:
+            logger.trace("{}", typeqlbatch.query_delete)
+            transaction_write.query.delete(typeqlbatch.query_delete)
+        logger.trace("{}", typeqlbatch.query)
+        answers = transaction_write.query.insert(typeqlbatch.query)
+        if typeqlbatch.is_matched and next(answers, None) is None:
+            logger.debug(
+                "Some role player or entity to update of {n} batched things is missing. Inserting them one by one ...",
+                n=len(typeqlbatch.typeqlthings),
+            )
+            for thing in typeqlbatch.typeqlthings:
                 query = thing.to_typeql()
                 logger.trace("{}", query)
                 transaction_write.query.insert(query)
-            transaction_write.commit()
+
+    async def insert_typeqlthings(
+        self,
+        *,
+        on_committed: Oncommitted | None = None,
+        positions_replacing: Container[int] = frozenset(),
+        typeqlthings: Iterable[TypeqlThing],
+    ) -> None:
+        """Inserts `typeqlthings` in write transactions committed every `typedb_size_commit` queries, spread across
+        `typedb_n_sessions` sessions (capped by the session pool). Every run of consecutive entities is committed
+        before any subsequent relation is inserted, and vice versa, so a relation always finds the role players
+        inserted before it. The pipeline runs on a worker thread, so the event loop keeps running meanwhile.
+
+        Entities at `positions_replacing` update those with the same key instead, as they may have been inserted
+        before. `on_committed` is called with the positions in `typeqlthings` of the things in each commit."""
+        await self._commit_commitchunks(
+            commitchunks=chunk_typeqlbatches(
+                batch_typeqlthings(
+                    typeqlthings,
+                    positions_replacing=positions_replacing,
+                    size_batch=self.configuration.typedb_size_batch,
+                ),
+                size_commit=self.configuration.typedb_size_commit,
+            ),
+            on_committed=on_committed,
+        )
+
+    async def load_bundle(self, *, bundle: Bundle) -> None:
+        """Loads `bundle` like `insert_typeqlthings()` does, but committing every `typedb_size_commit_bundle` queries.
+        All entities are committed before any relation is inserted."""
+        await self._commit_commitchunks(
+            commitchunks=chain(
+                chunk_queries(
+                    read_queries(bundle.path_file_entities),
+                    is_relation=False,
+                    size_commit=self.configuration.typedb_size_commit_bundle,
+                ),
+                chunk_queries(
+                    read_queries(bundle.path_file_relations),
+                    is_relation=True,
+                    size_commit=self.configuration.typedb_size_commit_bundle,
+                ),
+            ),
+        )
+
+    async def _commit_commitchunks(
+        self,
+        *,
+        commitchunks: Iterable[Commitchunk],
+        on_committed: Oncommitted | None = None,
+    ) -> None:
+        sessions: SimpleQueue[TypeDBSession] = SimpleQueue()
+        time_start = perf_counter()
+        async with self._pooltypedb.sessions(
+            self.configuration.typedb_n_sessions,
+            database_name=self.configuration.name_database,
+            session_type=SessionType.DATA,
+        ) as sessions_data:
+            for session in sessions_data:
+                sessions.put(session)
+            n_things = await self._pooltypedb.run_sync(
+                partial(
+                    self._commit_commitchunks_sync,
+                    commitchunks=commitchunks,
+                    on_committed=on_committed,
+                    sessions=sessions,
+                ),
+            )
+        duration = perf_counter() - time_start
+        logger.info(
+            "Inserted {n_things} TypeQL things in {duration:.1f} s ({throughput:.0f} things/s).",
+            duration=duration,
+            n_things=n_things,
+            throughput=n_things / duration if duration else float("inf"),
+        )
+
+    def _commit_commitchunks_sync(
+        self,
+        *,
+        commitchunks: Iterable[Commitchunk],
+        on_committed: Oncommitted | None,
+        sessions: SimpleQueue[TypeDBSession],
+    ) -> int:
+        n_sessions = sessions.qsize()
+        n_things = 0
+        with ThreadPoolExecutor(max_workers=n_sessions, thread_name_prefix="typedb-commit") as executor:
+            futures: set[Future[int]] = set()
+            is_relation_running = False
+            for commitchunk in commitchunks:
+                # Keep every worker busy, with at most one chunk waiting for each, without materialising all chunks.
+                n_things += _drain(
+                    futures,
+                    n_max_pending=0 if commitchunk.is_relation != is_relation_running else 2 * n_sessions - 1,
+                )
+                is_relation_running = commitchunk.is_relation
+                futures.add(
+                    executor.submit(
+                        self._commit,
+                        commitchunk=commitchunk,
+                        on_committed=on_committed,
+                        sessions=sessions,
+                    ),
+                )
+            n_things += _drain(futures, n_max_pending=0)
+        return n_things
@@ -1,4 +1,4 @@
-from contextvars import ContextVar
+from collections.abc import Callable
 from types import TracebackType
 from typing import Final
 
@@ -6,31 +6,29 @@ from typedb.driver import TypeDB, TypeDBDriver
 
 from knowledgeplatformmanagement_generic.data.services import Dataaccessor
 from knowledgeplatformmanagement_generic.data.services.typedb.connection_typedb import ConnectionTypedb
+from knowledgeplatformmanagement_generic.data.services.typedb.pool_typedb import PoolTypedb
 from knowledgeplatformmanagement_generic.settings import Configuration
 
-_typedbdriver: ContextVar[TypeDBDriver] = ContextVar("typedbdriver")
-
 
 class DataaccessorTypedb(Dataaccessor[ConnectionTypedb]):
     def __init__(
         self,
         *,
         configuration: Configuration,
+        factory_typedbdriver: Callable[[str], TypeDBDriver] = TypeDB.core_driver,
     ) -> None:
         self.configuration: Final[Configuration] = configuration
+        self.pooltypedb: Final[PoolTypedb] = PoolTypedb(
+            address=f"{self.configuration.address_typedb!s}:{self.configuration.port_typedb}",
+            factory_typedbdriver=factory_typedbdriver,
+            n_sessions_max=self.configuration.typedb_n_sessions_max,
+            n_threads=self.configuration.typedb_n_threads,
+        )
 
     async def __aenter__(self) -> ConnectionTypedb:
-        # TODO: TypeDB isn't well-designed, in that the driver object is invalidated when a database has been deleted,
-        # rather than distinguishing an connection from a driver or connection pool. Therefore a new driver object needs
-        # to be constructed for every connection.
-        _typedbdriver.set(
-            TypeDB.core_driver(
-                address=f"{self.configuration.address_typedb!s}:{self.configuration.port_typedb}",
-            ),
-        )
         return ConnectionTypedb(
             configuration=self.configuration,
-            typedbdriver=_typedbdriver.get(),
+            pooltypedb=self.pooltypedb,
         )
 
     async def __aexit__(
@@ -39,6 +37,5 @@ class DataaccessorTypedb(Dataaccessor[ConnectionTypedb]):
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        typedbdriver = _typedbdriver.get()
-        typedbdriver.close()
-        del typedbdriver
+        # The pooled driver outlives the connection, to be reused by the next one.
+        pass
@@ -0,0 +1,173 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from threading import Lock
+from typing import Final
+
+from anyio import CancelScope, CapacityLimiter, Semaphore, to_thread
+from anyio import Lock as LockAsync
+from loguru import logger
+from typedb.driver import SessionType, TypeDB, TypeDBDriver, TypeDBDriverException, TypeDBSession
+
+
+PREFIX_CODE_ERROR_CONNECTION: Final[str] = "[CXN"
+"""How the messages of the driver's connection errors start."""
+
+
+class PoolTypedb:
+    """Keeps a single TypeDB driver alive across connections, and hands out sessions through it, at most
+    `n_sessions_max` at a time.
+
+    TypeDB invalidates a driver once a database has been deleted through it, rather than distinguishing a connection
+    from a driver or connection pool. The driver is therefore rebuilt, lazily, after `invalidate()`, and once whenever
+    opening a session fails because the driver is unusable. A replaced driver is only closed once the sessions still
+    open through it are closed.
+
+    The TypeDB driver API is blocking, so it must only be called through `run_sync()`, which runs it on at most
+    `n_threads` worker threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        address: str,
+        factory_typedbdriver: Callable[[str], TypeDBDriver] = TypeDB.core_driver,
+        n_sessions_max: int,
+        n_threads: int,
+    ) -> None:
+        self._address: Final[str] = address
+        self._capacitylimiter: Final[CapacityLimiter] = CapacityLimiter(n_threads)
+        self._factory_typedbdriver: Final[Callable[[str], TypeDBDriver]] = factory_typedbdriver
+        # By driver ID, the number of sessions open through it.
+        self._id_to_n_sessions: Final[dict[int, int]] = {}
+        # By driver ID, the replaced drivers that sessions are still open through.
+        self._id_to_typedbdriver_replaced: Final[dict[int, TypeDBDriver]] = {}
+        self._lock: Final[Lock] = Lock()
+        self._lock_sessions: Final[LockAsync] = LockAsync()
+        self._semaphore: Final[Semaphore] = Semaphore(n_sessions_max)
+        self._typedbdriver: TypeDBDriver | None = None
+        self.n_sessions_max: Final[int] = n_sessions_max
+
+    def close(self) -> None:
+        self.invalidate()
+
+    def get_typedbdriver(self) -> TypeDBDriver:
+        with self._lock:
+            return self._get_typedbdriver()
+
+    def invalidate(self) -> None:
+        """Lets the next session build a new driver. The current one is closed as soon as no session is open through
+        it anymore."""
+        with self._lock:
+            typedbdriver = self._typedbdriver
+        if typedbdriver is not None:
+            self._replace(typedbdriver)
+
+    async def run_sync[T](self, function: Callable[[], T]) -> T:
+        return await to_thread.run_sync(function, limiter=self._capacitylimiter)
+
+    @asynccontextmanager
+    async def session(self, *, database_name: str, session_type: SessionType) -> AsyncIterator[TypeDBSession]:
+        async with self._semaphore, self._session(database_name=database_name, session_type=session_type) as session:
+            yield session
+
+    @asynccontextmanager
+    async def sessions(
+        self,
+        n_sessions: int,
+        *,
+        database_name: str,
+        session_type: SessionType,
+    ) -> AsyncIterator[list[TypeDBSession]]:
+        """Yields `n_sessions`, but at most `n_sessions_max`, sessions at once. Their permits are taken under a lock, so
+        that two callers can't each hold some of them while waiting for the other to release the rest."""
+        async with AsyncExitStack() as exitstack:
+            async with self._lock_sessions:
+                for _ in range(min(n_sessions, self.n_sessions_max)):
+                    await exitstack.enter_async_context(self._semaphore)
+            yield [
+                await exitstack.enter_async_context(
+                    self._session(database_name=database_name, session_type=session_type),
+                )
+                for _ in range(min(n_sessions, self.n_sessions_max))
+            ]
+
+    def _acquire(self) -> TypeDBDriver:
+        """Returns the driver, counted as in use until `_release()`, so it isn't closed under the session opened
+        through it."""
+        with self._lock:
+            typedbdriver = self._get_typedbdriver()
+            self._id_to_n_sessions[id(typedbdriver)] = self._id_to_n_sessions.get(id(typedbdriver), 0) + 1
+            return typedbdriver
+
+    def _close_session(self, *, session: TypeDBSession, typedbdriver: TypeDBDriver) -> None:
+        try:
+            session.close()
+        finally:
+            self._release(typedbdriver)
+
+    def _get_typedbdriver(self) -> TypeDBDriver:
+        if self._typedbdriver is None or not self._typedbdriver.is_open():
+            logger.debug("Building a TypeDB driver for {address} ...", address=self._address)
+            self._typedbdriver = self._factory_typedbdriver(self._address)
+        return self._typedbdriver
+
+    @asynccontextmanager
+    async def _session(self, *, database_name: str, session_type: SessionType) -> AsyncIterator[TypeDBSession]:
+        typedbdriver, session = await self.run_sync(
+            partial(self._open_session, database_name=database_name, session_type=session_type),
+        )
+        try:
+            yield session
+        finally:
+            with CancelScope(shield=True):
+                await self.run_sync(partial(self._close_session, session=session, typedbdriver=typedbdriver))
+
+    def _open_session(self, *, database_name: str, session_type: SessionType) -> tuple[TypeDBDriver, TypeDBSession]:
+        typedbdriver = self._acquire()
+        try:
+            return typedbdriver, typedbdriver.session(database_name=database_name, session_type=session_type)
+        except TypeDBDriverException as exception:
+            self._release(typedbdriver)
+            # Any other error, such as a missing database, isn't the driver's, so it mustn't take down the sessions and
+            # transactions running through it.
+            if typedbdriver.is_open() and not str(exception).startswith(PREFIX_CODE_ERROR_CONNECTION):
+                raise
+            logger.debug(
+                "Opening a TypeDB session failed ({exception}). Rebuilding the TypeDB driver and retrying ...",
+                exception=exception,
+            )
+            self._replace(typedbdriver)
+        except BaseException:
+            self._release(typedbdriver)
+            raise
+        typedbdriver = self._acquire()
+        try:
+            return typedbdriver, typedbdriver.session(database_name=database_name, session_type=session_type)
+        except BaseException:
+            self._release(typedbdriver)
+            raise
+
+    def _release(self, typedbdriver: TypeDBDriver) -> None:
+        id_typedbdriver = id(typedbdriver)
+        with self._lock:
+            self._id_to_n_sessions[id_typedbdriver] -= 1
+            if self._id_to_n_sessions[id_typedbdriver]:
+                return
+            del self._id_to_n_sessions[id_typedbdriver]
+            typedbdriver_replaced = self._id_to_typedbdriver_replaced.pop(id_typedbdriver, None)
+        if typedbdriver_replaced is not None and typedbdriver_replaced.is_open():
+            typedbdriver_replaced.close()
+
+    def _replace(self, typedbdriver: TypeDBDriver) -> None:
+        """Detaches `typedbdriver`, unless it has been replaced already, and closes it unless sessions are still open
+        through it."""
+        with self._lock:
+            is_current = self._typedbdriver is typedbdriver
+            if is_current:
+                self._typedbdriver = None
+            is_in_use = id(typedbdriver) in self._id_to_n_sessions
+            if is_current and is_in_use:
+                self._id_to_typedbdriver_replaced[id(typedbdriver)] = typedbdriver
+        if is_current and not is_in_use and typedbdriver.is_open():
+            typedbdriver.close()
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Container, Iterable, Iterator
 from datetime import date, datetime
+from functools import cache
 from inspect import getmro, isabstract
-from typing import Annotated, Self
+from typing import Annotated, Any, NamedTuple, Self
 
-from loguru import logger
 from pydantic import BaseModel, StringConstraints
 
 
@@ -20,6 +21,170 @@ class Key[T](BaseModel, frozen=True):
     value_key: Annotated[str, StringConstraints(min_length=1)]
 
 
+class Renderfield(NamedTuple):
+    """A model field of a `TypeqlThing` subclass, with its TypeQL names precomputed."""
+
+    position: int
+    """The position of the field in the model, which numbers the match variable of a role player."""
+    name_attribute: str
+    name_field: str
+    statement_has: str
+
+
+class Renderplan(NamedTuple):
+    """Everything about a `TypeqlThing` subclass that `to_typeql()` needs and that doesn't depend on the instance."""
+
+    name_key: str | None
+    names_key: tuple[str, ...]
+    """The fields annotated as keys, including `name_key`, which are the schema's keys of the type."""
+    name_schema: str
+    renderfields: tuple[Renderfield, ...]
+    title_key: str | None
+
+
+class Renderbuffer:
+    """Accumulates the statements rendered for the fields of a single `TypeqlThing`.
+
+    Variables are suffixed with `suffix_variable`, so the statements of several things can share a single query."""
+
+    __slots__ = ("attributes", "roleplayers", "statements_composite", "suffix_variable")
+
+    def __init__(self, *, suffix_variable: str = "") -> None:
+        self.attributes: list[str] = []
+        self.roleplayers: list[tuple[Renderfield, Key[Any]]] = []
+        self.statements_composite: list[str] = []
+        self.suffix_variable = suffix_variable
+
+    def _to_variable(self, renderfield: Renderfield) -> str:
+        return f"$var{renderfield.position:d}{self.suffix_variable}"
+
+    def join_arguments(self) -> str:
+        return ", ".join(
+            f"{renderfield.name_attribute}: {self._to_variable(renderfield)}" for renderfield, _ in self.roleplayers
+        )
+
+    def join_attributes(self) -> str:
+        return ", " + (", ".join(self.attributes)) if self.attributes else ""
+
+    def join_composite(self) -> str:
+        return ";\n".join(f"insert {statement}" for statement in self.statements_composite)
+
+    def join_match(self) -> str:
+        return "match " + "".join(self.to_statements_match()) if self.roleplayers else ""
+
+    def to_statements_match(self) -> list[str]:
+        return [_to_statement_match(self._to_variable(renderfield), key) for renderfield, key in self.roleplayers]
+
+
+class Matchplan:
+    """Plans the `match` of a query that inserts many relations, so that each distinct role player is matched only
+    once, by a variable that all relations in the query that reference it share."""
+
+    def __init__(self) -> None:
+        self._identity_to_variable: dict[tuple[str, str, str], str] = {}
+        self.statements_match: list[str] = []
+
+    def join_arguments(self, renderbuffer: Renderbuffer) -> str:
+        return ", ".join(
+            f"{renderfield.name_attribute}: {self.to_variable(key)}" for renderfield, key in renderbuffer.roleplayers
+        )
+
+    def to_variable(self, key: Key[Any]) -> str:
+        identity = (key.name_schema, key.name_key, key.value_key)
+        if (variable := self._identity_to_variable.get(identity)) is None:
+            variable = self._identity_to_variable[identity] = f"$roleplayer-{len(self._identity_to_variable):d}"
+            self.statements_match.append(_to_statement_match(variable, key))
+        return variable
+
+
+def _to_statement_match(variable: str, key: Key[Any]) -> str:
+    # TODO: Support non-string-valued keys.
+    return f'{variable} isa {key.name_schema:s}, has {key.name_key.replace("_", "-"):s} "{key.value_key:s}";\n'
+
+
+type Renderer = Callable[[Renderfield, Any, Renderbuffer], None]
+
+
+def _render_bool(renderfield: Renderfield, value: bool, renderbuffer: Renderbuffer) -> None:  # noqa: FBT001
+    renderbuffer.attributes.append(renderfield.statement_has + ("true" if value else "false"))
+
+
+def _render_number(renderfield: Renderfield, value: float, renderbuffer: Renderbuffer) -> None:
+    renderbuffer.attributes.append(renderfield.statement_has + str(value))
+
+
+def _render_str(renderfield: Renderfield, value: str, renderbuffer: Renderbuffer) -> None:
+    if '"' in value:
+        value = value.replace('"', "'")
+    renderbuffer.attributes.append(f'{renderfield.statement_has}"{value}"')
+
+
+def _render_list(renderfield: Renderfield, value: list[Any], renderbuffer: Renderbuffer) -> None:
+    # TODO: !! Support https://typedb.com/docs/typeql/2.x/queries/insert#_multivalued_attributes
+    if not all(isinstance(item, str) for item in value):
+        msg = f"Unsupported list item type for field {renderfield.name_attribute}."
+        raise TypeError(msg)
+    renderbuffer.attributes.append(f'{renderfield.statement_has}"{", ".join(value)}"')
+
+
+def _render_datetime(renderfield: Renderfield, value: datetime, renderbuffer: Renderbuffer) -> None:
+    renderbuffer.attributes.append(renderfield.statement_has + value.strftime(r"%Y-%m-%dT%H:%M:%S.%f")[:-3])
+
+
+def _render_date(renderfield: Renderfield, value: date, renderbuffer: Renderbuffer) -> None:
+    renderbuffer.attributes.append(renderfield.statement_has + value.strftime(r"%Y-%m-%d"))
+
+
+def _render_key(renderfield: Renderfield, value: Key[Any], renderbuffer: Renderbuffer) -> None:
+    renderbuffer.roleplayers.append((renderfield, value))
+
+
+def _render_typeqlattribute(
+    renderfield: Renderfield,
+    value: "TypeqlAttribute[Any]",
+    renderbuffer: Renderbuffer,
+) -> None:
+    renderbuffer.statements_composite.append(value.to_typeql_statement(suffix_variable=renderbuffer.suffix_variable))
+    renderbuffer.attributes.append(
+        f"{renderfield.statement_has}${value.compile_renderplan().name_schema}{renderbuffer.suffix_variable}",
+    )
+
+
+def _render_unsupported(renderfield: Renderfield, value: object, renderbuffer: Renderbuffer) -> None:
+    msg = f"Unsupported type for field {renderfield.name_attribute}: {type(value)}."
+    raise TypeError(msg)
+
+
+_TYPE_TO_RENDERER: dict[type, Renderer] = {}
+
+
+def _get_renderer(type_value: type) -> Renderer:
+    """Resolves the renderer for values of a type once. Subclasses are checked before their superclasses, such as `bool`
+    before `int`, and `datetime` before `date`."""
+    if (renderer := _TYPE_TO_RENDERER.get(type_value)) is not None:
+        return renderer
+    if issubclass(type_value, bool):
+        renderer = _render_bool
+    elif issubclass(type_value, float | int):
+        renderer = _render_number
+    elif issubclass(type_value, str):
+        renderer = _render_str
+    elif issubclass(type_value, list):
+        renderer = _render_list
+    elif issubclass(type_value, datetime):
+        renderer = _render_datetime
+    elif issubclass(type_value, date):
+        renderer = _render_date
+    elif issubclass(type_value, Key):
+        renderer = _render_key
+    elif issubclass(type_value, TypeqlAttribute):
+        renderer = _render_typeqlattribute
+    else:
+        return _render_unsupported
+    _TYPE_TO_RENDERER[type_value] = renderer
+    return renderer
+
+
 # pylint: disable-next=too-few-public-methods
 class TypeqlThing(BaseModel, ABC):
     @abstractmethod
@@ -27,36 +192,73 @@ class TypeqlThing(BaseModel, ABC):
         """Abstract marker to prevent direct instantiation. Override in `TypeqlThing` subclasses that reflect a
         non-abstract thing definition in the schema."""
 
+    @classmethod
+    @cache
+    def compile_renderplan(cls) -> Renderplan:
+        """Compiles the parts of the TypeQL rendering that are the same for all instances of `cls`, once per class.
+
+        Use it so `to_typeql()` doesn't need to inspect the model fields, MRO and value types for every instance."""
+        name_key = None
+        names_key = []
+        title_key = None
+        renderfields = []
+        for position, (name_field, fieldinfo) in enumerate(cls.model_fields.items()):
+            if fieldinfo.metadata and fieldinfo.metadata[0] == "key":
+                # Fields are ordered from super- to subclass, and a subclass's own key identifies its things.
+                name_key = name_field
+                names_key.append(name_field)
+                title_key = fieldinfo.title
+            if name_field == "value":
+                # Exempt `value` attribute of `TypeqlAttribute` objects, which is rendered as their placeholder.
+                continue
+            name_attribute = name_field.replace("_", "-")
+            renderfields.append(
+                Renderfield(
+                    position=position,
+                    name_attribute=name_attribute,
+                    name_field=name_field,
+                    statement_has=f"has {name_attribute} ",
+                ),
+            )
+        return Renderplan(
+            name_key=name_key,
+            names_key=tuple(names_key),
+            name_schema=cls.to_typeql_name_schema(),
+            renderfields=tuple(renderfields),
+            title_key=title_key,
+        )
+
+    def _render(self, *, suffix_variable: str = "") -> Renderbuffer:
+        renderbuffer = Renderbuffer(suffix_variable=suffix_variable)
+        # Pydantic stores field values in the instance dictionary, which is faster to access than via `getattr()`.
+        fieldvalues = self.__dict__
+        for renderfield in self.compile_renderplan().renderfields:
+            if (value := fieldvalues[renderfield.name_field]) is not None:
+                _get_renderer(type(value))(renderfield, value, renderbuffer)
+        return renderbuffer
+
     def to_key(self) -> Key[Self]:
         """Detects `self`'s key attribute based on its type annotation `'key'`, and returns a `Key` object for `self`.
         `Key` objects are used to associate role players with a relation.
 
         Raises `ValueError` if no attribute with a key annotation was found."""
 
-        name_key = ""
-        for name_field, fieldinfo in self.model_fields.items():
-            if fieldinfo.metadata and fieldinfo.metadata[0] == "key":
-                name_key = name_field
-                if not fieldinfo.title:
-                    raise TypeqlThingMissingTitleError(typeqlthing=self)
-                title_field = fieldinfo.title
-                break
-        if not name_key:
+        renderplan = self.compile_renderplan()
+        if renderplan.name_key is None:
             raise TypeqlThingMissingKeyDeclarationError(typeqlthing=self)
-
-        if name_key is not None:
-            value_key = getattr(self, name_key)
-            return Key(
-                classobject=self.__class__,
-                title=self.model_config.get("title"),
-                title_key=title_field,
-                name_key=name_key,
-                name_schema=self.__class__.to_typeql_name_schema(),
-                value_key=value_key,
-            )
-        raise ValueError()
+        if not renderplan.title_key:
+            raise TypeqlThingMissingTitleError(typeqlthing=self)
+        return Key(
+            classobject=self.__class__,
+            title=self.model_config.get("title"),
+            title_key=renderplan.title_key,
+            name_key=renderplan.name_key,
+            name_schema=renderplan.name_schema,
+            value_key=getattr(self, renderplan.name_key),
+        )
 
     @classmethod
+    @cache
     def to_typeql_name_schema(cls) -> str:
         """
         Names the type after the last non-abstract class, in sub- to superclass order, to preserve generality.
@@ -93,81 +295,9 @@ class TypeqlThing(BaseModel, ABC):
         # TODO: Specify exception.
         raise ValueError()
 
-    # TODO: The complexity in this function is essential.
-    def _to_typeql_attributes(self) -> str:  # noqa: C901, PLR0912
-        attributes = []
-        for field_current in self.model_fields:
-            if (value := getattr(self, field_current)) is None:
-                logger.trace("Missing value for field `{field_name}`.", field_name=field_current)
-                continue
-            if field_current == "value":
-                # TODO: Document this.
-                # Exempt `value` attribute of `TypeqlAttribute` objects.
-                continue
-            field_name_typedb = field_current.replace("_", "-")
-            has = f"has {field_name_typedb} "
-            match value:
-                case bool():
-                    attributes.append(has + str(value).lower())
-                case float() | int():
-                    attributes.append(has + str(value))
-                case str():
-                    if '"' in value:
-                        value = value.replace('"', "'")
-                    attributes.append(f'{has}"{value}"')
-                case list():
-                    # TODO: !! Support https://typedb.com/docs/typeql/2.x/queries/insert#_multivalued_attributes
-                    if all(isinstance(item, str) for item in value):
-                        attributes.append(f'{has}"{", ".join(value)}"')
-                    else:
-                        msg = f"Unsupported list item type for field {field_name_typedb}."
-                        raise TypeError(msg)
-                case datetime():
-                    attributes.append(has + value.strftime(r"%Y-%m-%dT%H:%M:%S.%f")[:-3])
-                case date():
-                    attributes.append(has + value.strftime(r"%Y-%m-%d"))
-                case Key():
-                    continue
-                case TypeqlAttribute():
-                    attributes.append(has + f"${value.to_typeql_name_schema()}")
-                case _:
-                    msg = f"Unsupported type for field {field_name_typedb}: {type(value)}."
-                    raise TypeError(msg)
-        return ", " + (", ".join(attributes)) if attributes else ""
-
     @abstractmethod
     def to_typeql(self) -> str: ...
 
-    def scan_composite_attributes(self) -> str:
-        statements = []
-        for field_current in self.model_fields:
-            if (value := getattr(self, field_current)) is None:
-                continue
-            match value:
-                case TypeqlAttribute():
-                    statements.append(value.to_typeql())
-                case _:
-                    continue
-        return ";\n".join(statements) if statements else ""
-
-    def scan_key_attributes(self) -> tuple[str, list[str]]:
-        arguments = []
-        statement_match = "match "
-        # Match based on keys.
-        for index, name_field in enumerate(self.model_fields):
-            if (value := getattr(self, name_field)) is None or not isinstance(value, Key):
-                continue
-            variable = f"$var{index:d}"
-            name_attribute_key = f"{value.name_key.replace('_', '-'):s}"
-            statement_match += f"{variable} isa {value.name_schema:s}, "
-            # TODO: Support non-string-valued keys.
-            statement_match += f'has {name_attribute_key:s} "{value.value_key:s}";\n'
-            name_attribute = name_field.replace("_", "-")
-            arguments.append(f"{name_attribute}: {variable}")
-        if statement_match == "match ":
-            statement_match = ""
-        return (statement_match, arguments)
-
 
 class TypeqlThingMissingTitleError(TypeError):
     def __init__(self, *, typeqlthing: TypeqlThing) -> None:
@@ -225,9 +355,15 @@ class TypeqlAttribute[T](TypeqlThing):
                 raise TypeError(msg)
 
     def to_typeql(self) -> str:
-        name_schema = self.to_typeql_name_schema()
+        return f"insert {self.to_typeql_statement()}"
+
+    def to_typeql_statement(self, *, suffix_variable: str = "") -> str:
+        """Renders the statement that inserts this attribute, without `insert` keyword, as variable
+        `$<name_schema><suffix_variable>`."""
+        name_schema = self.compile_renderplan().name_schema
         return (
-            f"insert ${name_schema} {self._to_typeql_placeholder()} isa {name_schema}{self._to_typeql_attributes()};\n"
+            f"${name_schema}{suffix_variable} {self._to_typeql_placeholder()} isa {name_schema}"
+            f"{self._render().join_attributes()};\n"
         )
 
 
@@ -235,16 +371,17 @@ class TypeqlAttribute[T](TypeqlThing):
 # pylint: disable-next=too-few-public-methods
 class TypeqlThingRelation(TypeqlThing):
     def to_typeql(self) -> str:
-        statement_match, arguments = self.scan_key_attributes()
-        if not arguments:
+        renderbuffer = self._render()
+        if not renderbuffer.roleplayers:
             raise TypeqlThingRelationMissingKeyError(self)
-        statement_insert_composite = self.scan_composite_attributes()
+        statement_insert_composite = renderbuffer.join_composite()
         statement_insert = (
-            f"insert $_ ({', '.join(arguments)}) isa {self.to_typeql_name_schema()}{self._to_typeql_attributes()};\n"
+            f"insert $_ ({renderbuffer.join_arguments()}) isa {self.compile_renderplan().name_schema}"
+            f"{renderbuffer.join_attributes()};\n"
         )
         return (
             f"{statement_insert_composite}"
-            f"{statement_match}"
+            f"{renderbuffer.join_match()}"
             f"{'insert' if statement_insert_composite else ''}"
             f"{statement_insert}"
         )
@@ -262,12 +399,186 @@ class TypeqlThingRelationMissingKeyError(ValueError):
 # pylint: disable-next=too-few-public-methods
 class TypeqlThingEntity(TypeqlThing):
     def to_typeql(self) -> str:
-        statement_match, arguments = self.scan_key_attributes()
-        statement_insert_composite = self.scan_composite_attributes()
-        statement_insert = f"$_ isa {self.to_typeql_name_schema()}{self._to_typeql_attributes()};\n"
+        renderbuffer = self._render()
+        statement_insert_composite = renderbuffer.join_composite()
+        statement_insert = f"$_ isa {self.compile_renderplan().name_schema}{renderbuffer.join_attributes()};\n"
         return (
             f"{statement_insert_composite}"
-            f"{statement_match}"
+            f"{renderbuffer.join_match()}"
             f"{'' if statement_insert_composite else 'insert '}"
             f"{statement_insert}"
         )
+
+    def to_typeql_update(self) -> tuple[str, str]:
+        """Renders the queries that update the entity with the same keys as `self` to `self`, for an entity that may
+        have been inserted before. Unlike deleting and inserting the entity again, this keeps the roles it plays.
+
+        The first query deletes the entity's ownerships of all attributes of `self`'s type but its keys. The second
+        inserts `self`'s attributes but its keys. It has no answer if the entity doesn't exist, so `to_typeql()` must
+        then insert it.
+
+        Raises `TypeqlThingMissingKeyDeclarationError` if `self`'s type has no key attribute."""
+        renderplan = self.compile_renderplan()
+        if renderplan.name_key is None:
+            raise TypeqlThingMissingKeyDeclarationError(typeqlthing=self)
+        fieldvalues = self.__dict__
+        renderbuffer_key = Renderbuffer()
+        renderbuffer = Renderbuffer()
+        statements_isa = []
+        for renderfield in renderplan.renderfields:
+            value = fieldvalues[renderfield.name_field]
+            if renderfield.name_field in renderplan.names_key:
+                if isinstance(value, TypeqlAttribute):
+                    # Match an attribute-valued key by its value, rather than by its own attributes.
+                    value = value.value
+                _get_renderer(type(value))(renderfield, value, renderbuffer_key)
+                continue
+            statements_isa.append(f"{{ $attribute isa {renderfield.name_attribute}; }}")
+            if value is not None:
+                _get_renderer(type(value))(renderfield, value, renderbuffer)
+        statement_match = f"match $thing isa {renderplan.name_schema}, {', '.join(renderbuffer_key.attributes)};\n"
+        query_delete = (
+            f"{statement_match}$thing has $attribute;\n{' or '.join(statements_isa)};\ndelete $thing has $attribute;\n"
+            if statements_isa
+            else ""
+        )
+        # Inserting the keys, which the entity owns already, only gives the query an answer if it has nothing else.
+        renderbuffer = renderbuffer if renderbuffer.attributes else renderbuffer_key
+        query_insert = (
+            f"{statement_match}insert {''.join(renderbuffer.statements_composite)}"
+            f"$thing {', '.join(renderbuffer.attributes)};\n"
+        )
+        return query_delete, query_insert
+
+
+class TypeqlBatch(NamedTuple):
+    """A single TypeQL insert query for one or more `TypeqlThing`s."""
+
+    query: str
+    typeqlthings: tuple[TypeqlThing, ...]
+    is_matched: bool
+    """Whether the query inserts under a `match`, of role players or of an entity to update. If any of these is
+    missing, the match has no answer and nothing is inserted, so the things must then be inserted one by one using
+    `to_typeql()`."""
+    positions: tuple[int, ...] = ()
+    """The positions of `typeqlthings` in the things passed to `batch_typeqlthings()`."""
+    query_delete: str = ""
+    """A query to run before `query`, which deletes the attributes that `query` replaces."""
+
+
+type Rendered = tuple[int, TypeqlThing, Renderbuffer]
+"""A thing with its position in the things passed to `batch_typeqlthings()`, and its rendered statements."""
+
+
+def _to_shape_match(typeqlthing: TypeqlThing, renderbuffer: Renderbuffer) -> tuple[str, ...] | None:
+    """Returns what relations must have in common to be merged into a single match-insert query, or `None` for things
+    that can't be merged with others."""
+    if isinstance(typeqlthing, TypeqlThingEntity):
+        # Any entity type can be merged into an `insert` query, provided there is nothing to match.
+        return () if not renderbuffer.roleplayers else None
+    if (
+        isinstance(typeqlthing, TypeqlThingRelation)
+        and renderbuffer.roleplayers
+        # Relations with composite attributes are rendered with a separate `insert` before their `match`.
+        and not renderbuffer.statements_composite
+    ):
+        return (
+            typeqlthing.compile_renderplan().name_schema,
+            *(
+                f"{renderfield.name_attribute}:{key.name_schema}:{key.name_key}"
+                for renderfield, key in renderbuffer.roleplayers
+            ),
+        )
+    return None
+
+
+def _to_typeqlbatch(typeqlthings_rendered: list[Rendered]) -> TypeqlBatch:
+    positions = tuple(position for position, _, _ in typeqlthings_rendered)
+    typeqlthings = tuple(typeqlthing for _, typeqlthing, _ in typeqlthings_rendered)
+    if len(typeqlthings) == 1:
+        return TypeqlBatch(
+            query=typeqlthings[0].to_typeql(),
+            typeqlthings=typeqlthings,
+            is_matched=False,
+            positions=positions,
+        )
+    matchplan = Matchplan()
+    statements_insert = []
+    for _, typeqlthing, renderbuffer in typeqlthings_rendered:
+        statements_insert.extend(renderbuffer.statements_composite)
+        roles = f" ({matchplan.join_arguments(renderbuffer)})" if renderbuffer.roleplayers else ""
+        statements_insert.append(
+            f"$thing{renderbuffer.suffix_variable}{roles} isa {typeqlthing.compile_renderplan().name_schema}"
+            f"{renderbuffer.join_attributes()};\n",
+        )
+    return TypeqlBatch(
+        query=(
+            f"{'match ' if matchplan.statements_match else ''}{''.join(matchplan.statements_match)}"
+            f"insert {''.join(statements_insert)}"
+        ),
+        typeqlthings=typeqlthings,
+        is_matched=bool(matchplan.statements_match),
+        positions=positions,
+    )
+
+
+def _flush_typeqlbatches(
+    shape_match_to_typeqlthings_rendered: dict[tuple[str, ...], list[Rendered]],
+) -> Iterator[TypeqlBatch]:
+    for typeqlthings_rendered in shape_match_to_typeqlthings_rendered.values():
+        yield _to_typeqlbatch(typeqlthings_rendered)
+    shape_match_to_typeqlthings_rendered.clear()
+
+
+def batch_typeqlthings(
+    typeqlthings: Iterable[TypeqlThing],
+    *,
+    positions_replacing: Container[int] = frozenset(),
+    size_batch: int,
+) -> Iterator[TypeqlBatch]:
+    """Merges `TypeqlThing`s into insert queries of at most `size_batch` things each.
+
+    Runs of consecutive entities of any type are merged into a single `insert` with uniquely named variables. Within
+    a run of consecutive relations, relations are merged if their role players are matched in the same way, which
+    may reorder relations among themselves, but never relative to entities. Each distinct role player is matched once
+    per query (see `Matchplan`). Entities at `positions_replacing` replace those with the same key, and get their own
+    queries, as rendered by `to_typeql_update()`. Any other thing gets its own query, as rendered by `to_typeql()`."""
+    shape_match_to_typeqlthings_rendered: dict[tuple[str, ...], list[Rendered]] = {}
+    for index, typeqlthing in enumerate(typeqlthings):
+        if index in positions_replacing and isinstance(typeqlthing, TypeqlThingEntity):
+            yield from _flush_typeqlbatches(shape_match_to_typeqlthings_rendered)
+            query_delete, query_insert = typeqlthing.to_typeql_update()
+            yield TypeqlBatch(
+                query=query_insert,
+                typeqlthings=(typeqlthing,),
+                is_matched=True,
+                positions=(index,),
+                query_delete=query_delete,
+            )
+            continue
+        if size_batch > 1:
+            renderbuffer = typeqlthing._render(suffix_variable=f"-{index:d}")
+            shape_match = _to_shape_match(typeqlthing, renderbuffer)
+        else:
+            shape_match = None
+        if shape_match is None:
+            yield from _flush_typeqlbatches(shape_match_to_typeqlthings_rendered)
+            yield TypeqlBatch(
+                query=typeqlthing.to_typeql(),
+                typeqlthings=(typeqlthing,),
+                is_matched=False,
+                positions=(index,),
+            )
+            continue
+        # Entities have an empty match shape. Preserve the order between entities and relations, since relations can
+        # only match role players that were inserted earlier.
+        if any(
+            bool(shape_match_pending) is not bool(shape_match)
+            for shape_match_pending in shape_match_to_typeqlthings_rendered
+        ):
+            yield from _flush_typeqlbatches(shape_match_to_typeqlthings_rendered)
+        typeqlthings_rendered = shape_match_to_typeqlthings_rendered.setdefault(shape_match, [])
+        typeqlthings_rendered.append((index, typeqlthing, renderbuffer))
+        if len(typeqlthings_rendered) >= size_batch:
+            yield _to_typeqlbatch(shape_match_to_typeqlthings_rendered.pop(shape_match))
+    yield from _flush_typeqlbatches(shape_match_to_typeqlthings_rendered)
@@ -26,7 +26,12 @@ async def installer(configuration: Configuration) -> None:
     configuration.paths.path_dir_user_data.mkdir(mode=0o700, parents=True)
     configuration.paths.path_dir_user_cache.mkdir(mode=0o700, parents=True)
     configuration.paths._path_dir_logs.mkdir(mode=0o700, parents=True)
+    configuration.paths._path_dir_embeddings.mkdir(mode=0o700)
+    configuration.paths._path_dir_ner.mkdir(mode=0o700)
     configuration.paths._path_dir_artifacts.mkdir(mode=0o700)
+    configuration.paths._path_dir_bundles.mkdir(mode=0o700)
+    configuration.paths._path_dir_documents.mkdir(mode=0o700)
+    configuration.paths._path_dir_fingerprints.mkdir(mode=0o700)
     configuration.paths._path_dir_user_assets.mkdir(mode=0o700)
     path_dir_model_docling = download_models(
         progress=True,
@@ -5,6 +5,7 @@ from pydantic import AnyHttpUrl, BaseModel, Field, IPvAnyInterface, StringConstr
 from typedb.driver import TypeDB
 
 from knowledgeplatformmanagement_generic.settings.paths import Paths
+from knowledgeplatformmanagement_generic.settings.profile_collection import Profilecollection
 
 
 class Configuration(BaseModel, frozen=True):
@@ -13,12 +14,40 @@ class Configuration(BaseModel, frozen=True):
     """The address TypeDB Core listens on."""
     port_typedb: Annotated[int, Ge(0), Le(65535)] = int(TypeDB.DEFAULT_ADDRESS.split(sep=":", maxsplit=1)[1])
     """The TCP port TypeDB Core listens on."""
+    encoder_cache_n_entries_max: Annotated[int, Ge(1)] = 262_144
+    """The maximum number of embeddings to cache on disk, beyond which the least recently used are evicted. Each takes
+    two bytes per dimension of the encoder model."""
+    encoder_size_batch: Annotated[int, Ge(1)] = 64
+    """The number of sentences to encode in a single call to the encoder model."""
+    documentstore_n_documents_cached: Annotated[int, Ge(0)] = 32
+    """The maximum number of parsed full documents to keep in memory, beyond which the least recently used are
+    dropped."""
     name_database: Annotated[str, StringConstraints(min_length=1)] = Field(default="knowledgeplatform")
     """The name of the TypeDB and Qdrant databases."""
     name_model_encoder: Annotated[str, StringConstraints(min_length=1)] = "jinaai/jina-embeddings-v3"
     name_model_llm: Annotated[str, StringConstraints(min_length=1)] = "gpt-4o-mini"
     """The name of the LLM model to use with the LLM service."""
+    ner_cache_n_entries_max: Annotated[int, Ge(0)] = 65_536
+    """The maximum number of texts to keep the entities of in memory, beyond which the least recently used are
+    dropped."""
+    ner_cache_n_entries_max_disk: Annotated[int, Ge(1)] = 131_072
+    """The maximum number of texts to keep the entities of on disk, if `ner_cache_on_disk`, beyond which the least
+    recently used are evicted. Each takes a small file."""
+    ner_cache_on_disk: bool = False
+    """Whether to also keep the entities of texts on disk, so that they outlive the process."""
+    ner_n_processes: Annotated[int, Ge(1)] = 1
+    """The number of processes spaCy performs NER in. More than one pays off only for many or long texts, since each
+    process loads the model anew."""
+    ner_size_batch: Annotated[int, Ge(1)] = 64
+    """The number of texts to perform NER on in a single call to the NER model."""
+    ner_size_batch_documents: Annotated[int, Ge(1)] = 8
+    """The number of documents to extract entities from at a time, performing NER on them in batches across documents.
+    Their full documents are kept in memory meanwhile."""
     paths: Paths = Field(default_factory=Paths)
+    persist_size_chunk: Annotated[int, Ge(1)] = 256
+    """The number of things to pass from one persist stage to the next at a time."""
+    persist_size_queue: Annotated[int, Ge(1)] = 8
+    """The maximum number of chunks of things waiting between two persist stages."""
     port: Annotated[int, Ge(0), Le(65535)] = 8080
     """The TCP port the webserver listens on."""
     size_max_workbook: Annotated[int, Ge(0)] = 16_777_216
@@ -28,4 +57,26 @@ class Configuration(BaseModel, frozen=True):
     timeout_qdrant: Annotated[int, Ge(1)] = 60
     url_qdrant: AnyHttpUrl = AnyHttpUrl("http://localhost:6334")
     """The connection string (URL) to the Qdrant server."""
+    qdrant_interval_health: Annotated[int, Ge(0)] = 30
+    """The minimum number of seconds between two health checks of the Qdrant client, run when a connection is opened."""
+    qdrant_n_operations_max: Annotated[int, Ge(1)] = 16
+    """The maximum number of operations in flight through the Qdrant client at the same time, across all connections."""
+    qdrant_profile: Profilecollection = Field(default_factory=Profilecollection)
+    """How Qdrant stores, indexes and searches the vectors of the collection."""
     qdrant_size_batch: Annotated[int, Ge(1)] = 1024
+    qdrant_timeout_health: Annotated[int, Ge(1)] = 5
+    """The maximum number of seconds a health check of the Qdrant client may take before it's considered failed."""
+    typedb_n_sessions: Annotated[int, Ge(1)] = 4
+    """The number of TypeDB sessions to write through in parallel."""
+    typedb_n_sessions_max: Annotated[int, Ge(1)] = 16
+    """The maximum number of TypeDB sessions open at the same time, across all connections."""
+    typedb_n_threads: Annotated[int, Ge(1)] = 8
+    """The maximum number of worker threads to make blocking TypeDB calls on, across all connections."""
+    typedb_size_batch: Annotated[int, Ge(1)] = 256
+    """The maximum number of things to merge into a single TypeQL insert query. Set to 1 to insert thing by thing."""
+    typedb_size_commit: Annotated[int, Ge(1)] = 16
+    """The maximum number of TypeQL insert queries to run in a single write transaction before committing it."""
+    typedb_size_commit_bundle: Annotated[int, Ge(1)] = 1024
+    """The maximum number of single-thing TypeQL insert queries from a bundle to run in a single write transaction."""
+    typedb_size_fetch: Annotated[int, Ge(1)] = 256
+    """The number of query results to fetch from TypeDB on a worker thread at a time."""
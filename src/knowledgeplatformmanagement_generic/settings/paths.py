@@ -51,6 +51,15 @@ class Paths(BaseModel):
     def _get_dir_artifacts(self) -> Path:
         return self.path_dir_user_data / "artifacts"
 
+    def _get_dir_bundles(self) -> Path:
+        return self.path_dir_user_data / "bundles"
+
+    def _get_dir_documents(self) -> Path:
+        return self.path_dir_user_data / "documents"
+
+    def _get_dir_fingerprints(self) -> Path:
+        return self.path_dir_user_data / "fingerprints"
+
     def _get_dir_user_assets(self) -> Path:
         return self.path_dir_user_data / "assets"
 
@@ -60,9 +69,15 @@ class Paths(BaseModel):
     def _get_dir_test(self) -> Path:
         return self._path_dir_root / "tests"
 
+    def _get_dir_embeddings(self) -> Path:
+        return self.path_dir_user_cache / "embeddings"
+
     def _get_dir_logs(self) -> Path:
         return self.path_dir_user_cache / "logs"
 
+    def _get_dir_ner(self) -> Path:
+        return self.path_dir_user_cache / "ner"
+
     def _get_file_logs(self) -> Path:
         return self._path_dir_logs / "output.log"
 
@@ -82,7 +97,12 @@ class Paths(BaseModel):
         return None
 
     _path_dir_artifacts: Path
+    _path_dir_bundles: Path
+    _path_dir_documents: Path
+    _path_dir_embeddings: Path
+    _path_dir_fingerprints: Path
     _path_dir_logs: Path
+    _path_dir_ner: Path
     _path_dir_root: Path
     _path_dir_root_test: Path
     _path_dir_user_assets: Path
@@ -105,9 +125,14 @@ class Paths(BaseModel):
         __context: Any,  # noqa: ANN401, PYI063
     ) -> None:
         self._path_dir_artifacts = self._get_dir_artifacts()
+        self._path_dir_bundles = self._get_dir_bundles()
+        self._path_dir_documents = self._get_dir_documents()
+        self._path_dir_fingerprints = self._get_dir_fingerprints()
         self._path_dir_user_assets = self._get_dir_user_assets()
         self._path_dir_root = self._get_dir_root()
         self._path_dir_logs = self._get_dir_logs()
+        self._path_dir_embeddings = self._get_dir_embeddings()
+        self._path_dir_ner = self._get_dir_ner()
         self._path_dir_root_test = self._get_dir_test()
         self._path_file_logs = self._get_file_logs()
         self._path_dir_model_spacy_en = self._get_dir_model_spacy_en()
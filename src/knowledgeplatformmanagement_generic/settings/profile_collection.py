@@ -0,0 +1,50 @@
+from enum import StrEnum
+from typing import Annotated
+
+from annotated_types import Ge
+from pydantic import BaseModel
+
+
+class Fusion(StrEnum):
+    DBSF = "dbsf"
+    """Distribution-based score fusion, which normalizes the scores of each search before summing them."""
+    NONE = "none"
+    """Dense search only."""
+    RRF = "rrf"
+    """Reciprocal rank fusion, which sums the reciprocals of the ranks of each result in each search."""
+
+
+class Quantization(StrEnum):
+    BINARY = "binary"
+    """One bit per dimension. Fastest and smallest, but only accurate for high-dimensional, centered embeddings."""
+    NONE = "none"
+    SCALAR = "scalar"
+    """One int8 per dimension, a quarter of the size of float32."""
+
+
+class Profilecollection(BaseModel, frozen=True):
+    """How Qdrant stores, indexes and searches the vectors of the collection. See
+    https://qdrant.tech/documentation/guides/optimize/."""
+
+    factor_prefetch: Annotated[int, Ge(1)] = 4
+    """The factor by which to fetch more candidates from the dense and the sparse search each, to fuse."""
+    fusion: Fusion = Fusion.RRF
+    """How to fuse the results of the dense and the sparse (BM25) search."""
+    hnsw_ef: Annotated[int, Ge(1)] | None = None
+    """The number of candidates to consider when searching the HNSW graph. If `None`, Qdrant's default."""
+    hnsw_ef_construct: Annotated[int, Ge(4)] = 100
+    """The number of candidates to consider when building the HNSW graph. Higher is more accurate but slower."""
+    hnsw_m: Annotated[int, Ge(0)] = 16
+    """The number of edges per node of the HNSW graph. Higher is more accurate but takes more memory."""
+    indexing_threshold: Annotated[int, Ge(1)] = 20_000
+    """The size in kilobytes of vectors beyond which a segment is indexed, except during bulk loads."""
+    n_segments: Annotated[int, Ge(1)] = 2
+    n_shards: Annotated[int, Ge(1)] = 4
+    on_disk: bool = True
+    """Whether to keep the original vectors and the HNSW graph on disk, rather than in RAM. Quantized vectors are kept
+    in RAM regardless."""
+    oversampling: Annotated[float, Ge(1)] = 2.0
+    """The factor by which to fetch more candidates by their quantized vectors, to rescore."""
+    quantization: Quantization = Quantization.NONE
+    rescore: bool = True
+    """Whether to rescore the candidates found by their quantized vectors by their original vectors."""
@@ -1,11 +1,15 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Collection, Iterable
 from datetime import datetime
+from functools import partial
 from importlib.resources import as_file, files
+from itertools import chain
 from typing import Any, ClassVar, cast
 
-from anyio import Path
+from anyio import Lock, Path, create_task_group, to_thread
+from knowledgeplatformmanagement_generic.data.dao.persistengine import Persistengine, Persistitem
 from knowledgeplatformmanagement_generic.data.services.llm.dataaccessor_llm import DataaccessorLlm
 from knowledgeplatformmanagement_generic.data.services.qdrant.dataaccessor_qdrant import DataaccessorQdrant
+from knowledgeplatformmanagement_generic.data.services.typedb.bundle_typedb import Bundle, write_bundle
 from knowledgeplatformmanagement_generic.data.services.typedb.dataaccessor_typedb import DataaccessorTypedb
 from loguru import logger
 from sentence_transformers import SentenceTransformer
@@ -13,6 +17,7 @@ from sentence_transformers import SentenceTransformer
 import knowledgeplatformmanagement_han
 from knowledgeplatformmanagement_han.data.dao.datasinks import Datasinks
 from knowledgeplatformmanagement_han.data.extract.ubwfris import ExportPowerbiPerson, ExportPowerbiTimesheet
+from knowledgeplatformmanagement_han.data.model.provenant import Source
 from knowledgeplatformmanagement_han.settings import Configuration
 from knowledgeplatformmanagement_han.settings.timesheets import ProjecttypeToProjecttypeinfo, Projecttypeinfo
 
@@ -24,6 +29,8 @@ class Datalayer:
         for enumname, enumvalue in ProjecttypeToProjecttypeinfo.__members__.items()
         if enumvalue.value.projectclassifier_financial
     }
+    SOURCES_PERSIST: ClassVar[tuple[Source, ...]] = (Source.documents, Source.microsoft365, Source.ubwfris)
+    """The sources to persist the datasinks of, in order."""
 
     # The multitude of arguments is required for this data-carrying class.
     def __init__(  # noqa: PLR0913
@@ -42,51 +49,105 @@ class Datalayer:
         self.dataaccessor_qdrant = dataaccessor_qdrant
         self.datasinks = datasinks
         self.model_encoder = model_encoder
+        self._lock_persist = Lock()
+        self.persistengine = Persistengine(
+            configuration=configuration,
+            dataaccessor_qdrant=dataaccessor_qdrant,
+            dataaccessor_typedb=dataaccessor_typedb,
+        )
 
     async def init(self) -> None:
-        """Creates all data stores configured in this data layer. Assumes a clean slate."""
+        """Creates all data stores configured in this data layer, insofar they don't exist already. Defines the TypeDB
+        schema only if it changed since it was last defined, so that re-initializing is cheap."""
+        async with create_task_group() as taskgroup:
+            taskgroup.start_soon(self._init_typedb)
+            taskgroup.start_soon(self._init_qdrant)
+
+    async def _init_typedb(self) -> None:
         async with self.dataaccessor_typedb as connection_typedb:
-            connection_typedb.create_database()
-            logger.info(
-                "Created TypeDB database ({name_database}).",
-                name_database=self.configuration.name_database,
-            )
+            if await connection_typedb.create_database():
+                logger.info(
+                    "Created TypeDB database ({name_database}).",
+                    name_database=self.configuration.name_database,
+                )
             with as_file(files(knowledgeplatformmanagement_han).joinpath("schema.tql")) as path_file_query_schema:
-                await connection_typedb.create_schema(
+                is_defined = await connection_typedb.create_schema(
                     path_file_schema=Path(path_file_query_schema),
                 )
-            logger.info(
-                "Wrote the schema to the TypeDB database ({name_database}).",
-                name_database=self.configuration.name_database,
-            )
+            if is_defined:
+                logger.info(
+                    "Wrote the schema to the TypeDB database ({name_database}).",
+                    name_database=self.configuration.name_database,
+                )
+
+    async def _init_qdrant(self) -> None:
         async with self.dataaccessor_qdrant as connection_qdrant:
             await connection_qdrant.create_collection()
 
-    async def persist(self) -> None:
-        async with self.dataaccessor_qdrant as connection_qdrant:
-            # TODO: Lock storage for writes after insertions, in production.
-            await connection_qdrant.insert_typeqlthings(typeqlthings=self.datasinks.documents.populate())
-            await connection_qdrant.insert_typeqlthings(typeqlthings=self.datasinks.microsoft365.populate())
-            await connection_qdrant.insert_typeqlthings(
-                typeqlthings=self.datasinks.ubwfris.populate(),
+    async def persist(self, *, sources: Collection[Source] = frozenset(Source)) -> None:
+        """Persists all things added to or changed in the datasinks of `sources` since their last successful persist.
+        Persists run one at a time, since concurrent ones would persist the same things.
+
+        Things are marked as committed to TypeDB as each commit succeeds, so if the persist fails, the next one doesn't
+        insert them again."""
+        async with self._lock_persist:
+            datasinks = [self.datasinks[source] for source in self.SOURCES_PERSIST if source in sources]
+            deltas = [datasink.get_delta() for datasink in datasinks]
+            # Snapshot the things on the event loop, since they're persisted from worker threads, while requests may
+            # change the datasinks meanwhile.
+            datasink_and_deltaitems = [
+                (datasink, deltaitem)
+                for datasink, delta in zip(datasinks, deltas, strict=True)
+                for deltaitem in datasink.get_deltaitems(delta=delta)
+            ]
+
+            def mark_committed(positions: Iterable[int]) -> None:
+                for position in positions:
+                    datasink, deltaitem = datasink_and_deltaitems[position]
+                    datasink.mark_committed(deltaitems=(deltaitem,))
+
+            await self.persistengine.persist(
+                on_committed=mark_committed,
+                persistitems=[
+                    Persistitem(
+                        typeqlthing=deltaitem.trackeditem.value,
+                        is_committed=deltaitem.is_committed,
+                        is_replacing=deltaitem.trackeditem.is_replacing,
+                    )
+                    for _, deltaitem in datasink_and_deltaitems
+                ],
             )
+            for datasink, delta in zip(datasinks, deltas, strict=True):
+                datasink.mark_persisted(delta=delta)
+
+    def _get_bundle(self) -> Bundle:
+        return Bundle.in_dir(self.configuration.paths._path_dir_bundles / self.configuration.name_database)
+
+    async def export_bundle(self) -> None:
+        """Exports all things in the datasinks to a TypeQL bundle, which can be loaded into TypeDB by
+        `load_bundle()`, without rendering the things again."""
+        # Snapshot the things on the event loop, like `persist()` does.
+        typeqlthings = list(chain.from_iterable(self.datasinks[source].populate() for source in self.SOURCES_PERSIST))
+        await to_thread.run_sync(partial(write_bundle, bundle=self._get_bundle(), typeqlthings=typeqlthings))
+
+    async def load_bundle(self) -> None:
+        """Loads the TypeQL bundle written by `export_bundle()` into the TypeDB database. Doesn't touch the Qdrant
+        collection, nor what the datasinks consider persisted."""
         async with self.dataaccessor_typedb as connection_typedb:
-            await connection_typedb.insert_typeqlthings(typeqlthings=self.datasinks.documents.populate())
-            await connection_typedb.insert_typeqlthings(typeqlthings=self.datasinks.microsoft365.populate())
-            await connection_typedb.insert_typeqlthings(typeqlthings=self.datasinks.ubwfris.populate())
+            await connection_typedb.load_bundle(bundle=self._get_bundle())
 
     async def clear(self) -> None:
         """Clears all data stores configured in this data layer. Destructive!"""
         async with self.dataaccessor_typedb as connection_typedb:
-            connection_typedb.delete_database()
+            await connection_typedb.delete_database()
+            for source in self.SOURCES_PERSIST:
+                self.datasinks[source].mark_unpersisted()
             logger.info(
                 "Deleted TypeDB database ({name_database}).",
                 name_database=self.configuration.name_database,
             )
         async with self.dataaccessor_qdrant as connection_qdrant:
-            await connection_qdrant._asyncqdrantclient.delete_collection(
-                collection_name=self.configuration.name_database,
-            )
+            await connection_qdrant.delete_collection()
             logger.info(
                 "Deleted Qdrant collection ({name_database}).",
                 name_database=self.configuration.name_database,
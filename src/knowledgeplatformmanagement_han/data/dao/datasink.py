@@ -1,11 +1,234 @@
 from abc import abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import islice
+from threading import Lock
+from typing import Any, NamedTuple, NoReturn, Protocol, Self
 
 from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing
 
 
-# This declares a slim interface.
-# pylint: disable-next=too-few-public-methods
+class TrackedUntrackedChangeError(TypeError):
+    def __init__(self, *, name_method: str, tracked: object) -> None:
+        super().__init__(
+            f"`{type(tracked).__name__}.{name_method}()` can't be tracked, since removing and reordering things isn't "
+            "persisted.",
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class Trackeditem[T]:
+    """A value in a tracked container, with the generation in which it was set."""
+
+    generation: int
+    is_replacing: bool
+    """Whether the value replaced another one for the same key, which may have been persisted already."""
+    value: T
+
+
+class Tracked[T](Protocol):
+    """A container that counts changes to it in a generation, so the values changed between two generations can be
+    retrieved without scanning the whole container."""
+
+    @property
+    def generation(self) -> int: ...
+
+    def items_between(self, *, generation_start: int, generation_end: int) -> Iterator[Trackeditem[T]]:
+        """Yields the values last set after `generation_start`, up to and including `generation_end`."""
+        ...
+
+
+class Trackeddict[K, V](dict[K, V]):
+    """A `dict` that tracks in which generation each key was last set to a new or different value. Values can be set,
+    but not removed."""
+
+    def __init__(self, mapping: Mapping[K, V] | None = None) -> None:
+        super().__init__()
+        self.generation = 0
+        # Ordered by generation, because a key is moved to the end whenever it's set.
+        self._key_to_generation: dict[K, int] = {}
+        self._keys_replaced: set[K] = set()
+        self.update(mapping or {})
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key not in self or self[key] != value:
+            if key in self:
+                self._keys_replaced.add(key)
+            self.generation += 1
+            self._key_to_generation.pop(key, None)
+            self._key_to_generation[key] = self.generation
+        super().__setitem__(key, value)
+
+    def __ior__(self, other: Mapping[K, V], /) -> Self:  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def setdefault(self, key: K, default: V) -> V:  # type: ignore[override]
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: V) -> None:  # type: ignore[override]  # noqa: ANN401
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def _raise_untracked(self, *_: object, name_method: str) -> NoReturn:
+        raise TrackedUntrackedChangeError(name_method=name_method, tracked=self)
+
+    def __delitem__(self, key: K) -> NoReturn:
+        self._raise_untracked(name_method="__delitem__")
+
+    def clear(self) -> NoReturn:
+        self._raise_untracked(name_method="clear")
+
+    def pop(self, *_: object) -> NoReturn:  # type: ignore[override]
+        self._raise_untracked(name_method="pop")
+
+    def popitem(self) -> NoReturn:
+        self._raise_untracked(name_method="popitem")
+
+    def items_between(self, *, generation_start: int, generation_end: int) -> Iterator[Trackeditem[V]]:
+        keys = []
+        for key, generation in reversed(self._key_to_generation.items()):
+            if generation <= generation_start:
+                break
+            if generation <= generation_end:
+                keys.append(key)
+        return (
+            Trackeditem(
+                generation=self._key_to_generation[key],
+                is_replacing=key in self._keys_replaced,
+                value=self[key],
+            )
+            for key in reversed(keys)
+        )
+
+
+class Trackedlist[T](list[T]):
+    """A `list` whose generation is its length. Items can be appended, but not replaced, removed or reordered."""
+
+    @property
+    def generation(self) -> int:
+        return len(self)
+
+    def items_between(self, *, generation_start: int, generation_end: int) -> Iterator[Trackeditem[T]]:
+        values = islice(self, generation_start, generation_end)
+        return (
+            Trackeditem(generation=generation, is_replacing=False, value=value)
+            for generation, value in enumerate(values, start=generation_start + 1)
+        )
+
+    def _raise_untracked(self, *_: object, name_method: str) -> NoReturn:
+        raise TrackedUntrackedChangeError(name_method=name_method, tracked=self)
+
+    def __delitem__(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="__delitem__")
+
+    def __imul__(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="__imul__")
+
+    def __setitem__(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="__setitem__")
+
+    def clear(self) -> NoReturn:
+        self._raise_untracked(name_method="clear")
+
+    def insert(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="insert")
+
+    def pop(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="pop")
+
+    def remove(self, *_: object) -> NoReturn:
+        self._raise_untracked(name_method="remove")
+
+    def reverse(self) -> NoReturn:
+        self._raise_untracked(name_method="reverse")
+
+    def sort(self, *_: object, **__: object) -> NoReturn:
+        self._raise_untracked(name_method="sort")
+
+
+class Delta(NamedTuple):
+    """The generations of the tracked containers of a datasink between which their values changed."""
+
+    generations_end: tuple[int, ...]
+    generations_start: tuple[int, ...]
+
+
+class Deltaitem(NamedTuple):
+    """A thing in the delta of a datasink, with where it's tracked."""
+
+    index_tracked: int
+    is_committed: bool
+    """Whether the thing was committed to TypeDB by an earlier persist, which failed later on."""
+    trackeditem: Trackeditem[TypeqlThing]
+
+
 class Datasink:
+    def __init__(self) -> None:
+        self._generations_persisted: tuple[int, ...] | None = None
+        # The generations of things committed to TypeDB by persists that failed later on, so they aren't inserted again.
+        self._index_tracked_to_generations_committed: dict[int, set[int]] = {}
+        self._lock_committed = Lock()
+
     @abstractmethod
-    def populate(self) -> Generator[TypeqlThing, None]: ...
+    def get_trackeds(self) -> tuple[Tracked[TypeqlThing], ...]:
+        """Returns the containers of all things in this datasink, in the order they must be persisted in."""
+
+    def get_delta(self) -> Delta:
+        """Returns the delta of all things added or changed since the last successful persist."""
+        generations_end = tuple(tracked.generation for tracked in self.get_trackeds())
+        return Delta(
+            generations_end=generations_end,
+            generations_start=self._generations_persisted or (0,) * len(generations_end),
+        )
+
+    def get_deltaitems(self, *, delta: Delta | None = None) -> list[Deltaitem]:
+        """Returns the things in `delta`, or all things if it's `None`. Call it on the event loop, so the datasink
+        doesn't change meanwhile."""
+        trackeds = self.get_trackeds()
+        delta = delta or Delta(
+            generations_end=tuple(tracked.generation for tracked in trackeds),
+            generations_start=(0,) * len(trackeds),
+        )
+        with self._lock_committed:
+            return [
+                Deltaitem(
+                    index_tracked=index_tracked,
+                    is_committed=trackeditem.generation
+                    in self._index_tracked_to_generations_committed.get(index_tracked, ()),
+                    trackeditem=trackeditem,
+                )
+                for index_tracked, (tracked, generation_start, generation_end) in enumerate(
+                    zip(trackeds, delta.generations_start, delta.generations_end, strict=True),
+                )
+                for trackeditem in tracked.items_between(
+                    generation_start=generation_start,
+                    generation_end=generation_end,
+                )
+            ]
+
+    def mark_committed(self, *, deltaitems: Iterable[Deltaitem]) -> None:
+        """Marks `deltaitems` as committed to TypeDB, so that later persists don't insert them again, even if the
+        current one fails. Thread-safe."""
+        with self._lock_committed:
+            for deltaitem in deltaitems:
+                self._index_tracked_to_generations_committed.setdefault(deltaitem.index_tracked, set()).add(
+                    deltaitem.trackeditem.generation,
+                )
+
+    def mark_persisted(self, *, delta: Delta) -> None:
+        with self._lock_committed:
+            self._generations_persisted = delta.generations_end
+            self._index_tracked_to_generations_committed.clear()
+
+    def mark_unpersisted(self) -> None:
+        with self._lock_committed:
+            self._generations_persisted = None
+            self._index_tracked_to_generations_committed.clear()
+
+    def populate(self, *, delta: Delta | None = None) -> Generator[TypeqlThing, None]:
+        """Yields the things in `delta`, or all things if it's `None`."""
+        for deltaitem in self.get_deltaitems(delta=delta):
+            yield deltaitem.trackeditem.value
@@ -1,15 +1,20 @@
 from collections import ChainMap
-from collections.abc import Generator
-from itertools import chain
 from typing import Final
 from uuid import UUID
 
-from knowledgeplatformmanagement_generic.data.services.typedb.typeql import TypeqlThing
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import Key, TypeqlThing
 from loguru import logger
 from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 
 from knowledgeplatformmanagement_han.data.dao.dataqualityissue import Dataqualityissue
-from knowledgeplatformmanagement_han.data.dao.datasink import Datasink
+from knowledgeplatformmanagement_han.data.dao.datasink import (
+    Datasink,
+    Delta,
+    Deltaitem,
+    Tracked,
+    Trackeddict,
+    Trackedlist,
+)
 from knowledgeplatformmanagement_han.data.model.compositionproject import CompositionProject
 from knowledgeplatformmanagement_han.data.model.educationalproject import Educationalproject
 from knowledgeplatformmanagement_han.data.model.learningcommunity import Learningcommunity
@@ -28,21 +33,21 @@ from knowledgeplatformmanagement_han.data.model.unclearproject import Unclearpro
 from knowledgeplatformmanagement_han.settings.timesheets import ConfigurationTimesheets
 
 
-# This implements a slim interface and is a dataclass-like type.
-# pylint: disable-next=too-few-public-methods, too-many-instance-attributes
+# This is a dataclass-like type.
+# pylint: disable-next=too-many-instance-attributes
 class DatasinkUbwfris(Datasink):
     def __init__(self) -> None:
-        self.compositionprojects: list[CompositionProject] = []
+        super().__init__()
         self.configurationtimesheets = ConfigurationTimesheets()
-        self.id_to_educationalproject: dict[str, Educationalproject] = {}
-        self.id_to_learningcommunity: dict[str, Learningcommunity] = {}
-        self.id_to_operationalproject: dict[str, Operationalproject] = {}
-        self.id_to_personubwfris: dict[str, PersonUbwfris] = {}
-        self.id_to_researchproject: dict[str, Researchproject] = {}
-        self.id_to_school: dict[str, School] = {}
-        self.id_to_strategicpartnership: dict[str, Strategicpartnership] = {}
-        self.id_to_subproject: dict[str, Subproject] = {}
-        self.id_to_unclearproject: dict[str, Unclearproject] = {}
+        self.id_to_educationalproject: Trackeddict[str, Educationalproject] = Trackeddict()
+        self.id_to_learningcommunity: Trackeddict[str, Learningcommunity] = Trackeddict()
+        self.id_to_operationalproject: Trackeddict[str, Operationalproject] = Trackeddict()
+        self.id_to_personubwfris: Trackeddict[str, PersonUbwfris] = Trackeddict()
+        self.id_to_researchproject: Trackeddict[str, Researchproject] = Trackeddict()
+        self.id_to_school: Trackeddict[str, School] = Trackeddict()
+        self.id_to_strategicpartnership: Trackeddict[str, Strategicpartnership] = Trackeddict()
+        self.id_to_subproject: Trackeddict[str, Subproject] = Trackeddict()
+        self.id_to_unclearproject: Trackeddict[str, Unclearproject] = Trackeddict()
         # See https://github.com/python/typeshed/issues/8430.
         self.id_to_projectlike: Final[ChainMap[str, Projectlikes]] = ChainMap(
             self.id_to_subproject,  # type: ignore[arg-type]
@@ -53,35 +58,55 @@ class DatasinkUbwfris(Datasink):
             self.id_to_strategicpartnership,  # type: ignore[arg-type]
             self.id_to_unclearproject,  # type: ignore[arg-type]
         )
-        self.participationinternals: list[Participationinternal] = []
+        # Relations lack a key of their own, so they're keyed by their role players, so that uploading a workbook
+        # again doesn't add them again.
+        self.keys_to_compositionproject: Trackeddict[
+            tuple[Key[Projectlike], Key[Subproject]],
+            CompositionProject,
+        ] = Trackeddict()
+        self.keys_to_participationinternal: Trackeddict[
+            tuple[Key[Projectlike], Key[School], Key[School] | None],
+            Participationinternal,
+        ] = Trackeddict()
+        self.keys_to_projectmanagement: Trackeddict[
+            tuple[Key[Subproject], Key[PersonUbwfris]],
+            Projectmanagement,
+        ] = Trackeddict()
         self.uuid_to_persons_missing: dict[UUID, list[str]] = {}
-        self.projectmanagements: list[Projectmanagement] = []
         # TODO: Since we don't have unique timesheet IDs, we can't deduplicate them, so we can't use a set.
-        self.timesheets: list[Timesheet] = []
+        self.timesheets: Trackedlist[Timesheet] = Trackedlist()
         self.uuid_to_dataqualityissues: dict[UUID, list[Dataqualityissue]] = {}
         self.uuid_to_worksheet: dict[UUID, ReadOnlyWorksheet] = {}
 
-    def populate(self) -> Generator[TypeqlThing, None]:
-        things = chain(
-            self.id_to_personubwfris.values(),
-            self.id_to_school.values(),
-            self.id_to_projectlike.values(),
+    def get_trackeds(self) -> tuple[Tracked[TypeqlThing], ...]:
+        return (
+            self.id_to_personubwfris,
+            self.id_to_school,
+            self.id_to_subproject,
+            self.id_to_educationalproject,
+            self.id_to_learningcommunity,
+            self.id_to_operationalproject,
+            self.id_to_researchproject,
+            self.id_to_strategicpartnership,
+            self.id_to_unclearproject,
             self.timesheets,
-            self.compositionprojects,
-            self.projectmanagements,
-            self.participationinternals,
+            self.keys_to_compositionproject,
+            self.keys_to_projectmanagement,
+            self.keys_to_participationinternal,
         )
+
+    def get_deltaitems(self, *, delta: Delta | None = None) -> list[Deltaitem]:
         logger.debug(
             "The UBW FRIS datasink now contains (with count): {personubwfris} ({n_personubwfriss}), {school} "
             "({n_schools}), {projectlike} ({n_projectlikes}), {timesheet} ({n_timesheets}), {compositionproject} "
             "({n_compositions}), {projectmanagement} ({n_projectmanagements}) and {participationinternal} "
             "({n_participationinternals}) ...",
             compositionproject=CompositionProject.model_config["title"],
-            n_compositions=len(self.compositionprojects),
-            n_participationinternals=len(self.participationinternals),
+            n_compositions=len(self.keys_to_compositionproject),
+            n_participationinternals=len(self.keys_to_participationinternal),
             n_personubwfriss=len(self.id_to_personubwfris.values()),
             n_projectlikes=len(self.id_to_projectlike.values()),
-            n_projectmanagements=len(self.projectmanagements),
+            n_projectmanagements=len(self.keys_to_projectmanagement),
             n_schools=len(self.id_to_school.values()),
             n_timesheets=len(self.timesheets),
             participationinternal=Participationinternal.model_config["title"],
@@ -91,4 +116,4 @@ class DatasinkUbwfris(Datasink):
             school=School.model_config["title"],
             timesheet=Timesheet.model_config["title"],
         )
-        yield from things
+        return super().get_deltaitems(delta=delta)
@@ -1,6 +1,10 @@
+from typing import cast
+
+from knowledgeplatformmanagement_han.data.dao.datasink import Datasink
 from knowledgeplatformmanagement_han.data.dao.datasink_documents import DatasinkDocuments
 from knowledgeplatformmanagement_han.data.dao.datasink_microsoft365 import DatasinkMicrosoft365
 from knowledgeplatformmanagement_han.data.dao.datasink_ubwfris import DatasinkUbwfris
+from knowledgeplatformmanagement_han.data.model.provenant import Source
 
 
 # This is a dataclass-like type, so custom public methods aren't expected.
@@ -19,3 +23,6 @@ class Datasinks:
         self.documents = documents
         self.microsoft365 = microsoft365
         self.ubwfris = ubwfris
+
+    def __getitem__(self, source: Source) -> Datasink:
+        return cast(Datasink, getattr(self, source.value))
@@ -1,4 +1,4 @@
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import ClassVar
 
 from knowledgeplatformmanagement_generic.data.extract.documents.document import (
@@ -196,7 +196,7 @@ class ExtractorPartner:
                     table_str = Proposal.normalize_string(text=table.to_markdown(), keep_newlines=True)
                     # TODO: Is this replace needed, and if so, can this be done among other replaces at a single time?
                     text = " ".join(cell.strip().replace("-", "").replace(":", "") for cell in table_str.split(sep="|"))
-                    text_tokenized = proposal._language_to_nermodel[proposal.language](text)
+                    text_tokenized = proposal.tokenize(text)
                     words = frozenset({token.text.replace("-", " ") for token in text_tokenized if token.is_alpha})
                     entitysource.partnertable.update(
                         (partner, None)
@@ -322,15 +322,39 @@ class ExtractorPartner:
         proposal: Proposal,
     ) -> Entitysource | None:
         """
-        Main pipeline method that processes a Research Proposal.
+        Main pipeline method that processes a Research Proposal. Prefer `run_all()` for many Research Proposals.
 
         Args:
             proposal: The Research Proposal.
         """
-        sectiontitle_selected_to_flatsection = proposal.extract_texts_and_tables_selected(
-            sectiontitles_selected=self._sectiontitles_selected,
-        )
-        return self._from_all(
-            proposal=proposal,
-            sectiontitle_selected_to_flatsection=sectiontitle_selected_to_flatsection,
-        )
+        (entitysource,) = self.run_all(proposals=(proposal,))
+        return entitysource
+
+    def run_all(
+        self,
+        *,
+        proposals: Sequence[Proposal],
+    ) -> list[Entitysource | None]:
+        """
+        Processes many Research Proposals, performing NER on them in batches across proposals rather than one by one.
+
+        Args:
+            proposals: The Research Proposals.
+        """
+        sectiontitle_selected_to_flatsections = [
+            proposal.extract_texts_and_tables_selected(sectiontitles_selected=self._sectiontitles_selected)
+            for proposal in proposals
+        ]
+        if not self._do_exclude_entities_unknown and proposals:
+            Proposal.perform_ner_documents(zip(proposals, sectiontitle_selected_to_flatsections, strict=True))
+        return [
+            self._from_all(
+                proposal=proposal,
+                sectiontitle_selected_to_flatsection=sectiontitle_selected_to_flatsection,
+            )
+            for proposal, sectiontitle_selected_to_flatsection in zip(
+                proposals,
+                sectiontitle_selected_to_flatsections,
+                strict=True,
+            )
+        ]
@@ -1,4 +1,5 @@
 from collections.abc import AsyncGenerator, Iterator
+from itertools import batched
 from typing import override
 
 from docling_core.types.doc.document import Uint64
@@ -44,24 +45,27 @@ class ExtractorProposal(Extractor[ExtractProposal]):
         # TODO: Don't fetch documents anew, but pass in-memory objects.
         hashvalues_document: Iterator[Uint64],
     ) -> AsyncGenerator[ExtractProposal | PipelineDocumentsConversionFailedError, None]:
-        """From Proposals, extract the relevant details."""
-        async with self._dataacccessor_qdrant as connection_qdrant:
-            async for doclingdocument in (
-                await connection_qdrant.fetch_full_document(hashvalue_document=hashvalue_proposal)
-                for hashvalue_proposal in hashvalues_document
-            ):
-                if doclingdocument:
-                    assert doclingdocument.origin
-                    hashvalue_proposal = doclingdocument.origin.binary_hash
-                    proposal = Proposal(
-                        configuration=self._pipelinedocuments.configuration,
-                        doclingdocument=doclingdocument,
-                    )
-                    partners = self.extractorpartner.run(proposal=proposal)
-                    yield ExtractProposal(
-                        projectname=proposal.projectname,
-                        hashvalue_proposal=hashvalue_proposal,
-                        partners=partners,
-                    )
-                else:
+        """From Proposals, extract the relevant details. The partners are extracted from `ner_size_batch_documents`
+        Proposals at a time, so that NER is performed on them in batches across Proposals."""
+        configuration = self._pipelinedocuments.configuration
+        for hashvalues_proposal in batched(hashvalues_document, configuration.ner_size_batch_documents):
+            async with self._dataacccessor_qdrant as connection_qdrant:
+                doclingdocuments = await connection_qdrant.fetch_full_documents(hashvalues_document=hashvalues_proposal)
+            proposals = []
+            for hashvalue_proposal, doclingdocument in zip(hashvalues_proposal, doclingdocuments, strict=True):
+                if not doclingdocument:
                     raise ExtractorProposalNotfoundError(hashvalue_proposal=hashvalue_proposal)
+                proposals.append(Proposal(configuration=configuration, doclingdocument=doclingdocument))
+            for hashvalue_proposal, proposal, partners in zip(
+                hashvalues_proposal,
+                proposals,
+                self.extractorpartner.run_all(proposals=proposals),
+                strict=True,
+            ):
+                extractproposal = ExtractProposal(
+                    projectname=proposal.projectname,
+                    hashvalue_proposal=hashvalue_proposal,
+                    partners=partners,
+                )
+                proposal.release()
+                yield extractproposal
@@ -1,29 +1,24 @@
+from functools import cached_property
 from typing import ClassVar
 
-# TODO: See https://github.com/DS4SD/docling/issues/614
-from docling_core.types.doc import DoclingDocument  # type: ignore[attr-defined]
 from knowledgeplatformmanagement_generic.data.extract.documents.document import Document
-from knowledgeplatformmanagement_generic.settings import Configuration
 from loguru import logger
 
 
 class Proposal(Document):
     LENGTH_MINIMAL_PROJECTNAME: ClassVar[int] = 3
 
-    def __init__(self, *, configuration: Configuration, doclingdocument: DoclingDocument) -> None:
-        super().__init__(configuration=configuration, doclingdocument=doclingdocument)
-        self.projectname: str | None
-        self._extract_projectname()
-        self.summarize()
+    @cached_property
+    def projectname(self) -> str | None:
+        return self._extract_projectname()
 
-    def _extract_projectname(self) -> None:
+    def _extract_projectname(self) -> str | None:
         """
         Extract the Project name from a Research Project Proposal using the first non-summary, non-structural section
         title. Otherwise, use the text on the frontpage.
         """
         if not (sectiontitles := tuple(self.sectiontitle_to_flatsection.keys())):
-            self.projectname = None
-            return
+            return None
         if (
             # The number two is logical, since `sectiontitles[1]` is accessed.
             len(sectiontitles) >= 2  # noqa: PLR2004
@@ -45,8 +40,7 @@ class Proposal(Document):
             )
         ):
             logger.debug("Extracting project name ‘{}’ from first section heading.", sectiontitle_projectname)
-            self.projectname = sectiontitle_projectname or None
-            return
+            return sectiontitle_projectname or None
         # Guess that the first text on the front page is the project name.
         if text_frontpage := self.sectiontitle_to_flatsection[sectiontitles[0]].text:
             paragraph_first, _, _ = text_frontpage.partition("\n")
@@ -56,8 +50,7 @@ class Proposal(Document):
                     "text.",
                     paragraph_first,
                 )
-                self.projectname = paragraph_first or None
-                return
+                return paragraph_first or None
         line_first = self.text_full.partition("\n")[0].strip()
         projectname = line_first if len(line_first) > self.LENGTH_MINIMAL_PROJECTNAME else None
         logger.debug(
@@ -66,4 +59,4 @@ class Proposal(Document):
             "none.",
             projectname,
         )
-        self.projectname = projectname or None
+        return projectname or None
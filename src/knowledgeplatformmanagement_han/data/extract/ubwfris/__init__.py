@@ -384,12 +384,14 @@ class Ubwfris:
         if (projectmanager := self.datasink.id_to_personubwfris.get(namelike_id_employee_manager)) and (
             subproject := self.datasink.id_to_subproject.get(namelike_id_ubw_subproject)
         ):
-            self.datasink.projectmanagements.append(
-                Projectmanagement(
-                    projectmanager=projectmanager.to_key(),
-                    managedsubproject=subproject.to_key(),
-                ),
+            projectmanagement = Projectmanagement(
+                projectmanager=projectmanager.to_key(),
+                managedsubproject=subproject.to_key(),
             )
+            self.datasink.keys_to_projectmanagement[
+                projectmanagement.managedsubproject,
+                projectmanagement.projectmanager,
+            ] = projectmanagement
 
     def _add_person(self, rowrha025a: RowRHA025A) -> None:
         namelike_first, namelike_last = Ubwfris._parse_name_person(name_person=rowrha025a.naammedewerker)
@@ -410,12 +412,14 @@ class Ubwfris:
                 rowrha025a.deelprojectid,
             )
         ):
-            self.datasink.compositionprojects.append(
-                CompositionProject(
-                    overarchingproject=overarchingproject.to_key(),
-                    projectpart=subproject.to_key(),
-                ),
+            compositionproject = CompositionProject(
+                overarchingproject=overarchingproject.to_key(),
+                projectpart=subproject.to_key(),
             )
+            self.datasink.keys_to_compositionproject[
+                compositionproject.overarchingproject,
+                compositionproject.projectpart,
+            ] = compositionproject
 
     def _add_project(self, row: RowRHA025A | RowIB630 | RowIB630Withoutbooked) -> None:
         if row.projectid in self.datasink.id_to_projectlike:
@@ -542,7 +546,11 @@ class Ubwfris:
                     leadingcomponent=leadingcomponent,
                     partnercomponent=partnercomponent,
                 )
-            self.datasink.participationinternals.append(participationinternal)
+            self.datasink.keys_to_participationinternal[
+                participationinternal.internallycooperatingcomponents,
+                participationinternal.leadingcomponent,
+                participationinternal.partnercomponent,
+            ] = participationinternal
 
     def _add_hours(self, row: RowIB630 | RowIB630Withoutbooked | RowRHA025A, uuid: UUID) -> None:
         if isinstance(row, RowRHA025A):
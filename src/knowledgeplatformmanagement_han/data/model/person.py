@@ -10,7 +10,7 @@ class Person(TypeqlThingEntity):
 
     model_config = ConfigDict(frozen=True, title="person")
 
-    # TODO: Should be a key.
-    address_email: EmailStr = Field(title="e-mail address")
+    # The schema's key of persons, which also identifies them in Microsoft 365, but not in UBW FRIS.
+    address_email: Annotated[EmailStr, "key"] = Field(title="e-mail address")
     namelike_first: Annotated[str, StringConstraints(min_length=1)] = Field(title="first name")
     namelike_last: Annotated[str, StringConstraints(min_length=1)] = Field(title="last name")
@@ -1,11 +1,13 @@
+from functools import partial
 from os import environ
 
-from anyio import run
+from anyio import run, to_thread
 from asapi import bind, serve
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from knowledgeplatformmanagement_generic.data.extract.documents.document import Document
 from knowledgeplatformmanagement_generic.data.extract.documents.pipeline.documents.pipeline_documents import (
     PipelineDocuments,
 )
@@ -121,7 +123,19 @@ async def main() -> None:
         microsoft365graph=microsoft365graph,
         ubwfris=ubwfris,
     )
-    await serve(app=fastapi, port=configuration.port)
+    # Load the NLP models before serving, rather than while answering the first request about a document.
+    await to_thread.run_sync(partial(Document.warm, configuration=configuration))
+    if await dataaccessor_qdrant.poolqdrant.check_health():
+        # Fail before serving, rather than while answering the first search, if the collection must be rebuilt.
+        async with dataaccessor_qdrant as connection_qdrant:
+            await connection_qdrant.check_collection()
+    else:
+        logger.warning("Qdrant isn't reachable at {url_qdrant} yet.", url_qdrant=configuration.url_qdrant)
+    try:
+        await serve(app=fastapi, port=configuration.port)
+    finally:
+        await dataaccessor_qdrant.poolqdrant.close()
+        dataaccessor_typedb.pooltypedb.close()
 
 
 if __name__ == "__main__":
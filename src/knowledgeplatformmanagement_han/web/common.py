@@ -1,7 +1,8 @@
-from asapi import Injected
+from asapi import FromPath, Injected
 from fastapi import APIRouter, Response, status
 
 from knowledgeplatformmanagement_han.data.dao.datalayer import Datalayer
+from knowledgeplatformmanagement_han.data.model.provenant import Source
 
 router = APIRouter()
 
@@ -31,3 +32,31 @@ async def persist(
 ) -> Response:
     await datalayer.persist()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/persist/{source}")
+async def persist_source(
+    *,
+    datalayer: Injected[Datalayer],
+    source: FromPath[Source],
+) -> Response:
+    await datalayer.persist(sources=(source,))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/bundle/export")
+async def export_bundle(
+    *,
+    datalayer: Injected[Datalayer],
+) -> Response:
+    await datalayer.export_bundle()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/bundle/load")
+async def load_bundle(
+    *,
+    datalayer: Injected[Datalayer],
+) -> Response:
+    await datalayer.load_bundle()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
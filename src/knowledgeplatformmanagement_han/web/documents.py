@@ -127,7 +127,9 @@ async def extract_partners(
     if doclingdocument:
         proposal = Proposal(configuration=configuration, doclingdocument=doclingdocument)
         # TODO: Parameterize extractorpartner.
-        if entitysource := documents.extractorpartner.run(proposal=proposal):
+        entitysource = documents.extractorpartner.run(proposal=proposal)
+        proposal.release()
+        if entitysource:
             for entity in chain(
                 entitysource.ner_text,
                 entitysource.ner_title,
@@ -0,0 +1,85 @@
+from os import utime
+from pathlib import Path
+
+from knowledgeplatformmanagement_generic.data.extract.documents.document.cache_ner import Cachener, Entitiescached
+
+LANGUAGE = "nl"
+NAME_MODEL = "spacy/nl_core_news_lg"
+
+
+class _Performer:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def __call__(self, texts: list[str]) -> list[Entitiescached]:
+        self.texts.extend(texts)
+        return [tuple(("ORG", word) for word in text.split() if word.isupper()) for text in texts]
+
+
+def test_cache_ner(*, tmp_path: Path) -> None:
+    performer = _Performer()
+    cachener = Cachener(n_entries_max=2, n_entries_max_disk=8, path_dir=tmp_path)
+    texts = ["De HAN en ABC.", "Geen partners.", "De HAN en ABC."]
+    entitiesscached = cachener.perform(texts, language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert entitiesscached == [(("ORG", "HAN"), ("ORG", "ABC.")), (), (("ORG", "HAN"), ("ORG", "ABC."))]
+    # Each distinct text is performed once.
+    assert performer.texts == ["De HAN en ABC.", "Geen partners."]
+    assert (cachener.n_hits_disk, cachener.n_hits_memory, cachener.n_misses) == (0, 0, 3)
+    # Texts that normalize alike share an entry, …
+    assert cachener.perform([" De  HAN en ABC. "], language=LANGUAGE, name_model=NAME_MODEL, perform=performer) == [
+        (("ORG", "HAN"), ("ORG", "ABC.")),
+    ]
+    assert cachener.n_hits_memory == 1
+    # … since NER is performed on the normalized text.
+    cachener.perform(["Ook  HAN."], language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert performer.texts[-1] == "Ook HAN."
+    # Another model or language has entries of its own.
+    cachener.perform(["Geen partners."], language="en", name_model=NAME_MODEL, perform=performer)
+    assert performer.texts[-1] == "Geen partners."
+    assert cachener.n_misses == 5
+    assert cachener.ratio_hits == 1 / 6
+    # The least recently used entry was dropped from memory, but is kept on disk, also for a new cache.
+    for cachener_disk, n_hits_disk_expected in (
+        (cachener, 1),
+        (Cachener(n_entries_max=2, n_entries_max_disk=8, path_dir=tmp_path), 1),
+    ):
+        assert cachener_disk.perform(
+            ["Geen partners."],
+            language=LANGUAGE,
+            name_model=NAME_MODEL,
+            perform=performer,
+        ) == [()]
+        assert cachener_disk.n_hits_disk == n_hits_disk_expected
+    assert len(performer.texts) == 4
+    assert not list(tmp_path.glob("**/*.partial"))
+
+
+def test_cache_ner_memory() -> None:
+    performer = _Performer()
+    cachener = Cachener(n_entries_max=1, n_entries_max_disk=1, path_dir=None)
+    for text in ("HAN", "ABC", "HAN"):
+        cachener.perform([text], language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert performer.texts == ["HAN", "ABC", "HAN"]
+    assert cachener.ratio_hits == 0.0
+
+
+
+def test_cache_ner_eviction(*, tmp_path: Path) -> None:
+    performer = _Performer()
+    cachener = Cachener(n_entries_max=1, n_entries_max_disk=4, path_dir=tmp_path)
+    texts = [f"Partner {index}." for index in range(5)]
+    for index, text in enumerate(texts[:4]):
+        cachener.perform([text], language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+        # Date the entry just written, since file modification times may be coarser than the time between writes.
+        for path_file in tmp_path.glob("*/*.json"):
+            if path_file.stat().st_mtime_ns > len(texts) * 10**9:
+                utime(path_file, ns=(index * 10**9, index * 10**9))
+    # Reading the oldest entry from disk uses it, …
+    cachener.perform(texts[:1], language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert cachener.n_hits_disk == 1
+    # … so writing a fifth one evicts the next oldest ones instead.
+    cachener.perform(texts[4:], language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert len(list(tmp_path.glob("*/*.json"))) == 3
+    performer.texts.clear()
+    cachener.perform(texts, language=LANGUAGE, name_model=NAME_MODEL, perform=performer)
+    assert performer.texts == texts[1:3]
@@ -0,0 +1,87 @@
+# TODO: See https://github.com/DS4SD/docling/issues/614
+from docling_core.types.doc import DocItemLabel, DoclingDocument, TableCell, TableData  # type: ignore[attr-defined]
+from pytest import fixture, mark, param
+
+from knowledgeplatformmanagement_generic.data.extract.documents.document import Document, Entities, Entity
+from knowledgeplatformmanagement_generic.settings import Configuration
+
+
+def _to_tablecell(text: str, *, index_column: int, index_row: int) -> TableCell:
+    return TableCell(
+        column_header=index_row == 0,
+        end_col_offset_idx=index_column + 1,
+        end_row_offset_idx=index_row + 1,
+        start_col_offset_idx=index_column,
+        start_row_offset_idx=index_row,
+        text=text,
+    )
+
+
+@fixture(name="doclingdocument", scope="function")
+def fixture_doclingdocument() -> DoclingDocument:
+    doclingdocument = DoclingDocument(name="proposal")
+    doclingdocument.add_heading(text="Projecttitel")
+    doclingdocument.add_text(label=DocItemLabel.TEXT, text="Een project over kennisplatformen.")
+    doclingdocument.add_heading(text="Samenvatting")
+    doclingdocument.add_text(label=DocItemLabel.TEXT, text="Dit is de  samenvatting van het project.")
+    doclingdocument.add_heading(text="Partners")
+    rows = (("Partner", "Rol"), ("HAN", "Penvoerder"), ("ABC", "Partner"))
+    doclingdocument.add_table(
+        data=TableData(
+            num_cols=2,
+            num_rows=len(rows),
+            table_cells=[
+                _to_tablecell(text, index_column=index_column, index_row=index_row)
+                for index_row, row in enumerate(rows)
+                for index_column, text in enumerate(row)
+            ],
+        ),
+    )
+    return doclingdocument
+
+
+def test_document_staged(*, configuration: Configuration, doclingdocument: DoclingDocument) -> None:
+    document = Document(configuration=configuration, doclingdocument=doclingdocument)
+    assert document.summary == "Dit is de samenvatting van het project.\n"
+    assert tuple(document.sectiontitle_to_flatsection) == ("Projecttitel", "Samenvatting", "Partners")
+    # Neither the language nor the tokens are needed for the summary and sections.
+    assert not {"language", "text_full", "text_tokenized"} & vars(document).keys()
+    flatsection = document.sectiontitle_to_flatsection["Partners"]
+    assert "tables" not in vars(flatsection)
+    assert tuple(flatsection.tables[0].columns) == ("Partner", "Rol")
+    assert "tables" in vars(flatsection)
+    document.release()
+    assert "tables" not in vars(flatsection)
+    assert document.summary == "Dit is de samenvatting van het project.\n"
+
+
+@mark.parametrize(
+    "text,length_max,chunks_expected",
+    [
+        param("ab\ncd\nefgh", 3, ["ab\n", "cd\n", "efg", "h"], id="line_breaks_and_overlong_line"),
+        param("ab\ncd", 16, ["ab\ncd"], id="short"),
+        param("", 16, [""], id="empty"),
+    ],
+)
+def test_chunk(*, chunks_expected: list[str], length_max: int, text: str) -> None:
+    assert Document._chunk(text, length_max=length_max) == chunks_expected
+
+
+def test_perform_ner_documents(*, configuration: Configuration, doclingdocument: DoclingDocument) -> None:
+    documents = [Document(configuration=configuration, doclingdocument=doclingdocument) for _ in range(2)]
+    Document.perform_ner_documents((document, document.sectiontitle_to_flatsection) for document in documents)
+    # Batched NER, without the components that NER doesn't depend on, finds the same entities as the full pipeline does
+    # text by text.
+    nermodel = Document._get_ner_model(configuration=configuration, language=documents[0].language)
+
+    def to_entities(text: str) -> Entities:
+        return {Entity(entitytype=span.label_, value=span.text): None for span in nermodel(text).ents}
+
+    for document in documents:
+        assert document.sectiontitle_to_entities_title == {
+            sectiontitle: to_entities(sectiontitle) for sectiontitle in document.sectiontitle_to_flatsection
+        }
+        assert document.sectiontitle_to_entities_text == {
+            sectiontitle: to_entities(flatsection.text)
+            for sectiontitle, flatsection in document.sectiontitle_to_flatsection.items()
+        }
@@ -0,0 +1,112 @@
+from pathlib import Path
+from time import perf_counter
+from unicodedata import category, normalize
+
+from docling.datamodel.document import DoclingDocument  # type: ignore[attr-defined]
+from hypothesis import example, given, settings
+from hypothesis.strategies import booleans, characters, sampled_from, text
+from loguru import logger
+from pytest import mark, param
+
+from knowledgeplatformmanagement_generic.data.extract.documents.document import normalizer
+from knowledgeplatformmanagement_generic.data.extract.documents.pipeline.documents.pipeline_documents import (
+    PipelineDocuments,
+)
+from knowledgeplatformmanagement_generic.settings import Configuration
+
+N_REPETITIONS = 8
+SLOWDOWN_TOLERATED = 1.5
+"""How many times as long as the reference the normalizer may take, so that timing noise alone can't fail it."""
+
+
+def _normalize_string_reference(*, text: str, keep_newlines: bool = False) -> str:
+    """The original implementation of `Document.normalize_string()`, per character."""
+    return ("\n" if keep_newlines else " ").join(
+        character
+        for character in " ".join(
+            character
+            for character in "".join(
+                character if category(character) != "Zl" else "\n"
+                for character in normalize("NFKC", text.replace("\t", " "))
+                if character in (" ", "\n")
+                or category(character) not in {"B", "Cc", "Cf", "Cn", "Co", "Cs", "Zp", "Zs"}
+            ).split(sep=" ")
+            if character
+        ).split(sep="\n")
+        if character
+    )
+
+
+@mark.parametrize(
+    "text,keep_newlines,text_expected",
+    [
+        param(" Project\t\tplan \n\n\n  HAN ", True, "Project plan \n HAN", id="whitespace"),
+        param(" Project\t\tplan \n\n\n  HAN ", False, "Project plan   HAN", id="whitespace_newlines"),
+        param("\ufb01nance\u00a0\u00b2\u200bx", False, "finance 2x", id="nfkc_noisy"),
+        param("a\u2028b\u2029c", True, "a\nbc", id="separators"),
+    ],
+)
+def test_normalize_string(*, keep_newlines: bool, text: str, text_expected: str) -> None:
+    assert normalizer.normalize_string(text, keep_newlines=keep_newlines) == text_expected
+
+
+@given(
+    text=text(
+        alphabet=sampled_from(["\t", "\n", " ", "\u00a0", "\u2028", "\u2029", "\u200b", "\x00", "\ufb01", "a"])
+        | characters(),
+    ),
+    keep_newlines=booleans(),
+)
+@example(text=" \n \n", keep_newlines=True)
+@example(text="\u2028 \u2028", keep_newlines=False)
+# The first example builds the pattern of noisy characters.
+@settings(deadline=None)
+def test_normalize_string_equivalent(*, keep_newlines: bool, text: str) -> None:
+    assert normalizer.normalize_string(text, keep_newlines=keep_newlines) == _normalize_string_reference(
+        text=text,
+        keep_newlines=keep_newlines,
+    )
+
+
+def test_normalize_string_benchmark_real(*, configuration: Configuration) -> None:
+    assert configuration.paths.path_dir_testdata is not None
+    path_dir_document = Path(configuration.paths.path_dir_testdata) / "documents"
+    pipelinedocuments = PipelineDocuments(configuration=configuration)
+    texts = [
+        doclingdocument.export_to_markdown()
+        for doclingdocument in pipelinedocuments.produce_doclingdocuments(
+            sources=[
+                path_file
+                for path_file in path_dir_document.glob("**/*.*")
+                if path_file.is_file() and path_file.suffix in {".docx", ".html", ".md", ".pdf", ".pptx"}
+            ],
+        )
+        if isinstance(doclingdocument, DoclingDocument)
+    ]
+    assert texts
+    # Builds the pattern of noisy characters beforehand, which happens once per process.
+    normalizer.normalize_string("")
+    name_implementation_to_duration: dict[str, float] = {}
+    for name_implementation, normalize_string in {
+        "reference": lambda text, keep_newlines: _normalize_string_reference(text=text, keep_newlines=keep_newlines),
+        "normalizer": normalizer.normalize_string,
+    }.items():
+        time_start = perf_counter()
+        for _ in range(N_REPETITIONS):
+            for text_document in texts:
+                normalize_string(text_document, keep_newlines=True)
+        name_implementation_to_duration[name_implementation] = perf_counter() - time_start
+    logger.info(
+        "Normalized {n_characters} characters of {n_documents} documents {n_repetitions} times in "
+        "{duration_reference:.2f} s by the reference, and in {duration_normalizer:.2f} s by the normalizer "
+        "({speedup:.1f}×).",
+        duration_normalizer=name_implementation_to_duration["normalizer"],
+        duration_reference=name_implementation_to_duration["reference"],
+        n_characters=sum(len(text_document) for text_document in texts),
+        n_documents=len(texts),
+        n_repetitions=N_REPETITIONS,
+        speedup=name_implementation_to_duration["reference"] / name_implementation_to_duration["normalizer"],
+    )
+    assert name_implementation_to_duration["normalizer"] < (
+        SLOWDOWN_TOLERATED * name_implementation_to_duration["reference"]
+    )
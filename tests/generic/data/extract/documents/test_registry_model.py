@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+from knowledgeplatformmanagement_generic.data.extract.documents.registry_model import (
+    Framework,
+    Keymodel,
+    Registrymodel,
+)
+
+N_THREADS = 8
+
+
+def test_get_loads_once() -> None:
+    registrymodel = Registrymodel()
+    key = Keymodel(framework=Framework.SPACY, language="nl", name="nl_core_news_lg")
+    n_loads = 0
+
+    def load() -> list[int]:
+        nonlocal n_loads
+        n_loads += 1
+        # Slow, like loading a model, so that the threads wait for it concurrently.
+        sleep(0.1)
+        return [0] * 8
+
+    with ThreadPoolExecutor(max_workers=N_THREADS) as threadpoolexecutor:
+        models = list(
+            threadpoolexecutor.map(lambda _: registrymodel.get(key, load=load, sizeof=len), range(N_THREADS)),
+        )
+    assert n_loads == 1
+    assert all(model is models[0] for model in models)
+    registrymodel.get(
+        Keymodel(framework=Framework.LINGUA, language=None, name="en,nl"),
+        load=lambda: "languagedetector",
+    )
+    # The size of models without `sizeof` is unknown, and not accounted for.
+    assert registrymodel.get_size_total() == 8
+    assert len(registrymodel.get_key_to_entrymodel()) == 2
@@ -0,0 +1,35 @@
+from knowledgeplatformmanagement_generic.data.services.qdrant.bm25 import (
+    to_index,
+    to_sparsevector_document,
+    to_sparsevector_query,
+    tokenize,
+)
+
+
+def test_tokenize() -> None:
+    assert tokenize("Project P-2024-005, by Partner B.V.") == [
+        "project",
+        "p-2024-005",
+        "p",
+        "2024",
+        "005",
+        "by",
+        "partner",
+        "b.v",
+        "b",
+        "v",
+    ]
+
+
+def test_to_sparsevector_document() -> None:
+    sparsevector = to_sparsevector_document("partner partner project")
+    index_to_value = dict(zip(sparsevector.indices, sparsevector.values, strict=True))
+    value_partner, value_project = index_to_value[to_index("partner")], index_to_value[to_index("project")]
+    # Repeated tokens weigh more, but less than proportionally.
+    assert value_project < value_partner < 2 * value_project
+
+
+def test_to_sparsevector_query() -> None:
+    sparsevector = to_sparsevector_query("partner partner project")
+    assert sparsevector.indices == [to_index("partner"), to_index("project")]
+    assert sparsevector.values == [1.0, 1.0]
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from numpy import array, float32
+from numpy.typing import NDArray
+
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
+
+
+def _encode(texts: list[str]) -> NDArray[float32]:
+    return array([[len(text), 1.0] for text in texts], dtype=float32)
+
+
+def test_cacheembedding(tmp_path: Path) -> None:
+    cacheembedding = Cacheembedding(dimension=2, n_entries_max=2, name_model="model", path_dir=tmp_path)
+    assert cacheembedding.encode(["a", "bb"], encode=_encode, task="passage").tolist() == [[1, 1], [2, 1]]
+    assert (cacheembedding.n_hits, cacheembedding.n_misses) == (0, 2)
+    # Use "a" more recently than "bb", so that "ccc" evicts "bb".
+    assert cacheembedding.encode(["a"], encode=_encode, task="passage").tolist() == [[1, 1]]
+    cacheembedding.encode(["ccc"], encode=_encode, task="passage")
+    assert (cacheembedding.n_hits, cacheembedding.n_misses) == (1, 3)
+    cacheembedding.flush()
+    cacheembedding_reopened = Cacheembedding(dimension=2, n_entries_max=2, name_model="model", path_dir=tmp_path)
+    assert cacheembedding_reopened.encode(
+        ["ccc", "a", "bb"],
+        encode=_encode,
+        task="passage",
+    ).tolist() == [[3, 1], [1, 1], [2, 1]]
+    assert (cacheembedding_reopened.n_hits, cacheembedding_reopened.n_misses) == (2, 1)
+    # The task is part of the key.
+    cacheembedding_reopened.encode(["a"], encode=_encode, task="query")
+    assert cacheembedding_reopened.n_misses == 2
+    # A different configuration discards the cache.
+    cacheembedding_other = Cacheembedding(dimension=2, n_entries_max=2, name_model="other", path_dir=tmp_path)
+    cacheembedding_other.encode(["a"], encode=_encode, task="passage")
+    assert (cacheembedding_other.n_hits, cacheembedding_other.n_misses) == (0, 1)
+    # Each occurrence of a text counts, even if the text is encoded once.
+    cacheembedding_other.encode(["dddd", "dddd", "dddd", "a"], encode=_encode, task="passage")
+    assert (cacheembedding_other.n_hits, cacheembedding_other.n_misses) == (1, 4)
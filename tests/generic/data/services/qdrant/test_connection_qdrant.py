@@ -0,0 +1,302 @@
+from pathlib import Path
+from typing import Any, cast
+
+from docling.chunking import BaseChunker  # type: ignore[attr-defined]
+from docling.datamodel.document import DoclingDocument  # type: ignore[attr-defined]
+from numpy import array, float32
+from numpy.typing import NDArray
+from pytest import mark, raises
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointStruct, ScoredPoint, VectorParams
+from sentence_transformers import SentenceTransformer
+
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
+from knowledgeplatformmanagement_generic.data.services.qdrant.connection_qdrant import (
+    ConnectionQdrant,
+    ConnectionQdrantCollectionOutdatedError,
+    Kindpoint,
+    to_id_point,
+    to_vectors,
+)
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.store_document import Storedocument
+from knowledgeplatformmanagement_generic.settings import Configuration
+
+
+class _ModelencoderStandin:
+    """Encodes a text as its length, and records the batches it encoded."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    @staticmethod
+    def get_sentence_embedding_dimension() -> int:
+        return 1
+
+    def encode(self, texts: list[str], **_kwargs: Any) -> NDArray[float32]:
+        self.batches.append(texts)
+        return array([[len(text)] for text in texts], dtype=float32)
+
+
+def test_encode_texts(tmp_path: Path) -> None:
+    model_encoder = _ModelencoderStandin()
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=Configuration(encoder_size_batch=2),
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, model_encoder),
+        poolqdrant=cast(PoolQdrant, None),
+        storedocument=cast(Storedocument, None),
+    )
+    texts = ["a", "aaaa", "aa", "aaaaa", "aaa"]
+    vectors = connection_qdrant._encode_texts(texts=texts)
+    # Batched by length, …
+    assert model_encoder.batches == [["aaaaa", "aaaa"], ["aaa", "aa"], ["a"]]
+    # … yet returned in order.
+    assert vectors[:, 0].tolist() == [1, 4, 2, 5, 3]
+    # Cached texts aren't encoded again.
+    assert connection_qdrant._encode_texts(texts=["aaaaaa", "aaa"])[:, 0].tolist() == [6, 3]
+    assert model_encoder.batches[3:] == [["aaaaaa"]]
+
+
+@mark.anyio
+async def test_fetch_full_documents(tmp_path: Path) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-test")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    storedocument = Storedocument(n_documents_cached=1, path_dir=tmp_path / "documents")
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path / "cache"),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, _ModelencoderStandin()),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=storedocument,
+    )
+    await connection_qdrant.create_collection()
+    hashvalue = "12345678901234567890"
+    storedocument.put(DoclingDocument(name="document"), hashvalue=hashvalue)
+    await asyncqdrantclient.upsert(
+        collection_name=configuration.name_database,
+        points=[
+            PointStruct(
+                id=to_id_point(hashvalue),
+                payload={
+                    "hashvalue": hashvalue,
+                    "kind": Kindpoint.FULLDOCUMENT,
+                    "mediatype": "application/pdf",
+                    "name_file": "document.pdf",
+                },
+                vector={},
+            ),
+            PointStruct(
+                id=to_id_point("Some text."),
+                payload={"hashvalue": hashvalue, "kind": Kindpoint.CHUNK, "text": "Some text."},
+                vector=[1.0],
+            ),
+        ],
+    )
+    assert await connection_qdrant.check_document_already_inserted(hashvalue=hashvalue)
+    assert await connection_qdrant.check_documents_already_inserted(hashvalues=[hashvalue, "1"]) == {hashvalue}
+    doclingdocument, doclingdocument_missing = await connection_qdrant.fetch_full_documents(
+        hashvalues_document=[int(hashvalue), 1],
+    )
+    assert doclingdocument
+    assert doclingdocument.origin
+    assert (doclingdocument.name, doclingdocument.origin.binary_hash) == ("document", int(hashvalue))
+    assert doclingdocument_missing is None
+    # Documents are fetched from the document store's cache as copies, so modifying one doesn't affect the next.
+    doclingdocument.name = "modified"
+    (doclingdocument,) = await connection_qdrant.fetch_full_documents(hashvalues_document=[int(hashvalue)])
+    assert doclingdocument
+    assert doclingdocument.name == "document"
+    hashvalue_to_doclingdocument = await connection_qdrant.hydrate(
+        scoredpoints=[
+            ScoredPoint(id=to_id_point("Some text."), payload={"hashvalue": hashvalue}, score=1.0, version=0),
+            ScoredPoint(id=to_id_point("Other text."), payload={"hashvalue": hashvalue}, score=0.5, version=0),
+        ],
+    )
+    assert list(hashvalue_to_doclingdocument) == [hashvalue]
+    # Full document points inserted before the document store existed keep their document in their payload.
+    hashvalue_payload = "98765432109876543210"
+    await asyncqdrantclient.upsert(
+        collection_name=configuration.name_database,
+        points=[
+            PointStruct(
+                id=to_id_point(hashvalue_payload),
+                payload={
+                    "doclingdocument": DoclingDocument(name="document in payload").export_to_dict(),
+                    "hashvalue": hashvalue_payload,
+                    "kind": Kindpoint.FULLDOCUMENT,
+                    "mediatype": "application/pdf",
+                    "name_file": "document.pdf",
+                },
+                vector={},
+            ),
+        ],
+    )
+    (doclingdocument,) = await connection_qdrant.fetch_full_documents(hashvalues_document=[int(hashvalue_payload)])
+    assert doclingdocument
+    assert doclingdocument.name == "document in payload"
+    # It's moved into the document store.
+    assert storedocument.has(hashvalue_payload)
+    (record,) = await asyncqdrantclient.retrieve(
+        collection_name=configuration.name_database,
+        ids=[to_id_point(hashvalue_payload)],
+    )
+    assert record.payload
+    assert "doclingdocument" not in record.payload
+    await asyncqdrantclient.close()
+
+
+@mark.anyio
+async def test_fetch_query_vectors_hybrid(tmp_path: Path) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-test")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, _ModelencoderStandin()),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    await connection_qdrant.create_collection()
+    texts = [f"Some text about {topic}." for topic in ("energy", "health", "mobility", "water")]
+    texts.append("Project P-2024-005 is funded.")
+    await asyncqdrantclient.upsert(
+        collection_name=configuration.name_database,
+        points=[
+            PointStruct(
+                id=to_id_point(text),
+                payload={"hashvalue": "1", "kind": Kindpoint.CHUNK, "text": text},
+                vector=to_vectors(array([1.0], dtype=float32), text=text),
+            )
+            for text in texts
+        ],
+    )
+    # The stand-in encoder can't tell the texts apart, so only the sparse search ranks the exact match first.
+    (scoredpoint, *_) = await connection_qdrant.fetch_query_vectors(limit=3, query="P-2024-005")
+    assert scoredpoint.payload
+    assert scoredpoint.payload["text"] == texts[-1]
+    # Only the payload fields to show a hit by are fetched.
+    assert set(scoredpoint.payload) == {"hashvalue", "kind", "text"}
+    await asyncqdrantclient.close()
+
+
+@mark.anyio
+async def test_fetch_query_vectors_batch(tmp_path: Path) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-test")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    model_encoder = _ModelencoderStandin()
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, model_encoder),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    await connection_qdrant.create_collection()
+    await connection_qdrant.insert_sentences(sentences=["Some person exists.", "Some project exists."])
+    model_encoder.batches.clear()
+    results = await connection_qdrant.fetch_query_vectors_batch(
+        limit=1,
+        queries=["Some person", " Some  person ", "Some project"],
+    )
+    # Sentences are retrievable by neither, …
+    assert results == [[], [], []]
+    # … but the queries differing only in whitespace are encoded once, and all in a single call.
+    assert model_encoder.batches == [["Some person", "Some project"]]
+    await connection_qdrant.fetch_query_vectors(limit=1, query="Some project")
+    assert len(model_encoder.batches) == 1
+    await asyncqdrantclient.close()
+
+
+@mark.anyio
+async def test_fetch_query_documents(tmp_path: Path) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-test")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, _ModelencoderStandin()),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    await connection_qdrant.create_collection()
+    await asyncqdrantclient.upsert(
+        collection_name=configuration.name_database,
+        points=[
+            PointStruct(
+                id=to_id_point(text),
+                payload={"hashvalue": hashvalue, "kind": Kindpoint.CHUNK, "text": text},
+                vector=to_vectors(array([1.0], dtype=float32), text=text),
+            )
+            for hashvalue in ("1", "2")
+            for text in (f"Chunk {index} of proposal {hashvalue}." for index in range(4))
+        ],
+    )
+    pointgroups = await connection_qdrant.fetch_query_documents(limit=4, query="proposal", size_group=2)
+    # One group per document, rather than many chunks of the same one.
+    assert sorted(str(pointgroup.id) for pointgroup in pointgroups) == ["1", "2"]
+    assert all(len(pointgroup.hits) == 2 for pointgroup in pointgroups)
+    await asyncqdrantclient.close()
+
+
+@mark.anyio
+async def test_create_collection_outdated(tmp_path: Path) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-test")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=Cacheembedding(dimension=1, n_entries_max=8, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(SentenceTransformer, _ModelencoderStandin()),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    assert not await connection_qdrant.check_collection()
+    assert await connection_qdrant.create_collection()
+    assert await connection_qdrant.check_collection()
+    assert not await connection_qdrant.create_collection()
+    # Collections created by earlier versions lack the sparse vector and the payload index of the point kind.
+    await connection_qdrant.delete_collection()
+    await asyncqdrantclient.create_collection(
+        collection_name=configuration.name_database,
+        vectors_config=VectorParams(distance=Distance.COSINE, size=1),
+    )
+    with raises(ConnectionQdrantCollectionOutdatedError, match="Rebuild required"):
+        await connection_qdrant.create_collection()
+    await asyncqdrantclient.close()
@@ -0,0 +1,110 @@
+from pathlib import Path
+from time import perf_counter
+from typing import cast
+
+from docling.chunking import BaseChunker  # type: ignore[attr-defined]
+from loguru import logger
+from numpy import float32, zeros
+from pytest import fixture, mark
+from qdrant_client import AsyncQdrantClient
+from sentence_transformers import SentenceTransformer
+
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
+from knowledgeplatformmanagement_generic.data.services.qdrant.bm25 import to_sparsevector_document
+from knowledgeplatformmanagement_generic.data.services.qdrant.connection_qdrant import (
+    ConnectionQdrant,
+    iterate_vectors,
+)
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.store_document import Storedocument
+from knowledgeplatformmanagement_generic.settings import Configuration
+
+NAME_MODEL_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
+"""A small encoder model, so the benchmark runs on a CPU in seconds."""
+N_SENTENCES = 1_000
+SHORTFALL_ALLOWED = 2
+"""By which factor a throughput may fall short of the one it improves on, which absorbs scheduling jitter."""
+
+
+@fixture(name="model_encoder", scope="module")
+def fixture_model_encoder() -> SentenceTransformer:
+    return SentenceTransformer(model_name_or_path=NAME_MODEL_ENCODER, device="cpu")
+
+
+@fixture(name="sentences", scope="module")
+def fixture_sentences() -> list[str]:
+    return [
+        f"Some person exists, with first name ‘John’, last name ‘Doe {index}’, employee ID ‘{index}’, and a "
+        f"full-time equivalent percentage ‘{index % 100}’."
+        for index in range(N_SENTENCES)
+    ]
+
+
+@mark.anyio
+async def test_insert_sentences_benchmark(
+    *,
+    model_encoder: SentenceTransformer,
+    sentences: list[str],
+    tmp_path: Path,
+) -> None:
+    configuration = Configuration(name_database="knowledgeplatform-benchmark")
+    asyncqdrantclient = AsyncQdrantClient(location=":memory:")
+    cacheembedding = Cacheembedding(
+        dimension=model_encoder.get_sentence_embedding_dimension() or 0,
+        n_entries_max=N_SENTENCES,
+        name_model=NAME_MODEL_ENCODER,
+        path_dir=tmp_path,
+    )
+    connection_qdrant = ConnectionQdrant(
+        cacheembedding=cacheembedding,
+        # Inserting sentences doesn't chunk.
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=model_encoder.get_max_seq_length() or 256,
+        model_encoder=model_encoder,
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    await connection_qdrant.create_collection()
+    time_start = perf_counter()
+    for sentence in sentences:
+        model_encoder.encode(sentence, task="retrieval.passage")
+    throughput_encode_single = N_SENTENCES / (perf_counter() - time_start)
+    time_start = perf_counter()
+    await connection_qdrant.insert_sentences(sentences=sentences)
+    throughput_insert = N_SENTENCES / (perf_counter() - time_start)
+    time_start = perf_counter()
+    await connection_qdrant.insert_sentences(sentences=sentences)
+    throughput_insert_cached = N_SENTENCES / (perf_counter() - time_start)
+    # The conversion takes as long whatever the values of the vectors are.
+    vectors_dense = zeros((N_SENTENCES, cacheembedding.dimension), dtype=float32)
+    sparsevectors = [to_sparsevector_document(sentence) for sentence in sentences]
+    time_start = perf_counter()
+    for _ in iterate_vectors(vectors_dense, sparsevectors=sparsevectors):
+        pass
+    throughput_convert = N_SENTENCES / (perf_counter() - time_start)
+    logger.info(
+        "Encoded {throughput_encode_single:.0f} sentences/s one by one, inserted {throughput_insert:.0f} "
+        "sentences/s encoded {encoder_size_batch} at a time, re-inserted {throughput_insert_cached:.0f} "
+        "sentences/s from the embedding cache, and converted the dense vectors of {throughput_convert:.0f} "
+        "sentences/s to lists to upload them.",
+        encoder_size_batch=configuration.encoder_size_batch,
+        throughput_convert=throughput_convert,
+        throughput_encode_single=throughput_encode_single,
+        throughput_insert=throughput_insert,
+        throughput_insert_cached=throughput_insert_cached,
+    )
+    # Encoding in batches makes up for uploading, and the embedding cache for encoding. Converting the vectors to
+    # lists takes a small part of inserting.
+    assert throughput_insert * SHORTFALL_ALLOWED > throughput_encode_single
+    assert throughput_insert_cached * SHORTFALL_ALLOWED > throughput_insert
+    assert throughput_convert > SHORTFALL_ALLOWED * throughput_insert_cached
+    # Re-inserting unchanged sentences doesn't encode any.
+    assert (cacheembedding.n_hits, cacheembedding.n_misses) == (N_SENTENCES, N_SENTENCES)
+    assert (await asyncqdrantclient.count(collection_name=configuration.name_database)).count == N_SENTENCES
+    await asyncqdrantclient.close()
@@ -0,0 +1,158 @@
+from pathlib import Path
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import Any, cast
+
+from anyio import fail_after, sleep
+from docling.chunking import BaseChunker  # type: ignore[attr-defined]
+from loguru import logger
+from numpy import argpartition, float32, linalg, stack
+from numpy.random import default_rng
+from numpy.typing import NDArray
+from pytest import fixture, mark
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import CollectionStatus
+from sentence_transformers import SentenceTransformer
+
+from knowledgeplatformmanagement_generic.data.services.qdrant.cache_embedding import Cacheembedding
+from knowledgeplatformmanagement_generic.data.services.qdrant.connection_qdrant import ConnectionQdrant, Kindpoint
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+from knowledgeplatformmanagement_generic.data.services.qdrant.store_document import Storedocument
+from knowledgeplatformmanagement_generic.settings import Configuration
+from knowledgeplatformmanagement_generic.settings.profile_collection import Fusion, Profilecollection, Quantization
+
+DIMENSION = 384
+LIMIT = 10
+N_CLUSTERS = 64
+N_POINTS = 32_768
+N_QUERIES = 256
+TIMEOUT_INDEXING = 300
+# Dense search only, as the synthetic corpus has no texts. A low indexing threshold, so that even the small segments
+# of the synthetic corpus are indexed.
+PROFILECOLLECTION_BASE = Profilecollection(fusion=Fusion.NONE, indexing_threshold=1_000)
+PROFILECOLLECTIONS = {
+    "float32-disk": PROFILECOLLECTION_BASE,
+    "float32-ram": PROFILECOLLECTION_BASE.model_copy(update={"on_disk": False}),
+    "int8-disk": PROFILECOLLECTION_BASE.model_copy(update={"quantization": Quantization.SCALAR}),
+    "binary-disk": PROFILECOLLECTION_BASE.model_copy(update={"quantization": Quantization.BINARY}),
+    "int8-disk-m32": PROFILECOLLECTION_BASE.model_copy(
+        update={"hnsw_ef_construct": 200, "hnsw_m": 32, "quantization": Quantization.SCALAR},
+    ),
+}
+
+
+class _ModelencoderStandin:
+    """Encodes a query as its synthetic vector."""
+
+    def __init__(self, query_to_vector: dict[str, NDArray[float32]]) -> None:
+        self.query_to_vector = query_to_vector
+
+    @staticmethod
+    def get_sentence_embedding_dimension() -> int:
+        return DIMENSION
+
+    def encode(self, queries: list[str], **_kwargs: Any) -> NDArray[float32]:
+        return stack([self.query_to_vector[query] for query in queries])
+
+
+def _normalize(vectors: NDArray[float32]) -> NDArray[float32]:
+    return vectors / linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@fixture(name="corpus", scope="module")
+def fixture_corpus() -> tuple[NDArray[float32], NDArray[float32]]:
+    """Clustered vectors, like embeddings of texts on a limited number of topics, and queries near them."""
+    generator = default_rng(seed=0)
+    centers = generator.normal(size=(N_CLUSTERS, DIMENSION)).astype(float32)
+    vectors = centers[generator.integers(N_CLUSTERS, size=N_POINTS)]
+    vectors += generator.normal(scale=0.5, size=vectors.shape).astype(float32)
+    queries = centers[generator.integers(N_CLUSTERS, size=N_QUERIES)]
+    queries += generator.normal(scale=0.5, size=queries.shape).astype(float32)
+    return _normalize(vectors), _normalize(queries)
+
+
+async def _wait_indexed(*, asyncqdrantclient: AsyncQdrantClient, name_collection: str) -> None:
+    with fail_after(TIMEOUT_INDEXING):
+        while True:
+            info = await asyncqdrantclient.get_collection(collection_name=name_collection)
+            if info.status == CollectionStatus.GREEN and (info.indexed_vectors_count or 0) >= N_POINTS:
+                return
+            await sleep(0.5)
+
+
+@mark.anyio
+@mark.parametrize("name_profilecollection", PROFILECOLLECTIONS)
+async def test_fetch_query_vectors_benchmark(
+    *,
+    configuration: Configuration,
+    corpus: tuple[NDArray[float32], NDArray[float32]],
+    name_profilecollection: str,
+    tmp_path: Path,
+) -> None:
+    vectors, queries = corpus
+    configuration = configuration.model_copy(
+        update={
+            "name_database": f"{configuration.name_database}-{name_profilecollection}",
+            "qdrant_profile": PROFILECOLLECTIONS[name_profilecollection],
+        },
+    )
+    asyncqdrantclient = AsyncQdrantClient(prefer_grpc=True, url=str(configuration.url_qdrant))
+    connection_qdrant = ConnectionQdrant(
+        # Too small to hold the queries, so that each is encoded.
+        cacheembedding=Cacheembedding(dimension=DIMENSION, n_entries_max=1, name_model="standin", path_dir=tmp_path),
+        chunker=cast(BaseChunker, None),
+        configuration=configuration,
+        length_chunk_max=256,
+        model_encoder=cast(
+            SentenceTransformer,
+            _ModelencoderStandin({str(index): query for index, query in enumerate(queries)}),
+        ),
+        poolqdrant=PoolQdrant(
+            factory_asyncqdrantclient=lambda: asyncqdrantclient,
+            interval_health=configuration.qdrant_interval_health,
+            n_operations_max=configuration.qdrant_n_operations_max,
+            timeout_health=configuration.qdrant_timeout_health,
+        ),
+        storedocument=Storedocument(n_documents_cached=0, path_dir=tmp_path),
+    )
+    await connection_qdrant.create_collection()
+    try:
+        time_start = perf_counter()
+        async with connection_qdrant.bulkload():
+            asyncqdrantclient.upload_collection(
+                batch_size=configuration.qdrant_size_batch,
+                collection_name=configuration.name_database,
+                ids=range(N_POINTS),
+                payload=({"hashvalue": str(index), "kind": Kindpoint.CHUNK} for index in range(N_POINTS)),
+                vectors=vectors,
+            )
+        await _wait_indexed(asyncqdrantclient=asyncqdrantclient, name_collection=configuration.name_database)
+        duration_load = perf_counter() - time_start
+        # By cosine similarity, since the vectors are normalized.
+        ids_exact = argpartition(-(queries @ vectors.T), LIMIT, axis=1)[:, :LIMIT]
+        latencies: list[float] = []
+        recalls: list[float] = []
+        for index, ids_exact_query in enumerate(ids_exact):
+            time_start = perf_counter()
+            scoredpoints = await connection_qdrant.fetch_query_vectors(limit=LIMIT, query=str(index))
+            latencies.append(perf_counter() - time_start)
+            ids = {scoredpoint.id for scoredpoint in scoredpoints}
+            recalls.append(len(ids & set(ids_exact_query.tolist())) / LIMIT)
+        logger.info(
+            "Profile {name_profilecollection}: loaded and indexed {n_points} points in {duration_load:.1f} s, and "
+            "fetched with a recall@{limit} of {recall:.3f}, a mean latency of {latency_mean:.4f} s and a 95th "
+            "percentile latency of {latency_p95:.4f} s.",
+            duration_load=duration_load,
+            latency_mean=mean(latencies),
+            latency_p95=quantiles(latencies, n=20)[-1],
+            limit=LIMIT,
+            n_points=N_POINTS,
+            name_profilecollection=name_profilecollection,
+            recall=mean(recalls),
+        )
+        # Binary quantization is only expected to be accurate for higher dimensions than these.
+        if configuration.qdrant_profile.quantization is not Quantization.BINARY:
+            assert mean(recalls) >= 0.9
+    finally:
+        await connection_qdrant.delete_collection()
+        await asyncqdrantclient.close()
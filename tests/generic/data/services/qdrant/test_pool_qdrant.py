@@ -0,0 +1,70 @@
+from typing import cast
+
+from anyio import Event, create_task_group, sleep
+from pytest import mark
+from qdrant_client import AsyncQdrantClient
+
+from knowledgeplatformmanagement_generic.data.services.qdrant.pool_qdrant import PoolQdrant
+
+
+class _AsyncqdrantclientStandin:
+    n_health_checks = 0
+
+    def __init__(self, *, is_healthy: bool = True) -> None:
+        self.is_closed = False
+        self.is_healthy = is_healthy
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+    async def get_collections(self) -> None:
+        _AsyncqdrantclientStandin.n_health_checks += 1
+        # Yield to the other callers, which must wait for this health check meanwhile.
+        await sleep(0.01)
+        if not self.is_healthy:
+            raise ConnectionError
+
+
+def _to_poolqdrant(asyncqdrantclients: list[_AsyncqdrantclientStandin]) -> PoolQdrant:
+    iterator = iter(asyncqdrantclients)
+    return PoolQdrant(
+        factory_asyncqdrantclient=lambda: cast(AsyncQdrantClient, next(iterator)),
+        interval_health=60,
+        n_operations_max=4,
+        timeout_health=1,
+    )
+
+
+@mark.anyio
+async def test_check_health_replaces_client_in_use() -> None:
+    asyncqdrantclient_unhealthy = _AsyncqdrantclientStandin(is_healthy=False)
+    asyncqdrantclient_healthy = _AsyncqdrantclientStandin()
+    poolqdrant = _to_poolqdrant([asyncqdrantclient_unhealthy, asyncqdrantclient_healthy])
+    async with poolqdrant.operation() as asyncqdrantclient:
+        assert asyncqdrantclient is asyncqdrantclient_unhealthy
+        assert not await poolqdrant.check_health()
+        # The operation still running through the unhealthy client can finish.
+        assert not asyncqdrantclient_unhealthy.is_closed
+        async with poolqdrant.operation() as asyncqdrantclient_next:
+            assert asyncqdrantclient_next is asyncqdrantclient_healthy
+    assert asyncqdrantclient_unhealthy.is_closed
+    assert not asyncqdrantclient_healthy.is_closed
+    await poolqdrant.close()
+    assert asyncqdrantclient_healthy.is_closed
+
+
+@mark.anyio
+async def test_check_health_due_serialized() -> None:
+    poolqdrant = _to_poolqdrant([_AsyncqdrantclientStandin()])
+    n_health_checks = _AsyncqdrantclientStandin.n_health_checks
+    event = Event()
+
+    async def check_health_due() -> None:
+        await event.wait()
+        await poolqdrant.check_health_due()
+
+    async with create_task_group() as taskgroup:
+        for _ in range(4):
+            taskgroup.start_soon(check_health_due)
+        event.set()
+    assert _AsyncqdrantclientStandin.n_health_checks == n_health_checks + 1
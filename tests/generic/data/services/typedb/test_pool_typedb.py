@@ -0,0 +1,110 @@
+from typing import cast
+
+from anyio import create_task_group, fail_after
+from pytest import mark, raises
+from typedb.driver import SessionType, TypeDBDriver, TypeDBDriverException
+
+from knowledgeplatformmanagement_generic.data.services.typedb.pool_typedb import PoolTypedb
+
+
+class _SessionStandin:
+    def close(self) -> None:
+        pass
+
+
+class _TypedbdriverStandin:
+    """Opens sessions into `name_database` only, and fails to connect at all after `disconnect()`."""
+
+    def __init__(self, name_database: str) -> None:
+        self.is_closed = False
+        self.is_connected = True
+        self.name_database = name_database
+
+    def close(self) -> None:
+        self.is_closed = True
+
+    def disconnect(self) -> None:
+        self.is_connected = False
+
+    def is_open(self) -> bool:
+        return not self.is_closed
+
+    def session(self, *, database_name: str, session_type: SessionType) -> _SessionStandin:
+        assert session_type is SessionType.DATA
+        if not self.is_connected:
+            raise TypeDBDriverException("[CXN01] Connection Error: Unable to connect to TypeDB server.")
+        if database_name != self.name_database:
+            raise TypeDBDriverException(f"[DBS01] Database Error: The database '{database_name}' does not exist.")
+        return _SessionStandin()
+
+
+def _to_pooltypedb(typedbdrivers: list[_TypedbdriverStandin]) -> PoolTypedb:
+    iterator = iter(typedbdrivers)
+    return PoolTypedb(
+        address="localhost:1729",
+        factory_typedbdriver=lambda _address: cast(TypeDBDriver, next(iterator)),
+        n_sessions_max=4,
+        n_threads=2,
+    )
+
+
+@mark.anyio
+async def test_invalidate_driver_in_use() -> None:
+    typedbdriver_replaced = _TypedbdriverStandin("test")
+    typedbdriver_next = _TypedbdriverStandin("test")
+    pooltypedb = _to_pooltypedb([typedbdriver_replaced, typedbdriver_next])
+    async with pooltypedb.session(database_name="test", session_type=SessionType.DATA):
+        assert pooltypedb.get_typedbdriver() is typedbdriver_replaced
+        pooltypedb.invalidate()
+        # The session still open through the replaced driver can finish.
+        assert not typedbdriver_replaced.is_closed
+        async with pooltypedb.session(database_name="test", session_type=SessionType.DATA):
+            assert pooltypedb.get_typedbdriver() is typedbdriver_next
+    assert typedbdriver_replaced.is_closed
+    assert not typedbdriver_next.is_closed
+    pooltypedb.close()
+    assert typedbdriver_next.is_closed
+
+
+@mark.anyio
+async def test_session_database_missing() -> None:
+    typedbdriver = _TypedbdriverStandin("test")
+    pooltypedb = _to_pooltypedb([typedbdriver])
+    async with pooltypedb.session(database_name="test", session_type=SessionType.DATA):
+        with raises(TypeDBDriverException, match="DBS01"):
+            async with pooltypedb.session(database_name="missing", session_type=SessionType.DATA):
+                pass
+        # The driver is usable, so neither it nor the session open through it are affected.
+        assert not typedbdriver.is_closed
+    assert pooltypedb.get_typedbdriver() is typedbdriver
+
+
+@mark.anyio
+async def test_session_disconnected() -> None:
+    typedbdriver_disconnected = _TypedbdriverStandin("test")
+    typedbdriver_disconnected.disconnect()
+    typedbdriver_next = _TypedbdriverStandin("test")
+    pooltypedb = _to_pooltypedb([typedbdriver_disconnected, typedbdriver_next])
+    async with pooltypedb.session(database_name="test", session_type=SessionType.DATA):
+        assert pooltypedb.get_typedbdriver() is typedbdriver_next
+    assert typedbdriver_disconnected.is_closed
+
+
+@mark.anyio
+async def test_sessions_concurrent() -> None:
+    pooltypedb = _to_pooltypedb([_TypedbdriverStandin("test")])
+    n_sessions_open: list[int] = []
+
+    async def open_sessions() -> None:
+        async with pooltypedb.sessions(
+            pooltypedb.n_sessions_max + 1,
+            database_name="test",
+            session_type=SessionType.DATA,
+        ) as sessions:
+            n_sessions_open.append(len(sessions))
+
+    with fail_after(5):
+        async with create_task_group() as taskgroup:
+            for _ in range(2):
+                taskgroup.start_soon(open_sessions)
+    assert n_sessions_open == [pooltypedb.n_sessions_max] * 2
@@ -0,0 +1,19 @@
+from anyio import create_memory_object_stream, create_task_group, to_thread
+from pytest import mark
+
+from knowledgeplatformmanagement_generic.asynctools import receive_from_thread
+
+
+@mark.anyio
+async def test_receive_from_thread() -> None:
+    sendstream, receivestream = create_memory_object_stream[list[int]](max_buffer_size=1)
+
+    async def send() -> None:
+        async with sendstream:
+            for index in range(0, 10, 2):
+                await sendstream.send([index, index + 1])
+
+    async with create_task_group() as taskgroup:
+        taskgroup.start_soon(send)
+        items = await to_thread.run_sync(lambda: list(receive_from_thread(receivestream)))
+    assert items == list(range(10))
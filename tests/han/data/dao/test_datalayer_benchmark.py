@@ -0,0 +1,133 @@
+from collections.abc import Iterator
+from time import perf_counter, sleep
+from types import TracebackType
+from typing import Any, Self, cast
+
+from knowledgeplatformmanagement_generic.data.services.llm.dataaccessor_llm import DataaccessorLlm
+from knowledgeplatformmanagement_generic.data.services.qdrant.dataaccessor_qdrant import DataaccessorQdrant
+from knowledgeplatformmanagement_generic.data.services.typedb.dataaccessor_typedb import DataaccessorTypedb
+from loguru import logger
+from pytest import mark
+from sentence_transformers import SentenceTransformer
+from typedb.driver import SessionType, TransactionType, TypeDBDriver
+
+from knowledgeplatformmanagement_han.data.dao.datalayer import Datalayer
+from knowledgeplatformmanagement_han.data.dao.datasink_documents import DatasinkDocuments
+from knowledgeplatformmanagement_han.data.dao.datasink_microsoft365 import DatasinkMicrosoft365
+from knowledgeplatformmanagement_han.data.dao.datasink_ubwfris import DatasinkUbwfris
+from knowledgeplatformmanagement_han.data.dao.datasinks import Datasinks
+from knowledgeplatformmanagement_han.settings import Configuration
+
+DURATION_CONNECT = 0.02
+N_CALLS = 20
+N_PERSONS = 100
+RATIO_LATENCY_MAX = 1.5
+"""The most the pooled latency may be relative to the unpooled one, with ample margin for a busy CI runner."""
+
+
+class _Standin:
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
+
+
+class _QueryStandin:
+    @staticmethod
+    def fetch(_query: str) -> Iterator[dict[str, Any]]:
+        for index in range(N_PERSONS):
+            yield {
+                "person": {
+                    "employmentcontract_ftepercentage": [{"value": 80}],
+                    "namelike_first": [{"value": "John"}],
+                    "namelike_id_employee": [{"value": str(index)}],
+                    "namelike_id_ubwcostcentre": [],
+                    "namelike_last": [{"value": f"Doe {index}"}],
+                },
+            }
+
+
+class _TransactionStandin(_Standin):
+    query = _QueryStandin()
+
+
+class _SessionStandin(_Standin):
+    @staticmethod
+    def transaction(_type_transaction: TransactionType) -> _TransactionStandin:
+        return _TransactionStandin()
+
+
+class _TypedbdriverStandin:
+    """Answers every fetch with the same persons, after taking as long to connect as a local TypeDB Core does."""
+
+    n_builds = 0
+
+    def __init__(self, _address: str) -> None:
+        sleep(DURATION_CONNECT)
+        self._is_open = True
+        _TypedbdriverStandin.n_builds += 1
+
+    def close(self) -> None:
+        self._is_open = False
+
+    def is_open(self) -> bool:
+        return self._is_open
+
+    @staticmethod
+    def session(*, database_name: str, session_type: SessionType) -> _SessionStandin:
+        assert database_name
+        assert session_type == SessionType.DATA
+        return _SessionStandin()
+
+
+async def _measure(datalayer: Datalayer, *, pooled: bool) -> float:
+    time_start = perf_counter()
+    for _ in range(N_CALLS):
+        if not pooled:
+            datalayer.dataaccessor_typedb.pooltypedb.invalidate()
+        assert len([exportpowerbiperson async for exportpowerbiperson in datalayer.export_powerbi_persons()]) == (
+            N_PERSONS
+        )
+    return (perf_counter() - time_start) / N_CALLS
+
+
+@mark.anyio
+async def test_export_powerbi_persons_benchmark() -> None:
+    configuration = Configuration()
+    datalayer = Datalayer(
+        configuration=configuration,
+        # The export doesn't use these.
+        dataaccessor_llm=cast(DataaccessorLlm, None),
+        dataaccessor_qdrant=cast(DataaccessorQdrant, None),
+        dataaccessor_typedb=DataaccessorTypedb(
+            configuration=configuration,
+            factory_typedbdriver=cast(type[TypeDBDriver], _TypedbdriverStandin),
+        ),
+        datasinks=Datasinks(
+            documents=DatasinkDocuments(),
+            microsoft365=DatasinkMicrosoft365(),
+            ubwfris=DatasinkUbwfris(),
+        ),
+        model_encoder=cast(SentenceTransformer, None),
+    )
+    latency_unpooled = await _measure(datalayer, pooled=False)
+    n_builds = _TypedbdriverStandin.n_builds
+    latency_pooled = await _measure(datalayer, pooled=True)
+    logger.info(
+        "Exported {n} persons in {latency_unpooled:.4f} s per call rebuilding the TypeDB driver every time, and in "
+        "{latency_pooled:.4f} s per call with a pooled TypeDB driver.",
+        latency_pooled=latency_pooled,
+        latency_unpooled=latency_unpooled,
+        n=N_PERSONS,
+    )
+    assert _TypedbdriverStandin.n_builds == n_builds
+    assert latency_pooled < RATIO_LATENCY_MAX * latency_unpooled
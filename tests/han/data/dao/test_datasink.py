@@ -0,0 +1,98 @@
+from pytest import raises
+
+from knowledgeplatformmanagement_han.data.dao.datasink import TrackedUntrackedChangeError, Trackeddict, Trackedlist
+from knowledgeplatformmanagement_han.data.dao.datasink_ubwfris import DatasinkUbwfris
+from knowledgeplatformmanagement_han.data.model.personubwfris import PersonUbwfris
+
+
+def test_trackeddict() -> None:
+    trackeddict = Trackeddict({"a": 1, "b": 2})
+    assert trackeddict.generation == 2
+    trackeddict["a"] = 1
+    assert trackeddict.generation == 2
+    trackeddict["c"] = 3
+    trackeddict["a"] = 4
+    assert trackeddict.generation == 4
+    assert [
+        (trackeditem.value, trackeditem.is_replacing)
+        for trackeditem in trackeddict.items_between(generation_start=2, generation_end=4)
+    ] == [(3, False), (4, True)]
+    assert [trackeditem.value for trackeditem in trackeddict.items_between(generation_start=0, generation_end=3)] == [
+        2,
+        3,
+    ]
+    # Other ways of setting values are tracked too.
+    trackeddict.update({"b": 5})
+    trackeddict |= {"d": 6}
+    assert trackeddict.setdefault("e", 7) == 7
+    assert trackeddict.setdefault("e", 8) == 7
+    assert trackeddict.generation == 7
+    for remove in (lambda: trackeddict.pop("a"), trackeddict.popitem, trackeddict.clear):
+        with raises(TrackedUntrackedChangeError):
+            remove()
+    with raises(TrackedUntrackedChangeError):
+        del trackeddict["a"]
+
+
+def test_trackedlist() -> None:
+    trackedlist = Trackedlist([1, 2])
+    trackedlist.append(3)
+    trackedlist += [4]
+    assert trackedlist.generation == 4
+    assert [
+        (trackeditem.generation, trackeditem.value)
+        for trackeditem in trackedlist.items_between(generation_start=1, generation_end=3)
+    ] == [(2, 2), (3, 3)]
+    for change in (lambda: trackedlist.insert(0, 0), trackedlist.pop, trackedlist.sort):
+        with raises(TrackedUntrackedChangeError):
+            change()
+    with raises(TrackedUntrackedChangeError):
+        trackedlist[0] = 0
+
+
+def _to_personubwfris(namelike_id_employee: str, *, namelike_last: str = "Doe") -> PersonUbwfris:
+    return PersonUbwfris(
+        address_email=f"test{namelike_id_employee}@localhost.localdomain",
+        namelike_first="John",
+        namelike_id_employee=namelike_id_employee,
+        namelike_last=namelike_last,
+    )
+
+
+def test_datasink_populate_delta() -> None:
+    datasinkubwfris = DatasinkUbwfris()
+    datasinkubwfris.id_to_personubwfris["0"] = _to_personubwfris("0")
+    delta = datasinkubwfris.get_delta()
+    assert [thing.to_key().value_key for thing in datasinkubwfris.populate(delta=delta)] == ["0"]
+    datasinkubwfris.mark_persisted(delta=delta)
+    datasinkubwfris.id_to_personubwfris["0"] = _to_personubwfris("0")
+    datasinkubwfris.id_to_personubwfris["1"] = _to_personubwfris("1")
+    assert [thing.to_key().value_key for thing in datasinkubwfris.populate(delta=datasinkubwfris.get_delta())] == ["1"]
+    datasinkubwfris.id_to_personubwfris["0"] = _to_personubwfris("0", namelike_last="Roe")
+    assert [thing.to_key().value_key for thing in datasinkubwfris.populate(delta=datasinkubwfris.get_delta())] == [
+        "1",
+        "0",
+    ]
+    datasinkubwfris.mark_unpersisted()
+    assert len(list(datasinkubwfris.populate(delta=datasinkubwfris.get_delta()))) == 2
+    assert len(list(datasinkubwfris.populate())) == 2
+
+
+def test_datasink_committed() -> None:
+    datasinkubwfris = DatasinkUbwfris()
+    for namelike_id_employee in ("0", "1"):
+        datasinkubwfris.id_to_personubwfris[namelike_id_employee] = _to_personubwfris(namelike_id_employee)
+    delta = datasinkubwfris.get_delta()
+    deltaitems = datasinkubwfris.get_deltaitems(delta=delta)
+    assert [deltaitem.is_committed for deltaitem in deltaitems] == [False, False]
+    # The persist commits the first thing, and then fails.
+    datasinkubwfris.mark_committed(deltaitems=deltaitems[:1])
+    assert [deltaitem.is_committed for deltaitem in datasinkubwfris.get_deltaitems(delta=delta)] == [True, False]
+    datasinkubwfris.id_to_personubwfris["0"] = _to_personubwfris("0", namelike_last="Roe")
+    # The first thing isn't inserted again, but its change replaces it.
+    assert [
+        (deltaitem.trackeditem.value.to_key().value_key, deltaitem.is_committed, deltaitem.trackeditem.is_replacing)
+        for deltaitem in datasinkubwfris.get_deltaitems(delta=datasinkubwfris.get_delta())
+    ] == [("1", False, False), ("0", False, True)]
+    datasinkubwfris.mark_persisted(delta=datasinkubwfris.get_delta())
+    assert not datasinkubwfris.get_deltaitems(delta=datasinkubwfris.get_delta())
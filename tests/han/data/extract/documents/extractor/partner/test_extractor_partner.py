@@ -0,0 +1,43 @@
+from collections.abc import Iterable, Mapping
+
+from docling_core.types.doc import DocItemLabel, DoclingDocument  # type: ignore[attr-defined]
+from knowledgeplatformmanagement_generic.data.extract.documents.document import Document, Flatsection
+from pytest import MonkeyPatch
+
+from knowledgeplatformmanagement_han.data.extract.documents.extractor.partner.extractor_partner import ExtractorPartner
+from knowledgeplatformmanagement_han.data.extract.documents.proposal import Proposal
+from knowledgeplatformmanagement_han.settings import Configuration
+
+
+def _to_proposal(partner: str, *, configuration: Configuration) -> Proposal:
+    doclingdocument = DoclingDocument(name="proposal")
+    doclingdocument.add_heading(text="Projecttitel")
+    doclingdocument.add_text(label=DocItemLabel.TEXT, text="Een project over kennisplatformen.")
+    doclingdocument.add_heading(text="Partners")
+    doclingdocument.add_text(label=DocItemLabel.TEXT, text=f"Wij werken samen met {partner} in Nijmegen.")
+    return Proposal(configuration=configuration, doclingdocument=doclingdocument)
+
+
+def test_run_all(monkeypatch: MonkeyPatch) -> None:
+    configuration = Configuration()
+    extractorpartner = ExtractorPartner(do_exclude_entities_unknown=False)
+    partners = ("Saxion", "Fontys")
+    documentss_ner: list[list[Document]] = []
+    perform_ner_documents = Proposal.perform_ner_documents
+
+    def perform_ner_documents_recorded(
+        documents_and_sectiontitle_selected_to_flatsection: Iterable[tuple[Document, Mapping[str, Flatsection] | None]],
+    ) -> None:
+        documents_and_sectiontitle_selected_to_flatsection = list(documents_and_sectiontitle_selected_to_flatsection)
+        documentss_ner.append([document for document, _ in documents_and_sectiontitle_selected_to_flatsection])
+        perform_ner_documents(documents_and_sectiontitle_selected_to_flatsection)
+
+    monkeypatch.setattr(Proposal, "perform_ner_documents", staticmethod(perform_ner_documents_recorded))
+    proposals = [_to_proposal(partner, configuration=configuration) for partner in partners]
+    entitysources = extractorpartner.run_all(proposals=proposals)
+    # NER is performed on all proposals at once, …
+    assert documentss_ner == [proposals]
+    # … yet finds the same partners as it does proposal by proposal.
+    assert entitysources == [
+        extractorpartner.run(proposal=_to_proposal(partner, configuration=configuration)) for partner in partners
+    ]
@@ -0,0 +1,52 @@
+from datetime import date
+from pathlib import Path
+
+from knowledgeplatformmanagement_generic.data.services.typedb.bundle_typedb import Bundle, read_queries, write_bundle
+from knowledgeplatformmanagement_generic.data.services.typedb.connection_typedb import chunk_queries
+
+from knowledgeplatformmanagement_han.data.model.hoursbooked import HoursBooked
+from knowledgeplatformmanagement_han.data.model.namelike_name import NamelikeName
+from knowledgeplatformmanagement_han.data.model.personubwfris import PersonUbwfris
+from knowledgeplatformmanagement_han.data.model.provenant import Source
+from knowledgeplatformmanagement_han.data.model.subproject import Subproject
+
+
+def test_write_bundle(tmp_path: Path) -> None:
+    personsubwfris = [
+        PersonUbwfris(
+            address_email=f"test{index}@localhost.localdomain",
+            namelike_id_employee=str(index),
+            namelike_last="Doe",
+            namelike_first="John",
+        )
+        for index in range(3)
+    ]
+    subproject = Subproject(
+        date_event_end=date(2024, 3, 19),
+        date_event_start=date(2024, 3, 19),
+        namelike_id_ubw="ÌD37966-185",
+        namelike_id_ubwcostcentre="650787",
+        namelike_name=NamelikeName(confidence=0.1, source=Source.ubwfris, value="Subproject"),
+        projectclassifier_financial="intern-declarabel",
+    )
+    hoursbookeds = [
+        HoursBooked(
+            billable=True,
+            charges_hours=subproject.to_key(),
+            books_hours=personubwfris.to_key(),
+            date_event_registration=date(2024, 8, 14),
+            timesheets_hours=1.0,
+        )
+        for personubwfris in personsubwfris
+    ]
+    bundle = Bundle.in_dir(tmp_path / "bundle")
+    # Interleave entities and relations, which the bundle must separate.
+    write_bundle(bundle=bundle, typeqlthings=[subproject, *personsubwfris[:2], *hoursbookeds, personsubwfris[2]])
+    assert list(read_queries(bundle.path_file_entities)) == [
+        typeqlthing.to_typeql() for typeqlthing in (subproject, *personsubwfris)
+    ]
+    assert list(read_queries(bundle.path_file_relations)) == [hoursbooked.to_typeql() for hoursbooked in hoursbookeds]
+    assert [
+        commitchunk.n_things
+        for commitchunk in chunk_queries(read_queries(bundle.path_file_entities), is_relation=False, size_commit=3)
+    ] == [3, 1]
@@ -0,0 +1,184 @@
+from datetime import date
+from pathlib import Path as PathPathlib
+from collections.abc import Iterator
+from typing import Any, Self, cast
+
+from anyio import Path
+from knowledgeplatformmanagement_generic.data.services.typedb.connection_typedb import chunk_typeqlbatches
+from knowledgeplatformmanagement_generic.data.services.typedb.dataaccessor_typedb import DataaccessorTypedb
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import batch_typeqlthings
+from pytest import mark, raises
+from typedb.driver import SessionType, TransactionType, TypeDBDriver
+
+from knowledgeplatformmanagement_han.data.model.hoursbooked import HoursBooked
+from knowledgeplatformmanagement_han.data.model.namelike_name import NamelikeName
+from knowledgeplatformmanagement_han.data.model.personubwfris import PersonUbwfris
+from knowledgeplatformmanagement_han.data.model.provenant import Source
+from knowledgeplatformmanagement_han.data.model.subproject import Subproject
+from knowledgeplatformmanagement_han.settings import Configuration
+from knowledgeplatformmanagement_han.settings.paths import Paths
+
+
+def test_chunk_typeqlbatches() -> None:
+    personsubwfris = [
+        PersonUbwfris(
+            address_email=f"test{index}@localhost.localdomain",
+            namelike_id_employee=str(index),
+            namelike_last="Doe",
+            namelike_first="John",
+        )
+        for index in range(5)
+    ]
+    subproject = Subproject(
+        date_event_end=date(2024, 3, 19),
+        date_event_start=date(2024, 3, 19),
+        namelike_id_ubw="ÌD37966-185",
+        namelike_id_ubwcostcentre="650787",
+        namelike_name=NamelikeName(confidence=0.1, source=Source.ubwfris, value="Subproject"),
+        projectclassifier_financial="intern-declarabel",
+    )
+    hoursbookeds = [
+        HoursBooked(
+            billable=True,
+            charges_hours=subproject.to_key(),
+            books_hours=personubwfris.to_key(),
+            date_event_registration=date(2024, 8, 14),
+            timesheets_hours=1.0,
+        )
+        for personubwfris in personsubwfris
+    ]
+    commitchunks = list(
+        chunk_typeqlbatches(
+            batch_typeqlthings([*personsubwfris, subproject, *hoursbookeds], size_batch=2),
+            size_commit=2,
+        ),
+    )
+    assert [
+        (commitchunk.is_relation, [len(typeqlbatch.typeqlthings) for typeqlbatch in commitchunk.typeqlbatches])
+        for commitchunk in commitchunks
+    ] == [(False, [2, 2]), (False, [2]), (True, [2, 2]), (True, [1])]
+    assert [commitchunk.n_things for commitchunk in commitchunks] == [4, 2, 4, 1]
+
+
+class _TransactionStandin:
+    def __init__(self, typedbdriver: "_TypedbdriverStandin") -> None:
+        self.query = self
+        self._queries: list[str] = []
+        self._typedbdriver = typedbdriver
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        pass
+
+    def commit(self) -> None:
+        if len(self._typedbdriver.queries_committed) == self._typedbdriver.n_commits_max:
+            raise _CommitError
+        self._typedbdriver.queries_committed.append(self._queries)
+
+    def define(self, _query: str) -> None:
+        self._typedbdriver.n_defines += 1
+
+    def delete(self, query: str) -> None:
+        self._queries.append(query)
+
+    def insert(self, query: str) -> Iterator[dict[str, Any]]:
+        self._queries.append(query)
+        return iter(({},))
+
+
+class _CommitError(RuntimeError):
+    pass
+
+
+class _TypedbdriverStandin:
+    """Keeps the names of the databases, counts the schema definitions, and keeps the queries of each commit, of which
+    it fails any beyond `n_commits_max`."""
+
+    def __init__(self, _address: str) -> None:
+        self.databases = self
+        self.n_commits_max: int | None = None
+        self.n_defines = 0
+        self.queries_committed: list[list[str]] = []
+        self._names_database: set[str] = set()
+
+    def close(self) -> None:
+        pass
+
+    def contains(self, name_database: str) -> bool:
+        return name_database in self._names_database
+
+    def create(self, name_database: str) -> None:
+        self._names_database.add(name_database)
+
+    def is_open(self) -> bool:
+        return True
+
+    def session(self, *, database_name: str, session_type: SessionType) -> Self:
+        assert database_name in self._names_database
+        assert session_type in {SessionType.DATA, SessionType.SCHEMA}
+        return self
+
+    def transaction(self, _type_transaction: TransactionType) -> _TransactionStandin:
+        return _TransactionStandin(self)
+
+
+@mark.anyio
+async def test_create_schema_fingerprint(tmp_path: PathPathlib) -> None:
+    configuration = Configuration(paths=Paths(path_dir_user_cache=tmp_path, path_dir_user_data=tmp_path))
+    dataaccessor_typedb = DataaccessorTypedb(
+        configuration=configuration,
+        factory_typedbdriver=cast(type[TypeDBDriver], _TypedbdriverStandin),
+    )
+    path_file_schema = Path(tmp_path / "schema.tql")
+    await path_file_schema.write_text("define person sub entity;")
+    async with dataaccessor_typedb as connection_typedb:
+        assert await connection_typedb.create_database()
+        assert await connection_typedb.create_schema(path_file_schema=path_file_schema)
+        # Re-initializing is a no-op.
+        assert not await connection_typedb.create_database()
+        assert not await connection_typedb.create_schema(path_file_schema=path_file_schema)
+        await path_file_schema.write_text("define person sub entity; school sub entity;")
+        assert await connection_typedb.create_schema(path_file_schema=path_file_schema)
+    typedbdriver = cast(_TypedbdriverStandin, dataaccessor_typedb.pooltypedb.get_typedbdriver())
+    assert typedbdriver.n_defines == 2
+
+
+@mark.anyio
+async def test_insert_typeqlthings_progress(tmp_path: PathPathlib) -> None:
+    configuration = Configuration(
+        paths=Paths(path_dir_user_cache=tmp_path, path_dir_user_data=tmp_path),
+        typedb_n_sessions=1,
+        typedb_size_batch=2,
+        typedb_size_commit=2,
+    )
+    dataaccessor_typedb = DataaccessorTypedb(
+        configuration=configuration,
+        factory_typedbdriver=cast(type[TypeDBDriver], _TypedbdriverStandin),
+    )
+    personsubwfris = [
+        PersonUbwfris(
+            address_email=f"test{index}@localhost.localdomain",
+            namelike_id_employee=str(index),
+            namelike_last="Doe",
+            namelike_first="John",
+        )
+        for index in range(7)
+    ]
+    positions_committed: list[int] = []
+    async with dataaccessor_typedb as connection_typedb:
+        await connection_typedb.create_database()
+        typedbdriver = cast(_TypedbdriverStandin, dataaccessor_typedb.pooltypedb.get_typedbdriver())
+        typedbdriver.n_commits_max = 1
+        with raises(_CommitError):
+            await connection_typedb.insert_typeqlthings(
+                on_committed=positions_committed.extend,
+                positions_replacing={2},
+                typeqlthings=personsubwfris,
+            )
+    # The batches are [0, 1], the update of 2, [3, 4] and [5, 6], committed two at a time. Progress is reported for the
+    # successful commit, even though the next one failed.
+    assert positions_committed == [0, 1, 2]
+    query_delete, query_insert = personsubwfris[2].to_typeql_update()
+    assert typedbdriver.queries_committed[0][1:] == [query_delete, query_insert]
@@ -1,5 +1,7 @@
 from datetime import UTC, date, datetime
 
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import batch_typeqlthings
+
 from knowledgeplatformmanagement_han.data.model.document import Document
 from knowledgeplatformmanagement_han.data.model.hoursbooked import HoursBooked
 from knowledgeplatformmanagement_han.data.model.institution import LegalformNld
@@ -175,3 +177,89 @@ def test_hoursbooked_to_str() -> None:
         "identified by its UBW FRIS project ID ‘ÌD37966-185’, with UBW FRIS registration date ‘2024-08-14’, with "
         "amount of hours ‘1.0’, with role person in UBW FRIS uniquely identified by its UBW FRIS person ID ‘123’."
     )
+
+
+def test_batch_typeqlthings() -> None:
+    personsubwfris = [
+        PersonUbwfris(
+            address_email=f"test{index}@localhost.localdomain",
+            namelike_id_employee=str(index),
+            namelike_last="Doe",
+            namelike_first="John",
+        )
+        for index in range(2)
+    ]
+    subproject = Subproject(
+        date_event_end=date(2024, 3, 19),
+        date_event_start=date(2024, 3, 19),
+        namelike_id_ubw="ÌD37966-185",
+        namelike_id_ubwcostcentre="650787",
+        namelike_name=NamelikeName(confidence=0.1, source=Source.ubwfris, value="Subproject"),
+        projectclassifier_financial="intern-declarabel",
+    )
+    hoursbookeds = [
+        HoursBooked(
+            billable=True,
+            charges_hours=subproject.to_key(),
+            books_hours=personubwfris.to_key(),
+            date_event_registration=date(2024, 8, 14),
+            timesheets_hours=1.0,
+        )
+        for personubwfris in personsubwfris
+    ]
+    typeqlbatches = list(batch_typeqlthings([*personsubwfris, *hoursbookeds], size_batch=2))
+    assert [typeqlbatch.query for typeqlbatch in typeqlbatches] == [
+        "insert $thing-0 isa person,"
+        ' has address-email "test0@localhost.localdomain",'
+        ' has namelike-first "John",'
+        ' has namelike-last "Doe",'
+        ' has namelike-id-employee "0";\n'
+        "$thing-1 isa person,"
+        ' has address-email "test1@localhost.localdomain",'
+        ' has namelike-first "John",'
+        ' has namelike-last "Doe",'
+        ' has namelike-id-employee "1";\n',
+        'match $roleplayer-0 isa subproject, has namelike-id-ubw "ÌD37966-185";\n'
+        '$roleplayer-1 isa person, has namelike-id-employee "0";\n'
+        '$roleplayer-2 isa person, has namelike-id-employee "1";\n'
+        "insert $thing-2 (charges-hours: $roleplayer-0, books-hours: $roleplayer-1) isa hours-booked,"
+        " has billable true,"
+        " has date-event-registration 2024-08-14,"
+        " has timesheets-hours 1.0;\n"
+        "$thing-3 (charges-hours: $roleplayer-0, books-hours: $roleplayer-2) isa hours-booked,"
+        " has billable true,"
+        " has date-event-registration 2024-08-14,"
+        " has timesheets-hours 1.0;\n",
+    ]
+    assert [typeqlbatch.is_matched for typeqlbatch in typeqlbatches] == [False, True]
+    assert [
+        typeqlbatch.query for typeqlbatch in batch_typeqlthings([*personsubwfris, *hoursbookeds], size_batch=1)
+    ] == [typeqlthing.to_typeql() for typeqlthing in (*personsubwfris, *hoursbookeds)]
+
+
+def test_personubwfris_to_typeql_update() -> None:
+    personubwfris = PersonUbwfris(
+        address_email="test@localhost.localdomain",
+        employmentcontract_ftepercentage=80,
+        namelike_id_employee="123",
+        namelike_last="Doe",
+        namelike_first="John",
+    )
+    # The schema's key of persons is matched on rather than deleted and inserted again.
+    assert personubwfris.to_typeql_update() == (
+        'match $thing isa person, has address-email "test@localhost.localdomain", has namelike-id-employee "123";\n'
+        "$thing has $attribute;\n"
+        "{ $attribute isa namelike-first; } or { $attribute isa namelike-last; } or "
+        "{ $attribute isa employmentcontract-ftepercentage; } or { $attribute isa namelike-id-ubwcostcentre; };\n"
+        "delete $thing has $attribute;\n",
+        'match $thing isa person, has address-email "test@localhost.localdomain", has namelike-id-employee "123";\n'
+        "insert $thing"
+        ' has namelike-first "John",'
+        ' has namelike-last "Doe",'
+        " has employmentcontract-ftepercentage 80;\n",
+    )
+    typeqlbatches = list(batch_typeqlthings([personubwfris], positions_replacing={0}, size_batch=2))
+    assert [(typeqlbatch.query_delete, typeqlbatch.query) for typeqlbatch in typeqlbatches] == [
+        personubwfris.to_typeql_update(),
+    ]
+    assert [typeqlbatch.is_matched for typeqlbatch in typeqlbatches] == [True]
@@ -0,0 +1,215 @@
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+from time import perf_counter
+
+from knowledgeplatformmanagement_generic.data.services.typedb.typeql import (
+    Key,
+    TypeqlAttribute,
+    TypeqlThing,
+    TypeqlThingRelation,
+    TypeqlThingRelationMissingKeyError,
+)
+from loguru import logger
+from pytest import fixture
+
+from knowledgeplatformmanagement_han.data.model.hoursbooked import HoursBooked
+from knowledgeplatformmanagement_han.data.model.hoursbudgeted import HoursBudgeted
+from knowledgeplatformmanagement_han.data.model.institution import LegalformNld
+from knowledgeplatformmanagement_han.data.model.namelike_name import NamelikeName
+from knowledgeplatformmanagement_han.data.model.personubwfris import PersonUbwfris
+from knowledgeplatformmanagement_han.data.model.provenant import Source
+from knowledgeplatformmanagement_han.data.model.subproject import Subproject
+from knowledgeplatformmanagement_han.data.model.universityofappliedsciences import Universityofappliedsciences
+
+N_PERSONS = 50
+N_SUBPROJECTS = 20
+N_TIMESHEETS = 5_000
+
+
+@fixture(name="typeqlthings", scope="module")
+def fixture_typeqlthings() -> list[TypeqlThing]:
+    personsubwfris = [
+        PersonUbwfris(
+            address_email=f"person{index}@localhost.localdomain",
+            employmentcontract_ftepercentage=80,
+            namelike_first="John",
+            namelike_id_employee=str(index),
+            namelike_last=f"Doe {index}",
+        )
+        for index in range(N_PERSONS)
+    ]
+    subprojects = [
+        Subproject(
+            date_event_end=date(2024, 12, 31),
+            date_event_start=date(2024, 1, 1),
+            namelike_id_ubw=f"SU{1000 + index}-101",
+            namelike_id_ubwcostcentre="650787",
+            namelike_name=NamelikeName(
+                confidence=0.1,
+                datetime_end_recorded=datetime(2024, 8, 14, tzinfo=UTC),
+                datetime_end_updated=datetime(2024, 8, 14, tzinfo=UTC),
+                source=Source.ubwfris,
+                value=f'Subproject "{index}"',
+            ),
+            projectclassifier_financial="subsidieprojecten",
+            projectclassifier_status="ongoing",
+        )
+        for index in range(N_SUBPROJECTS)
+    ]
+    keys_person = [personubwfris.to_key() for personubwfris in personsubwfris]
+    keys_subproject = [subproject.to_key() for subproject in subprojects]
+    timesheets: list[TypeqlThing] = [
+        (
+            HoursBooked(
+                billable=bool(index % 3),
+                books_hours=keys_person[index % N_PERSONS],
+                charges_hours=keys_subproject[index % N_SUBPROJECTS],
+                date_event_registration=date(2024, 1 + index % 12, 1 + index % 28),
+                timesheets_hours=index / 7,
+            )
+            if index % 2
+            else HoursBudgeted(
+                billable=True,
+                budgets_hours=keys_person[index % N_PERSONS],
+                charges_hours=keys_subproject[index % N_SUBPROJECTS],
+                date_event_registration=date(2024, 1 + index % 12, 1),
+                timesheets_hours=float(index),
+            )
+        )
+        for index in range(N_TIMESHEETS)
+    ]
+    universitiesofappliedsciences = [
+        Universityofappliedsciences(
+            legalform_nld=LegalformNld.stichting,
+            namelike_name=NamelikeName(
+                confidence=0.9,
+                datetime_end_recorded=datetime(2024, 8, 14, tzinfo=UTC),
+                datetime_end_updated=datetime(2024, 8, 14, tzinfo=UTC),
+                source=Source.documents,
+                value="HAN University of Applied Sciences",
+            ),
+        ),
+    ]
+    return [*personsubwfris, *subprojects, *timesheets, *universitiesofappliedsciences]
+
+
+# TODO: The complexity in this function is essential.
+def _to_typeql_attributes_reference(typeqlthing: TypeqlThing) -> str:  # noqa: C901, PLR0912
+    attributes = []
+    for field_current in typeqlthing.model_fields:
+        if (value := getattr(typeqlthing, field_current)) is None:
+            continue
+        if field_current == "value":
+            # Exempt `value` attribute of `TypeqlAttribute` objects.
+            continue
+        field_name_typedb = field_current.replace("_", "-")
+        has = f"has {field_name_typedb} "
+        match value:
+            case bool():
+                attributes.append(has + str(value).lower())
+            case float() | int():
+                attributes.append(has + str(value))
+            case str():
+                if '"' in value:
+                    value = value.replace('"', "'")
+                attributes.append(f'{has}"{value}"')
+            case list():
+                if all(isinstance(item, str) for item in value):
+                    attributes.append(f'{has}"{", ".join(value)}"')
+                else:
+                    msg = f"Unsupported list item type for field {field_name_typedb}."
+                    raise TypeError(msg)
+            case datetime():
+                attributes.append(has + value.strftime(r"%Y-%m-%dT%H:%M:%S.%f")[:-3])
+            case date():
+                attributes.append(has + value.strftime(r"%Y-%m-%d"))
+            case Key():
+                continue
+            case TypeqlAttribute():
+                attributes.append(has + f"${value.to_typeql_name_schema()}")
+            case _:
+                msg = f"Unsupported type for field {field_name_typedb}: {type(value)}."
+                raise TypeError(msg)
+    return ", " + (", ".join(attributes)) if attributes else ""
+
+
+def _scan_composite_attributes_reference(typeqlthing: TypeqlThing) -> str:
+    statements = [
+        _to_typeql_reference(value)
+        for field_current in typeqlthing.model_fields
+        if isinstance(value := getattr(typeqlthing, field_current), TypeqlAttribute)
+    ]
+    return ";\n".join(statements) if statements else ""
+
+
+def _scan_key_attributes_reference(typeqlthing: TypeqlThing) -> tuple[str, list[str]]:
+    arguments = []
+    statement_match = "match "
+    # Match based on keys.
+    for index, name_field in enumerate(typeqlthing.model_fields):
+        if (value := getattr(typeqlthing, name_field)) is None or not isinstance(value, Key):
+            continue
+        variable = f"$var{index:d}"
+        name_attribute_key = f"{value.name_key.replace('_', '-'):s}"
+        statement_match += f"{variable} isa {value.name_schema:s}, "
+        statement_match += f'has {name_attribute_key:s} "{value.value_key:s}";\n'
+        name_attribute = name_field.replace("_", "-")
+        arguments.append(f"{name_attribute}: {variable}")
+    if statement_match == "match ":
+        statement_match = ""
+    return (statement_match, arguments)
+
+
+def _to_typeql_reference(typeqlthing: TypeqlThing) -> str:
+    """The original rendering of `to_typeql()`, which inspects the model fields and value types of every instance."""
+    name_schema = typeqlthing.to_typeql_name_schema()
+    attributes = _to_typeql_attributes_reference(typeqlthing)
+    if isinstance(typeqlthing, TypeqlAttribute):
+        return f"insert ${name_schema} {typeqlthing._to_typeql_placeholder()} isa {name_schema}{attributes};\n"
+    statement_match, arguments = _scan_key_attributes_reference(typeqlthing)
+    statement_insert_composite = _scan_composite_attributes_reference(typeqlthing)
+    if isinstance(typeqlthing, TypeqlThingRelation):
+        if not arguments:
+            raise TypeqlThingRelationMissingKeyError(typeqlthing)
+        return (
+            f"{statement_insert_composite}"
+            f"{statement_match}"
+            f"{'insert' if statement_insert_composite else ''}"
+            f"insert $_ ({', '.join(arguments)}) isa {name_schema}{attributes};\n"
+        )
+    return (
+        f"{statement_insert_composite}"
+        f"{statement_match}"
+        f"{'' if statement_insert_composite else 'insert '}"
+        f"$_ isa {name_schema}{attributes};\n"
+    )
+
+
+def _measure(typeqlthings: Sequence[TypeqlThing], *, compiled: bool) -> tuple[float, list[str]]:
+    time_start = perf_counter()
+    queries = [
+        typeqlthing.to_typeql() if compiled else _to_typeql_reference(typeqlthing) for typeqlthing in typeqlthings
+    ]
+    return perf_counter() - time_start, queries
+
+
+def test_to_typeql_compiled_equals_uncompiled(typeqlthings: list[TypeqlThing]) -> None:
+    assert [typeqlthing.to_typeql() for typeqlthing in typeqlthings] == [
+        _to_typeql_reference(typeqlthing) for typeqlthing in typeqlthings
+    ]
+
+
+def test_to_typeql_benchmark(typeqlthings: list[TypeqlThing]) -> None:
+    # Warm up the render plans and renderer lookups, so only the steady state is measured.
+    _measure(typeqlthings[:: len(typeqlthings) // 10], compiled=True)
+    duration_uncompiled, queries_uncompiled = _measure(typeqlthings, compiled=False)
+    duration_compiled, queries_compiled = _measure(typeqlthings, compiled=True)
+    logger.info(
+        "Rendered {n} TypeQL things in {duration_uncompiled:.3f} s uncompiled, and in {duration_compiled:.3f} s "
+        "compiled ({speedup:.1f}× speed-up).",
+        duration_compiled=duration_compiled,
+        duration_uncompiled=duration_uncompiled,
+        n=len(typeqlthings),
+        speedup=duration_uncompiled / duration_compiled,
+    )
+    assert queries_compiled == queries_uncompiled
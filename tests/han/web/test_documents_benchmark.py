@@ -0,0 +1,93 @@
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import cast
+
+from anyio import create_task_group
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from knowledgeplatformmanagement_generic.data.services.llm.dataaccessor_llm import DataaccessorLlm
+from knowledgeplatformmanagement_generic.data.services.qdrant.dataaccessor_qdrant import DataaccessorQdrant
+from knowledgeplatformmanagement_generic.data.services.typedb.dataaccessor_typedb import DataaccessorTypedb
+from loguru import logger
+from pytest import mark
+from qdrant_client import AsyncQdrantClient
+from sentence_transformers import SentenceTransformer
+
+from knowledgeplatformmanagement_han.data.dao.datalayer import Datalayer
+from knowledgeplatformmanagement_han.data.dao.datasink_documents import DatasinkDocuments
+from knowledgeplatformmanagement_han.data.dao.datasink_microsoft365 import DatasinkMicrosoft365
+from knowledgeplatformmanagement_han.data.dao.datasink_ubwfris import DatasinkUbwfris
+from knowledgeplatformmanagement_han.data.dao.datasinks import Datasinks
+from knowledgeplatformmanagement_han.data.extract.documents import Documents
+from knowledgeplatformmanagement_han.data.extract.ubwfris import Ubwfris
+from knowledgeplatformmanagement_han.settings import Configuration
+from knowledgeplatformmanagement_han.web.__main__ import create_fastapi
+
+N_REQUESTS = 64
+
+
+@mark.anyio
+async def test_classify_keyareas_concurrent_latency(
+    *,
+    configuration: Configuration,
+    model_encoder: SentenceTransformer,
+) -> None:
+    n_builds = 0
+
+    def factory_asyncqdrantclient() -> AsyncQdrantClient:
+        nonlocal n_builds
+        n_builds += 1
+        return AsyncQdrantClient(location=":memory:")
+
+    dataaccessor_qdrant = DataaccessorQdrant(
+        configuration=configuration,
+        factory_asyncqdrantclient=factory_asyncqdrantclient,
+        model_encoder=model_encoder,
+    )
+    async with dataaccessor_qdrant as connection_qdrant:
+        await connection_qdrant.create_collection()
+    datalayer = Datalayer(
+        configuration=configuration,
+        # Classifying an unknown document uses neither of these.
+        dataaccessor_llm=cast(DataaccessorLlm, None),
+        dataaccessor_qdrant=dataaccessor_qdrant,
+        dataaccessor_typedb=DataaccessorTypedb(configuration=configuration),
+        datasinks=Datasinks(
+            documents=DatasinkDocuments(),
+            microsoft365=DatasinkMicrosoft365(),
+            ubwfris=DatasinkUbwfris(),
+        ),
+        model_encoder=model_encoder,
+    )
+    fastapi = create_fastapi(
+        configuration=configuration,
+        datalayer=datalayer,
+        documents=cast(Documents, None),
+        microsoft365graph=None,
+        ubwfris=cast(Ubwfris, None),
+    )
+    latencies: list[float] = []
+
+    async def classify_keyareas(asyncclient: AsyncClient, hashvalue_proposal: int) -> None:
+        time_start = perf_counter()
+        response = await asyncclient.put(url=f"/documents/classify/keyareas/{hashvalue_proposal}")
+        latencies.append(perf_counter() - time_start)
+        # No document is stored, so each request only looks it up in Qdrant, and doesn't call the LLM.
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async with (
+        AsyncClient(base_url="http://localhost.localdomain", transport=ASGITransport(app=fastapi)) as asyncclient,
+        create_task_group() as taskgroup,
+    ):
+        for hashvalue_proposal in range(N_REQUESTS):
+            taskgroup.start_soon(classify_keyareas, asyncclient, hashvalue_proposal)
+    logger.info(
+        "Answered {n} concurrent requests with a mean latency of {latency_mean:.4f} s and a 95th percentile latency "
+        "of {latency_p95:.4f} s.",
+        latency_mean=mean(latencies),
+        latency_p95=quantiles(latencies, n=20)[-1],
+        n=N_REQUESTS,
+    )
+    # All requests shared a single client.
+    assert n_builds == 1
+    await dataaccessor_qdrant.poolqdrant.close()